@@ -17,21 +17,36 @@ from routes.interview_routes import interview_bp
 from routes.fluency_routes import fluency_bp
 from routes.resume_routes import resume_bp
 from routes.dashboard_routes import dashboard_bp
+from routes.admin_routes import admin_bp
+from routes.upload_routes import upload_bp
+from routes import voice_stream_routes
+from services.warmup_service import warm_up, get_readiness
+from ml_models.nltk_bundle import check_bundle
+from utils import metrics, profiling, allocations, tracing, rate_limit
+from config import Config
 
-def create_app():
-    """Create and configure the Flask application"""
+def create_app(warmup=None):
+    """
+    Create and configure the Flask application
+    
+    Args:
+        warmup: Load all models and data files before returning
+                (defaults to Config.WARMUP_ON_STARTUP)
+    """
     app = Flask(__name__)
     
     # Configuration
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
     app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file upload
+    warmup_enabled = Config.WARMUP_ON_STARTUP if warmup is None else warmup
     
     # Enable CORS for frontend connection
     CORS(app, resources={
         r"/api/*": {
             "origins": os.getenv('FRONTEND_URL', 'http://localhost:5173'),
-            "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization"]
+            "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+            "allow_headers": ["Content-Type", "Authorization", "Upload-Offset", "Idempotency-Key"],
+            "expose_headers": ["Upload-Offset", "Retry-After", "Idempotent-Replayed"]
         }
     })
     
@@ -41,6 +56,26 @@ def create_app():
     app.register_blueprint(fluency_bp, url_prefix='/api/fluency')
     app.register_blueprint(resume_bp, url_prefix='/api/resume')
     app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
+    app.register_blueprint(admin_bp, url_prefix='/api/admin')
+    app.register_blueprint(upload_bp, url_prefix='/api/uploads')
+    
+    # Live voice answers over WebSocket (when flask-sock is installed)
+    voice_stream_routes.init_app(app)
+    
+    # Request spans (OpenTelemetry, when enabled and installed)
+    tracing.init_app(app)
+    
+    # Per-route latency histograms and the /metrics endpoint
+    metrics.init_app(app)
+    
+    # Per-IP token buckets (per-user limits are applied in require_auth)
+    rate_limit.init_app(app)
+    
+    # Opt-in per-request CPU profiling (signed header, flag file or sampling)
+    profiling.init_app(app)
+    
+    # tracemalloc and the optional per-request peak allocation metric
+    allocations.init_app(app)
     
     # Root endpoint
     @app.route('/')
@@ -59,6 +94,20 @@ def create_app():
             'status': 'healthy'
         })
     
+    # Readiness check endpoint (503 until warmup has loaded every component)
+    @app.route('/ready')
+    def ready():
+        readiness = get_readiness()
+        if not warmup_enabled:
+            readiness['ready'] = True
+        
+        return jsonify({
+            'success': readiness['ready'],
+            'status': 'ready' if readiness['ready'] else 'warming_up',
+            'warmup_enabled': warmup_enabled,
+            'components': readiness['components']
+        }), 200 if readiness['ready'] else 503
+    
     # Global error handlers
     @app.errorhandler(404)
     def not_found(error):
@@ -84,6 +133,14 @@ def create_app():
             'error': str(error)
         }), 400
     
+    # Fail at boot (not mid-request) if the offline NLTK bundle is incomplete
+    # (filesystem check only; NLTK itself is imported on warmup or first use)
+    check_bundle()
+    
+    # Load models before the worker accepts traffic
+    if warmup_enabled:
+        warm_up()
+    
     return app
 
 if __name__ == '__main__':
@@ -0,0 +1,19 @@
+"""
+Audio Feature Benchmarks
+"""
+
+import pytest
+
+from benchmarks.inputs import AUDIO_SECONDS, make_speech_wav
+from ml_models.audio_features import SAMPLE_RATE, analyze_samples, decode_audio, extract_audio_features
+
+@pytest.mark.parametrize('seconds', AUDIO_SECONDS)
+def bench_extract_audio_features(benchmark, seconds):
+    benchmark(extract_audio_features, make_speech_wav(seconds), 'wav')
+
+@pytest.mark.parametrize('seconds', AUDIO_SECONDS)
+def bench_analyze_samples(benchmark, seconds):
+    # NumPy passes only, without decoding
+    samples, sample_rate = decode_audio(make_speech_wav(seconds), 'wav')
+    assert sample_rate == SAMPLE_RATE
+    benchmark(analyze_samples, samples, sample_rate)
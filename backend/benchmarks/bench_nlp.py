@@ -0,0 +1,35 @@
+"""
+NLP Processor and Sentiment Benchmarks
+"""
+
+import pytest
+
+from benchmarks.inputs import SIZES, QUESTION
+from ml_models.nlp_processor import (
+    tokenize_text, extract_keywords, calculate_text_similarity, detect_grammar_errors_simple
+)
+from ml_models.sentiment_analyzer import analyze_sentiment, calculate_sentiment_score
+
+@pytest.mark.parametrize('size', SIZES)
+def bench_tokenize_text(benchmark, texts, size):
+    benchmark(tokenize_text, texts[size])
+
+@pytest.mark.parametrize('size', SIZES)
+def bench_extract_keywords(benchmark, texts, size):
+    benchmark(extract_keywords, texts[size], 10)
+
+@pytest.mark.parametrize('size', SIZES)
+def bench_calculate_text_similarity(benchmark, texts, size):
+    benchmark(calculate_text_similarity, QUESTION, texts[size])
+
+@pytest.mark.parametrize('size', SIZES)
+def bench_detect_grammar_errors_simple(benchmark, texts, size):
+    benchmark(detect_grammar_errors_simple, texts[size])
+
+@pytest.mark.parametrize('size', SIZES)
+def bench_analyze_sentiment(benchmark, texts, size):
+    benchmark(analyze_sentiment, texts[size])
+
+@pytest.mark.parametrize('size', SIZES)
+def bench_calculate_sentiment_score(benchmark, texts, size):
+    benchmark(calculate_sentiment_score, texts[size])
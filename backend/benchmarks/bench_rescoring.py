@@ -0,0 +1,86 @@
+"""
+Bulk Re-scoring Benchmarks
+The vectorized scorers must reproduce the live scores exactly before their speed matters
+"""
+
+import numpy as np
+import pytest
+
+from benchmarks.inputs import SIZES, QUESTION, JOB_ROLE, make_text
+from ml_models.fluency_scorer import analyze_speech_fluency
+from ml_models.score_features import (
+    feature_vector, fluency_features, score_fluency_tests, score_interview_answers
+)
+from models.fluency_test import FluencyTest
+from services.ai_interview_service import evaluate_interview_answer_with_features
+
+# Rows scored per call
+ROWS = [10000, 1000000]
+
+# Answer lengths around the completeness thresholds, plus the benchmark sizes
+PARITY_SIZES = [1, 5, 9, 14, 15, 29, 30, 49, 50] + SIZES
+
+def bench_interview_parity(benchmark):
+    results = [
+        evaluate_interview_answer_with_features(QUESTION, make_text(size, seed), JOB_ROLE, 'Intermediate')
+        for size in PARITY_SIZES for seed in range(3)
+    ]
+    evaluations = [evaluation for evaluation, _ in results]
+    matrix = np.array([feature_vector('interview_answer', features) for _, features in results])
+
+    scores = benchmark(score_interview_answers, matrix)
+
+    assert scores['overall'].tolist() == [e['overall_score'] for e in evaluations]
+    assert scores['relevance'].tolist() == [e['relevance']['score'] for e in evaluations]
+    assert scores['grammar'].tolist() == [e['grammar']['score'] for e in evaluations]
+    assert scores['completeness'].tolist() == [e['completeness']['score'] for e in evaluations]
+    assert scores['sentiment'].tolist() == [e['sentiment_score'] for e in evaluations]
+
+def bench_interview_parity_ties(benchmark, monkeypatch):
+    # Every 4-decimal similarity as sklearn returns it (np.float64): a few land
+    # relevance or overall exactly on a rounding tie
+    similarities = iter(np.arange(0, 10001, 7) / 10000)
+    monkeypatch.setattr(
+        'ml_models.nlp_processor.cosine_similarity', lambda a, b: np.array([[next(similarities)]])
+    )
+    answer = make_text(SIZES[1], 0)
+    results = [
+        evaluate_interview_answer_with_features(QUESTION, answer, JOB_ROLE, 'Intermediate')
+        for _ in range(0, 10001, 7)
+    ]
+    evaluations = [evaluation for evaluation, _ in results]
+    matrix = np.array([feature_vector('interview_answer', features) for _, features in results])
+
+    scores = benchmark(score_interview_answers, matrix)
+
+    assert scores['overall'].tolist() == [e['overall_score'] for e in evaluations]
+    assert scores['relevance'].tolist() == [e['relevance']['score'] for e in evaluations]
+
+def bench_fluency_parity(benchmark):
+    # 60 to 220 WPM, and no duration (estimated WPM)
+    analyses = [
+        analyze_speech_fluency(make_text(size, seed), size / wpm * 60 if wpm else 0)
+        for size in PARITY_SIZES for seed, wpm in enumerate((60, 135, 220, 0))
+    ]
+    matrix = np.array([feature_vector('fluency_test', fluency_features(a, 85.0)) for a in analyses])
+
+    scores = benchmark(score_fluency_tests, matrix)
+
+    assert scores['fluency'].tolist() == [a['fluency_score'] for a in analyses]
+    assert scores['overall'].tolist() == [
+        FluencyTest.calculate_overall_score(a['fluency_score'], 85.0, 100 - len(a['grammar_errors']) * 5)
+        for a in analyses
+    ]
+
+def _random_interview_rows(rows: int) -> np.ndarray:
+    rng = np.random.default_rng(rows)
+    words = rng.integers(0, 400, rows)
+    return np.column_stack([
+        rng.random(rows), rng.integers(0, 10, rows), rng.integers(0, 15, rows), rng.integers(0, 8, rows),
+        words, words // 12, rng.uniform(-1, 1, rows), rng.uniform(0, 100, rows)
+    ]).astype(np.float64)
+
+@pytest.mark.parametrize('rows', ROWS)
+def bench_score_interview_answers(benchmark, rows):
+    matrix = _random_interview_rows(rows)
+    benchmark(score_interview_answers, matrix)
@@ -0,0 +1,93 @@
+"""
+Fluency and Interview Scoring Benchmarks
+"""
+
+import numpy as np
+import pytest
+
+from benchmarks.inputs import SIZES, QUESTION, JOB_ROLE
+from ml_models.fluency_scorer import analyze_speech_fluency, calculate_fluency_score, calculate_fluency_scores
+from ml_models.fluency_stream import FluencyStream
+from ml_models.evaluation_budget import EvaluationBudget
+from services.ai_interview_service import DIMENSIONS, evaluate_interview_answer, parse_dimensions
+
+@pytest.mark.parametrize('size', SIZES)
+def bench_analyze_speech_fluency(benchmark, texts, size):
+    # Duration at 130 WPM so the WPM path is exercised, not estimated
+    benchmark(analyze_speech_fluency, texts[size], size / 130 * 60)
+
+def _fluency_rows(rows: int):
+    """Random scorer inputs, with WPM on and around every range boundary"""
+    rng = np.random.default_rng(rows)
+    boundaries = np.array([0, 79.99, 80, 80.01, 119.99, 120, 150, 150.01, 180, 180.01])
+    wpm = np.where(rng.random(rows) < 0.2, rng.choice(boundaries, rows), np.round(rng.uniform(0, 320, rows), 2))
+    return (
+        wpm, rng.integers(0, 40, rows), rng.integers(0, 25, rows),
+        rng.integers(0, 20, rows), rng.integers(0, 3000, rows) * (rng.random(rows) > 0.05)
+    )
+
+@pytest.mark.parametrize('rows', [10000, 1000000])
+def bench_calculate_fluency_scores(benchmark, rows):
+    columns = _fluency_rows(rows)
+
+    scores = benchmark(calculate_fluency_scores, *columns)
+
+    # Parity with the scalar function on (a sample of) the same rows
+    wpm, fillers, pauses, errors, words = columns
+    for index in range(0, rows, max(1, rows // 100000)):
+        assert scores[index] == calculate_fluency_score(
+            float(wpm[index]), int(fillers[index]), int(pauses[index]), int(errors[index]), int(words[index])
+        ), index
+
+def _stream(text: str, chunk: int = 90) -> FluencyStream:
+    stream = FluencyStream()
+    for start in range(0, len(text), chunk):
+        stream.feed(text[start:start + chunk])
+    return stream
+
+@pytest.mark.parametrize('size', SIZES)
+def bench_fluency_stream_feed(benchmark, texts, size):
+    # One ~1 s delta after `size` words; should stay flat as size grows
+    delta = ' so um I then moved the api to a queue... '
+
+    def setup():
+        return (_stream(texts[size]), delta), {}
+
+    benchmark.pedantic(FluencyStream.feed, setup=setup, rounds=20)
+
+@pytest.mark.parametrize('size', SIZES)
+def bench_fluency_stream_close(benchmark, texts, size):
+    duration = size / 130 * 60
+    assert _stream(texts[size]).close(duration) == analyze_speech_fluency(texts[size], duration)
+
+    benchmark.pedantic(FluencyStream.close, setup=lambda: ((_stream(texts[size]), duration), {}), rounds=20)
+
+@pytest.mark.parametrize('size', SIZES)
+def bench_evaluate_interview_answer(benchmark, texts, size):
+    benchmark(evaluate_interview_answer, QUESTION, texts[size], JOB_ROLE, 'Intermediate')
+
+@pytest.mark.parametrize('size', SIZES)
+def bench_evaluate_interview_answer_budgeted(benchmark, texts, size):
+    # Flat past EVAL_MAX_WORDS: longer answers are scored on a sample
+    def evaluate():
+        return evaluate_interview_answer(
+            QUESTION, texts[size], JOB_ROLE, 'Intermediate', EvaluationBudget('interview', max_words=3000)
+        )
+
+    benchmark(evaluate)
+
+@pytest.mark.parametrize('dimensions', ['relevance,completeness', 'completeness', 'sentiment'])
+@pytest.mark.parametrize('size', SIZES)
+def bench_evaluate_interview_answer_dimensions(benchmark, texts, size, dimensions):
+    # Should cost roughly the selected stages' share of bench_evaluate_interview_answer
+    selected = parse_dimensions(dimensions)
+    evaluation = benchmark(evaluate_interview_answer, QUESTION, texts[size], JOB_ROLE, 'Intermediate',
+                           dimensions=selected)
+
+    full = evaluate_interview_answer(QUESTION, texts[size], JOB_ROLE, 'Intermediate')
+    for name in DIMENSIONS:
+        key = 'sentiment_score' if name == 'sentiment' else name
+        if name in selected:
+            assert evaluation[key] == full[key]
+        else:
+            assert key not in evaluation
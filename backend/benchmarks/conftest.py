@@ -0,0 +1,49 @@
+"""
+Benchmark setup: offline NLTK bundle only, no network
+
+Run from backend/:
+    pytest benchmarks
+
+Results are saved under benchmarks/results (see pytest.ini); compare a run
+against the last saved one with:
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+"""
+
+import os
+import socket
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ml_models.nltk_bundle import check_bundle, NLTKBundleError
+from benchmarks.inputs import texts_by_size
+
+def pytest_configure(config):
+    try:
+        check_bundle()
+    except NLTKBundleError as e:
+        pytest.exit(f"Benchmarks need the offline NLTK bundle: {str(e)}", returncode=2)
+
+@pytest.fixture(autouse=True, scope='session')
+def no_network():
+    """Fail loudly if anything under benchmark reaches for the network"""
+    def blocked(*args, **kwargs):
+        raise RuntimeError("Network access during benchmarks")
+
+    original = socket.socket.connect
+    socket.socket.connect = blocked
+    yield
+    socket.socket.connect = original
+
+@pytest.fixture(scope='session')
+def texts():
+    """{word_count: text} for every benchmark size"""
+    return texts_by_size()
+
+@pytest.fixture(scope='session', autouse=True)
+def warm_models():
+    """Load stopwords, lemmatizer and VADER once so runs measure steady state"""
+    from services.warmup_service import warm_up
+    warm_up()
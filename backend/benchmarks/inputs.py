@@ -0,0 +1,91 @@
+"""
+Benchmark Inputs
+Deterministic transcripts and answers from 20 to 10,000 words
+"""
+
+import io
+import random
+import wave
+from typing import Dict
+
+import numpy as np
+
+# Word counts every hot path is measured at
+SIZES = [20, 100, 500, 2000, 10000]
+
+SEED = 1729
+
+# Recording lengths (seconds) the audio analysis is measured at
+AUDIO_SECONDS = [10, 60, 300]
+
+QUESTION = "Can you describe a challenging project you worked on and how you handled scaling the backend?"
+
+JOB_ROLE = 'Software Engineer'
+
+_VOCABULARY = (
+    'i worked on a backend service that handled user requests and we used python flask '
+    'with a postgres database the main challenge was scaling the api under heavy load '
+    'so i added caching profiled slow queries and moved background jobs to a queue '
+    'our team designed the system with clear interfaces and wrote tests for each module '
+    'i learned to communicate tradeoffs and to measure performance before optimizing '
+    'the project improved latency reduced costs and made deployments more reliable'
+).split()
+
+_FILLERS = ['um', 'uh', 'like', 'basically', 'actually', 'well']
+
+def make_text(word_count: int, seed: int = SEED) -> str:
+    """
+    Build a transcript-like text of exactly word_count words
+    Mixes sentences, filler words, ellipsis pauses and a few grammar slips
+    """
+    rng = random.Random(seed + word_count)
+    words = []
+    sentence_length = 0
+
+    while len(words) < word_count:
+        roll = rng.random()
+        if roll < 0.05:
+            word = rng.choice(_FILLERS)
+        elif roll < 0.07:
+            word = 'i'
+        else:
+            word = rng.choice(_VOCABULARY)
+
+        sentence_length += 1
+        if sentence_length >= rng.randint(8, 18):
+            word += '...' if rng.random() < 0.15 else '.'
+            sentence_length = 0
+
+        words.append(word)
+
+    text = ' '.join(words)
+    return text[0].upper() + text[1:] + ('' if text.endswith('.') else '.')
+
+def texts_by_size() -> Dict[int, str]:
+    """One text per benchmark size"""
+    return {size: make_text(size) for size in SIZES}
+
+def make_speech_wav(seconds: float, seed: int = SEED, sample_rate: int = 16000) -> bytes:
+    """
+    Build a speech-like 16-bit mono WAV of about `seconds`
+    Noise bursts with a 4 Hz syllable envelope, separated by 0.2-2 s of near-silence
+    """
+    rng = np.random.default_rng(seed)
+    parts = []
+    total = 0
+
+    while total < seconds * sample_rate:
+        phrase = np.arange(int(rng.uniform(1.0, 4.0) * sample_rate)) / sample_rate
+        envelope = 0.5 * (1 + np.sin(2 * np.pi * 4 * phrase - np.pi / 2))
+        parts.append(0.3 * envelope * rng.standard_normal(len(phrase)))
+        parts.append(0.001 * rng.standard_normal(int(rng.uniform(0.2, 2.0) * sample_rate)))
+        total += len(parts[-2]) + len(parts[-1])
+
+    samples = (np.clip(np.concatenate(parts), -1, 1) * 32767).astype(np.int16)
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue()
@@ -29,13 +29,88 @@ class Config:
     ALLOWED_RESUME_EXTENSIONS = {'pdf', 'docx', 'txt'}
     UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', 'uploads')
     
+    # Chunked uploads (/api/uploads): chunks must fit in MAX_CONTENT_LENGTH
+    UPLOAD_CHUNK_BYTES = int(os.getenv('UPLOAD_CHUNK_BYTES', 8 * 1024 * 1024))
+    UPLOAD_MAX_BYTES = int(os.getenv('UPLOAD_MAX_BYTES', 512 * 1024 * 1024))
+    UPLOAD_EXPIRY_HOURS = float(os.getenv('UPLOAD_EXPIRY_HOURS', 24))
+    RESUME_TEXT_MAX_CHARS = int(os.getenv('RESUME_TEXT_MAX_CHARS', 100000))
+    
     # ML Model settings
     NLTK_DATA_PATH = os.getenv('NLTK_DATA_PATH', 'nltk_data')
     SPACY_MODEL = os.getenv('SPACY_MODEL', 'en_core_web_sm')
+    LEXICON_ARTIFACT_ENABLED = os.getenv('LEXICON_ARTIFACT_ENABLED', 'true').lower() == 'true'
+    LEXICON_ARTIFACT_PATH = os.getenv('LEXICON_ARTIFACT_PATH')  # Defaults to <NLTK_DATA_PATH>/lexicons.bin
+    WARMUP_ON_STARTUP = os.getenv('WARMUP_ON_STARTUP', 'false').lower() == 'true'
+    STARTUP_BUDGET_MS = int(os.getenv('STARTUP_BUDGET_MS', 1000))  # See utils/startup_report.py
+    
+    # Write-behind persistence for results (optional)
+    WRITE_BEHIND_ENABLED = os.getenv('WRITE_BEHIND_ENABLED', 'false').lower() == 'true'
+    WRITE_BEHIND_FLUSH_INTERVAL_MS = int(os.getenv('WRITE_BEHIND_FLUSH_INTERVAL_MS', 200))
+    WRITE_BEHIND_MAX_BATCH = int(os.getenv('WRITE_BEHIND_MAX_BATCH', 100))
+    WRITE_BEHIND_SPILL_DIR = os.getenv('WRITE_BEHIND_SPILL_DIR', 'write_behind_spill')
+    WRITE_BEHIND_FSYNC = os.getenv('WRITE_BEHIND_FSYNC', 'true').lower() == 'true'
+    WRITE_BEHIND_MAX_ATTEMPTS = int(os.getenv('WRITE_BEHIND_MAX_ATTEMPTS', 8))
+    WRITE_BEHIND_MAX_BACKOFF_MS = int(os.getenv('WRITE_BEHIND_MAX_BACKOFF_MS', 30000))
+    WRITE_BEHIND_DEAD_LETTER_PATH = os.getenv('WRITE_BEHIND_DEAD_LETTER_PATH', 'write_behind_dead_letter.jsonl')
+    
+    # Metrics (/metrics); set METRICS_DIR to aggregate across worker processes
+    METRICS_DIR = os.getenv('METRICS_DIR')
+    METRICS_FLUSH_INTERVAL_MS = int(os.getenv('METRICS_FLUSH_INTERVAL_MS', 1000))
+    
+    # OpenTelemetry tracing (optional; see utils/tracing.py)
+    TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'false').lower() == 'true'
+    TRACING_EXPORTER = os.getenv('TRACING_EXPORTER', 'otlp')  # 'otlp' (collector) or 'file'
+    TRACING_OTLP_ENDPOINT = os.getenv('TRACING_OTLP_ENDPOINT', 'http://localhost:4318/v1/traces')
+    TRACING_FILE = os.getenv('TRACING_FILE', 'traces.jsonl')
+    TRACING_SERVICE_NAME = os.getenv('TRACING_SERVICE_NAME', 'mockview-backend')
+    TRACING_SAMPLE_RATIO = float(os.getenv('TRACING_SAMPLE_RATIO', 1.0))
+    
+    # Shared secret for operator-only features (admin endpoints, signed profiling requests)
+    ADMIN_SECRET = os.getenv('ADMIN_SECRET')
+    
+    # Per-request CPU profiling (see utils/profiling.py)
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() == 'true'
+    PROFILING_DIR = os.getenv('PROFILING_DIR', 'profiles')
+    PROFILING_MODE = os.getenv('PROFILING_MODE', 'cprofile')  # 'cprofile' (pstats) or 'sample' (collapsed stacks)
+    PROFILING_SAMPLE_RATE = int(os.getenv('PROFILING_SAMPLE_RATE', 0))  # Profile 1 in N requests, 0 = off
+    PROFILING_SAMPLE_INTERVAL_MS = float(os.getenv('PROFILING_SAMPLE_INTERVAL_MS', 5))
+    
+    # Allocation tracking (tracemalloc; see utils/allocations.py)
+    TRACEMALLOC_ENABLED = os.getenv('TRACEMALLOC_ENABLED', 'false').lower() == 'true'  # Trace from startup
+    TRACEMALLOC_FRAMES = int(os.getenv('TRACEMALLOC_FRAMES', 10))
+    REQUEST_ALLOCATION_METRICS = os.getenv('REQUEST_ALLOCATION_METRICS', 'false').lower() == 'true'
+    
+    # Live voice answers over WebSocket (optional; needs flask-sock, see routes/voice_stream_routes.py)
+    VOICE_STREAM_IDLE_TIMEOUT_S = float(os.getenv('VOICE_STREAM_IDLE_TIMEOUT_S', 30))
+    VOICE_STREAM_MAX_SECONDS = int(os.getenv('VOICE_STREAM_MAX_SECONDS', 600))
+    VOICE_STREAM_MAX_CHARS = int(os.getenv('VOICE_STREAM_MAX_CHARS', 50000))
+    
+    # Audio analysis of uploaded recordings (process pool per worker; 0 analyzes inline)
+    AUDIO_WORKERS = int(os.getenv('AUDIO_WORKERS', 2))
+    AUDIO_MAX_BYTES = int(os.getenv('AUDIO_MAX_BYTES', 128 * 1024 * 1024))
+    AUDIO_MAX_SECONDS = float(os.getenv('AUDIO_MAX_SECONDS', 600))
+    AUDIO_ANALYSIS_TIMEOUT_S = float(os.getenv('AUDIO_ANALYSIS_TIMEOUT_S', 30))
+    
+    # Per-request evaluation budget (see ml_models/evaluation_budget.py)
+    EVAL_TIME_BUDGET_MS = float(os.getenv('EVAL_TIME_BUDGET_MS', 2000))
+    EVAL_MAX_WORDS = int(os.getenv('EVAL_MAX_WORDS', 3000))  # Longer texts are scored on a sample
+    
+    # Admission control for the NLP endpoints, node-wide (see utils/admission.py; 0 turns it off)
+    EVAL_MAX_CONCURRENT = int(os.getenv('EVAL_MAX_CONCURRENT', os.cpu_count() or 2))
+    EVAL_MAX_QUEUED = int(os.getenv('EVAL_MAX_QUEUED', 2 * (os.cpu_count() or 2)))
+    EVAL_QUEUE_TIMEOUT_MS = float(os.getenv('EVAL_QUEUE_TIMEOUT_MS', 1000))
+    EVAL_SLOTS_DIR = os.getenv('EVAL_SLOTS_DIR', 'eval_slots')
+    
+    # Idempotency-Key on evaluation requests (see services/idempotency_service.py)
+    IDEMPOTENCY_TTL_HOURS = float(os.getenv('IDEMPOTENCY_TTL_HOURS', 24))  # Stored responses are replayed this long
+    IDEMPOTENCY_LOCK_SECONDS = int(os.getenv('IDEMPOTENCY_LOCK_SECONDS', 120))  # Claim of a request that never finished
     
-    # API Rate limiting (optional)
+    # API Rate limiting (optional; token buckets shared by a node's workers, see utils/rate_limit.py)
     RATELIMIT_ENABLED = os.getenv('RATELIMIT_ENABLED', 'false').lower() == 'true'
-    RATELIMIT_DEFAULT = "100 per hour"
+    RATELIMIT_DEFAULT = os.getenv('RATELIMIT_DEFAULT', '100 per hour')  # Per user
+    RATELIMIT_PER_IP = os.getenv('RATELIMIT_PER_IP', '1000 per hour')
+    RATELIMIT_STORAGE_PATH = os.getenv('RATELIMIT_STORAGE_PATH', 'ratelimit.sqlite3')
+    RATELIMIT_PROXY_HOPS = int(os.getenv('RATELIMIT_PROXY_HOPS', 0))  # Proxies setting X-Forwarded-For
     
     # Scoring weights for AI evaluation
     INTERVIEW_WEIGHTS = {
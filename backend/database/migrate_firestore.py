@@ -0,0 +1,177 @@
+"""
+Firestore to Supabase Migration
+Copies interview sessions, fluency tests and resumes stored in Firestore by
+earlier versions of the app into their Supabase tables
+
+The dashboard, fluency score and resume feedback endpoints read Supabase
+only, so Firestore documents are invisible to them until copied. Documents
+are matched to rows by id and never overwrite an existing row, so the copy
+can be re-run. Fields are renamed to the table's columns (timestamp ->
+created_at, a resume's score -> overall_score, the document id -> id);
+fields without a column are dropped.
+
+Needs firebase-admin and FIREBASE_CREDENTIALS_PATH (no longer in requirements.txt):
+    pip install firebase-admin
+    python -m database.migrate_firestore [--dry-run]
+"""
+
+import sys
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from database.supabase_config import (
+    get_supabase_client, INTERVIEW_SESSIONS_TABLE, FLUENCY_TESTS_TABLE, RESUMES_TABLE
+)
+
+# Rows per upsert
+BATCH_SIZE = 200
+
+# Collection -> (table, writable columns, integer columns, renamed fields)
+# Generated columns (question_count, suggestion_count) are left to the database
+COLLECTIONS = {
+    'interview_sessions': (
+        INTERVIEW_SESSIONS_TABLE,
+        ('user_id', 'job_role', 'skill_level', 'interview_type', 'questions', 'answers', 'scores',
+         'feedback', 'overall_score', 'status', 'created_at', 'completed_at'),
+        ('overall_score',),
+        {'timestamp': 'created_at'}
+    ),
+    'fluency_tests': (
+        FLUENCY_TESTS_TABLE,
+        ('user_id', 'transcript', 'audio_url', 'fluency_score', 'pronunciation_score', 'grammar_score',
+         'wpm', 'pause_count', 'filler_word_count', 'audio_duration', 'grammar_errors', 'feedback',
+         'overall_score', 'created_at'),
+        ('fluency_score', 'pronunciation_score', 'grammar_score', 'wpm', 'pause_count',
+         'filler_word_count', 'overall_score'),
+        {'timestamp': 'created_at'}
+    ),
+    'resumes': (
+        RESUMES_TABLE,
+        ('user_id', 'resume_type', 'file_url', 'content', 'parsed_text', 'analysis', 'ats_score',
+         'grammar_score', 'keyword_match_score', 'overall_score', 'suggestions', 'target_job_role',
+         'created_at', 'updated_at'),
+        ('ats_score', 'grammar_score', 'keyword_match_score', 'overall_score'),
+        {'timestamp': 'created_at', 'score': 'overall_score'}
+    )
+}
+
+# NOT NULL columns without a database default
+REQUIRED_DEFAULTS = {
+    'interview_sessions': {'questions': [], 'answers': []},
+    'fluency_tests': {'transcript': ''}
+}
+
+def _json_value(value):
+    """Firestore values -> JSON-serializable ones (timestamps become ISO strings)"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {key: _json_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_json_value(item) for item in value]
+    return value
+
+def to_row(collection: str, doc_id: str, data: Dict) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Supabase row for a Firestore document
+
+    Returns:
+        tuple: (row, None), or (None, reason) for documents that can't be copied
+    """
+    _, columns, integer_columns, renames = COLLECTIONS[collection]
+
+    try:
+        row_id = str(uuid.UUID(str(doc_id)))
+    except ValueError:
+        return None, f"id {doc_id!r} is not a UUID"
+
+    fields = {renames.get(key, key): value for key, value in data.items()}
+    if not fields.get('user_id'):
+        return None, "no user_id"
+
+    row = {'id': row_id}
+    for column in columns:
+        if fields.get(column) is not None:
+            row[column] = _json_value(fields[column])
+    for column in integer_columns:
+        if column in row:
+            # Truncated, as the app stores scores
+            row[column] = int(float(row[column]))
+    for column, default in REQUIRED_DEFAULTS.get(collection, {}).items():
+        row.setdefault(column, default)
+
+    # Analyzed resumes kept the target role inside content
+    if collection == 'resumes' and 'target_job_role' not in row:
+        job_role = (row.get('content') or {}).get('job_role')
+        if job_role:
+            row['target_job_role'] = job_role
+
+    return row, None
+
+def _upsert(table: str, rows: List[Dict]) -> List[str]:
+    """Insert rows whose id is new; returns errors (a failed batch is retried row by row)"""
+    supabase = get_supabase_client()
+
+    def insert(batch):
+        supabase.table(table).upsert(
+            batch, on_conflict='id', ignore_duplicates=True, default_to_null=False
+        ).execute()
+
+    try:
+        insert(rows)
+        return []
+    except Exception:
+        errors = []
+        for row in rows:
+            try:
+                insert([row])
+            except Exception as e:
+                errors.append(f"{row['id']}: {str(e)}")
+        return errors
+
+def migrate(dry_run: bool = False) -> Dict:
+    """
+    Copy every collection
+
+    Returns:
+        dict: Per collection, documents read, rows copied and skipped documents with reasons
+    """
+    from database.firebase_config import get_firestore_client
+
+    db = get_firestore_client()
+    if db is None:
+        raise Exception("Firestore not available (check FIREBASE_CREDENTIALS_PATH)")
+    if get_supabase_client() is None:
+        raise Exception("Database not available")
+
+    report = {}
+    for collection, (table, _, _, _) in COLLECTIONS.items():
+        rows, skipped = [], []
+        documents = 0
+        for document in db.collection(collection).stream():
+            documents += 1
+            row, reason = to_row(collection, document.id, document.to_dict() or {})
+            if row is None:
+                skipped.append(f"{document.id}: {reason}")
+            else:
+                rows.append(row)
+
+        if not dry_run:
+            for start in range(0, len(rows), BATCH_SIZE):
+                skipped.extend(_upsert(table, rows[start:start + BATCH_SIZE]))
+
+        report[collection] = {'documents': documents, 'rows': len(rows), 'skipped': skipped}
+        print(f"{collection}: {documents} documents, {len(rows)} rows "
+              f"{'to copy' if dry_run else 'copied (existing ids kept)'}, {len(skipped)} skipped")
+        for line in skipped:
+            print(f"  ✗ {line}")
+
+    return report
+
+if __name__ == '__main__':
+    try:
+        migrate(dry_run='--dry-run' in sys.argv)
+    except ImportError:
+        print("firebase-admin is not installed: pip install firebase-admin")
+        sys.exit(2)
@@ -31,6 +31,7 @@ CREATE TABLE IF NOT EXISTS interview_sessions (
     interview_type VARCHAR(50) DEFAULT 'text', -- text, voice, chat
     questions JSONB NOT NULL, -- Array of question objects
     answers JSONB NOT NULL, -- Array of answer objects
+    question_count INTEGER GENERATED ALWAYS AS (jsonb_array_length(questions)) STORED, -- For summary listings
     scores JSONB, -- Overall scores object
     feedback JSONB, -- Detailed feedback object
     overall_score INTEGER, -- 0-100
@@ -53,12 +54,16 @@ CREATE TABLE IF NOT EXISTS fluency_tests (
     wpm INTEGER, -- Words per minute
     pause_count INTEGER,
     filler_word_count INTEGER,
+    audio_duration REAL, -- Seconds, as used for the analysis
     grammar_errors JSONB, -- Array of grammar error objects
     feedback JSONB, -- Detailed feedback array
     overall_score INTEGER, -- 0-100
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Databases created before audio_duration was stored
+ALTER TABLE fluency_tests ADD COLUMN IF NOT EXISTS audio_duration REAL;
+
 -- =============================================
 -- RESUMES TABLE
 -- =============================================
@@ -75,6 +80,7 @@ CREATE TABLE IF NOT EXISTS resumes (
     keyword_match_score INTEGER,
     overall_score INTEGER, -- 0-100
     suggestions JSONB, -- Array of improvement suggestions
+    suggestion_count INTEGER GENERATED ALWAYS AS (COALESCE(jsonb_array_length(suggestions), 0)) STORED, -- For summary listings
     target_job_role VARCHAR(255),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
@@ -93,6 +99,36 @@ CREATE TABLE IF NOT EXISTS chat_history (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- =============================================
+-- SCORE FEATURES TABLE (re-scoring without re-running the NLP)
+-- =============================================
+CREATE TABLE IF NOT EXISTS score_features (
+    id TEXT PRIMARY KEY, -- '<kind>:<result id>'
+    kind VARCHAR(50) NOT NULL, -- interview_answer, fluency_test, resume
+    result_id TEXT NOT NULL, -- Answer id, fluency test id or resume id
+    session_id UUID, -- Interview session of an answer
+    question_id TEXT, -- Key of the answer in the session's scores map
+    user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+    version SMALLINT NOT NULL, -- Feature layout version (ml_models/score_features.py)
+    features DOUBLE PRECISION[] NOT NULL, -- Raw NLP outputs in the layout's order
+    score NUMERIC, -- Overall score from the last (re-)scoring
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    scored_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- =============================================
+-- IDEMPOTENCY KEYS TABLE (stored responses replayed to retried requests)
+-- =============================================
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    id TEXT PRIMARY KEY, -- '<user id>:<Idempotency-Key header>'
+    user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+    request_hash TEXT NOT NULL, -- SHA-256 of the method, path and body
+    status VARCHAR(20) NOT NULL DEFAULT 'in_progress', -- in_progress, completed
+    response_status INTEGER,
+    response_body JSONB,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
 -- =============================================
 -- INDEXES FOR PERFORMANCE
 -- =============================================
@@ -102,8 +138,20 @@ CREATE INDEX IF NOT EXISTS idx_interview_sessions_created_at ON interview_sessio
 CREATE INDEX IF NOT EXISTS idx_fluency_tests_user_id ON fluency_tests(user_id);
 CREATE INDEX IF NOT EXISTS idx_fluency_tests_created_at ON fluency_tests(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_resumes_user_id ON resumes(user_id);
+CREATE INDEX IF NOT EXISTS idx_resumes_created_at ON resumes(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_chat_history_user_id ON chat_history(user_id);
 CREATE INDEX IF NOT EXISTS idx_chat_history_session_id ON chat_history(session_id);
+CREATE INDEX IF NOT EXISTS idx_score_features_kind_id ON score_features(kind, id); -- Keyset pages per kind
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_created_at ON idempotency_keys(created_at); -- Expiry sweeps
+
+-- =============================================
+-- MIGRATIONS FOR EXISTING DATABASES
+-- =============================================
+-- Summary columns used by list views so they never read the JSONB blobs
+ALTER TABLE interview_sessions ADD COLUMN IF NOT EXISTS question_count INTEGER
+    GENERATED ALWAYS AS (jsonb_array_length(questions)) STORED;
+ALTER TABLE resumes ADD COLUMN IF NOT EXISTS suggestion_count INTEGER
+    GENERATED ALWAYS AS (COALESCE(jsonb_array_length(suggestions), 0)) STORED;
 
 -- =============================================
 -- ROW LEVEL SECURITY (RLS) POLICIES
@@ -115,6 +163,8 @@ ALTER TABLE interview_sessions ENABLE ROW LEVEL SECURITY;
 ALTER TABLE fluency_tests ENABLE ROW LEVEL SECURITY;
 ALTER TABLE resumes ENABLE ROW LEVEL SECURITY;
 ALTER TABLE chat_history ENABLE ROW LEVEL SECURITY;
+ALTER TABLE score_features ENABLE ROW LEVEL SECURITY; -- Service role only (no policies)
+ALTER TABLE idempotency_keys ENABLE ROW LEVEL SECURITY; -- Service role only (no policies)
 
 -- Users can only read/update their own profile
 CREATE POLICY users_select_own ON users FOR SELECT USING (auth.uid() = id);
@@ -155,3 +205,275 @@ CREATE TRIGGER update_users_updated_at BEFORE UPDATE ON users
 
 CREATE TRIGGER update_resumes_updated_at BEFORE UPDATE ON resumes
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- =============================================
+-- OWNERSHIP-CHECKED WRITES (called via RPC)
+-- Each function checks ownership and applies the update in a single
+-- statement, so a route's write path is one round trip with no
+-- read-modify-write race. An empty result means "not found or not owned".
+-- =============================================
+
+-- Append one evaluated answer and its score summary to a session
+-- (the 7-argument version took a client-sent role and is dropped)
+DROP FUNCTION IF EXISTS append_interview_answer(UUID, UUID, TEXT, JSONB, JSONB, TEXT, TEXT);
+CREATE OR REPLACE FUNCTION append_interview_answer(
+    p_session_id UUID,
+    p_user_id UUID,
+    p_question_id TEXT,
+    p_answer JSONB,
+    p_score JSONB
+)
+RETURNS TABLE (id UUID, user_id UUID, status VARCHAR, answer_count INTEGER) AS $$
+    UPDATE interview_sessions AS s
+    SET answers = s.answers || jsonb_build_array(p_answer),
+        scores = COALESCE(s.scores, '{}'::jsonb) || jsonb_build_object(p_question_id, p_score)
+    WHERE s.id = p_session_id AND s.user_id = p_user_id
+    RETURNING s.id, s.user_id, s.status, jsonb_array_length(s.answers);
+$$ LANGUAGE sql;
+
+-- Mark a session completed, computing overall_score from the stored scores
+CREATE OR REPLACE FUNCTION complete_interview_session(
+    p_session_id UUID,
+    p_user_id UUID
+)
+RETURNS SETOF interview_sessions AS $$
+    UPDATE interview_sessions AS s
+    SET status = 'completed',
+        overall_score = COALESCE((
+            SELECT TRUNC(AVG((value->>'score')::NUMERIC))::INTEGER
+            FROM jsonb_each(COALESCE(s.scores, '{}'::jsonb))
+        ), 0),
+        completed_at = NOW()
+    WHERE s.id = p_session_id AND s.user_id = p_user_id
+    RETURNING s.*;
+$$ LANGUAGE sql;
+
+-- Store a fluency analysis
+-- overall_score comes in p_data (FluencyTest.calculate_overall_score). Scores
+-- are truncated to integers, like FluencyTest.create's int().
+CREATE OR REPLACE FUNCTION apply_fluency_analysis(
+    p_test_id UUID,
+    p_user_id UUID,
+    p_data JSONB
+)
+RETURNS SETOF fluency_tests AS $$
+    UPDATE fluency_tests AS t
+    SET transcript = p_data->>'transcript',
+        fluency_score = TRUNC((p_data->>'fluency_score')::NUMERIC)::INTEGER,
+        pronunciation_score = TRUNC((p_data->>'pronunciation_score')::NUMERIC)::INTEGER,
+        grammar_score = TRUNC((p_data->>'grammar_score')::NUMERIC)::INTEGER,
+        wpm = TRUNC((p_data->>'wpm')::NUMERIC)::INTEGER,
+        pause_count = (p_data->>'pause_count')::INTEGER,
+        filler_word_count = (p_data->>'filler_word_count')::INTEGER,
+        audio_duration = (p_data->>'audio_duration')::REAL,
+        feedback = COALESCE(p_data->'feedback', '[]'::jsonb),
+        grammar_errors = COALESCE(p_data->'grammar_errors', '[]'::jsonb),
+        overall_score = TRUNC((p_data->>'overall_score')::NUMERIC)::INTEGER
+    WHERE t.id = p_test_id AND t.user_id = p_user_id
+    RETURNING t.*;
+$$ LANGUAGE sql;
+
+-- =============================================
+-- BULK WRITES (write-behind flushes, called via RPC)
+-- Safe to replay: answers already present (by answer id) are skipped and
+-- fluency updates are idempotent.
+-- =============================================
+
+-- Append many answers, possibly to many sessions, in one statement
+-- p_items: [{session_id, user_id, question_id, answer, score}, ...]
+CREATE OR REPLACE FUNCTION append_interview_answers(p_items JSONB)
+RETURNS INTEGER AS $$
+    WITH items AS (
+        SELECT (t.item->>'session_id')::UUID AS session_id,
+               (t.item->>'user_id')::UUID AS user_id,
+               t.item->>'question_id' AS question_id,
+               t.item->'answer' AS answer,
+               t.item->'score' AS score,
+               t.ord
+        FROM jsonb_array_elements(p_items) WITH ORDINALITY AS t(item, ord)
+        WHERE NOT EXISTS (
+            SELECT 1
+            FROM interview_sessions s, jsonb_array_elements(s.answers) AS a(answer)
+            WHERE s.id = (t.item->>'session_id')::UUID
+              AND a.answer->>'id' = t.item->'answer'->>'id'
+        )
+    ), grouped AS (
+        SELECT session_id, user_id,
+               jsonb_agg(answer ORDER BY ord) AS answers,
+               jsonb_object_agg(question_id, score ORDER BY ord) AS scores
+        FROM items
+        GROUP BY session_id, user_id
+    ), updated AS (
+        UPDATE interview_sessions AS s
+        SET answers = s.answers || g.answers,
+            scores = COALESCE(s.scores, '{}'::jsonb) || g.scores
+        FROM grouped g
+        WHERE s.id = g.session_id AND s.user_id = g.user_id
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM updated;
+$$ LANGUAGE sql;
+
+-- Store many fluency analyses in one statement
+-- p_items: [{test_id, user_id, data}, ...] with data as in apply_fluency_analysis
+CREATE OR REPLACE FUNCTION apply_fluency_analyses(p_items JSONB)
+RETURNS INTEGER AS $$
+    WITH updated AS (
+        UPDATE fluency_tests AS t
+        SET transcript = i.item->'data'->>'transcript',
+            fluency_score = TRUNC((i.item->'data'->>'fluency_score')::NUMERIC)::INTEGER,
+            pronunciation_score = TRUNC((i.item->'data'->>'pronunciation_score')::NUMERIC)::INTEGER,
+            grammar_score = TRUNC((i.item->'data'->>'grammar_score')::NUMERIC)::INTEGER,
+            wpm = TRUNC((i.item->'data'->>'wpm')::NUMERIC)::INTEGER,
+            pause_count = (i.item->'data'->>'pause_count')::INTEGER,
+            filler_word_count = (i.item->'data'->>'filler_word_count')::INTEGER,
+            audio_duration = (i.item->'data'->>'audio_duration')::REAL,
+            feedback = COALESCE(i.item->'data'->'feedback', '[]'::jsonb),
+            grammar_errors = COALESCE(i.item->'data'->'grammar_errors', '[]'::jsonb),
+            overall_score = TRUNC((i.item->'data'->>'overall_score')::NUMERIC)::INTEGER
+        FROM jsonb_array_elements(p_items) AS i(item)
+        WHERE t.id = (i.item->>'test_id')::UUID
+          AND t.user_id = (i.item->>'user_id')::UUID
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM updated;
+$$ LANGUAGE sql;
+
+-- =============================================
+-- BULK RE-SCORING (services/rescoring_service.py, called via RPC)
+-- Each call updates one page of results and their score_features rows in
+-- one statement. Idempotent: re-running a page writes the same values.
+-- =============================================
+
+-- p_items: [{feature_id, session_id, question_id, score: {score, relevance, grammar, completeness, sentiment}}, ...]
+-- Completed sessions get overall_score recomputed as in complete_interview_session
+CREATE OR REPLACE FUNCTION apply_interview_rescores(p_items JSONB)
+RETURNS INTEGER AS $$
+    WITH items AS (
+        SELECT t.item, t.ord
+        FROM jsonb_array_elements(p_items) WITH ORDINALITY AS t(item, ord)
+    ), features AS (
+        UPDATE score_features AS f
+        SET score = (i.item->'score'->>'score')::NUMERIC,
+            scored_at = NOW()
+        FROM items i
+        WHERE f.id = i.item->>'feature_id'
+        RETURNING 1
+    ), grouped AS (
+        SELECT (item->>'session_id')::UUID AS session_id,
+               jsonb_object_agg(item->>'question_id', item->'score' ORDER BY ord) AS scores
+        FROM items
+        GROUP BY 1
+    ), updated AS (
+        UPDATE interview_sessions AS s
+        SET scores = COALESCE(s.scores, '{}'::jsonb) || g.scores,
+            overall_score = CASE WHEN s.status = 'completed' THEN COALESCE((
+                SELECT TRUNC(AVG((value->>'score')::NUMERIC))::INTEGER
+                FROM jsonb_each(COALESCE(s.scores, '{}'::jsonb) || g.scores)
+            ), 0) ELSE s.overall_score END
+        FROM grouped g
+        WHERE s.id = g.session_id
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM updated;
+$$ LANGUAGE sql;
+
+-- p_items: [{feature_id, test_id, fluency_score, grammar_score, overall_score}, ...]
+CREATE OR REPLACE FUNCTION apply_fluency_rescores(p_items JSONB)
+RETURNS INTEGER AS $$
+    WITH items AS (
+        SELECT i.item FROM jsonb_array_elements(p_items) AS i(item)
+    ), features AS (
+        UPDATE score_features AS f
+        SET score = (i.item->>'overall_score')::NUMERIC,
+            scored_at = NOW()
+        FROM items i
+        WHERE f.id = i.item->>'feature_id'
+        RETURNING 1
+    ), updated AS (
+        UPDATE fluency_tests AS t
+        SET fluency_score = TRUNC((i.item->>'fluency_score')::NUMERIC)::INTEGER,
+            grammar_score = TRUNC((i.item->>'grammar_score')::NUMERIC)::INTEGER,
+            overall_score = TRUNC((i.item->>'overall_score')::NUMERIC)::INTEGER
+        FROM items i
+        WHERE t.id = (i.item->>'test_id')::UUID
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM updated;
+$$ LANGUAGE sql;
+
+-- p_items: [{feature_id, resume_id, grammar_score, structure_score, ats_score, keyword_score, overall_score}, ...]
+CREATE OR REPLACE FUNCTION apply_resume_rescores(p_items JSONB)
+RETURNS INTEGER AS $$
+    WITH items AS (
+        SELECT i.item FROM jsonb_array_elements(p_items) AS i(item)
+    ), features AS (
+        UPDATE score_features AS f
+        SET score = (i.item->>'overall_score')::NUMERIC,
+            scored_at = NOW()
+        FROM items i
+        WHERE f.id = i.item->>'feature_id'
+        RETURNING 1
+    ), updated AS (
+        UPDATE resumes AS r
+        SET ats_score = TRUNC((i.item->>'ats_score')::NUMERIC)::INTEGER,
+            grammar_score = TRUNC((i.item->>'grammar_score')::NUMERIC)::INTEGER,
+            keyword_match_score = TRUNC((i.item->>'keyword_score')::NUMERIC)::INTEGER,
+            overall_score = TRUNC((i.item->>'overall_score')::NUMERIC)::INTEGER,
+            analysis = COALESCE(r.analysis, '{}'::jsonb) || jsonb_build_object(
+                'grammar_score', i.item->'grammar_score',
+                'structure_score', i.item->'structure_score',
+                'ats_score', i.item->'ats_score',
+                'keyword_score', i.item->'keyword_score'
+            )
+        FROM items i
+        WHERE r.id = (i.item->>'resume_id')::UUID
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM updated;
+$$ LANGUAGE sql;
+
+-- =============================================
+-- IDEMPOTENCY KEYS (called via RPC)
+-- =============================================
+
+-- Claim a key for a request, or return the request that already holds it.
+-- claimed is true when this call took the key: the caller runs the request
+-- and stores its response. Keys past p_ttl_seconds, and claims left
+-- in_progress past p_lock_seconds (the worker died), are free again; each
+-- call also sweeps a few other expired keys.
+CREATE OR REPLACE FUNCTION claim_idempotency_key(
+    p_id TEXT,
+    p_user_id UUID,
+    p_request_hash TEXT,
+    p_ttl_seconds INTEGER,
+    p_lock_seconds INTEGER
+)
+RETURNS TABLE (claimed BOOLEAN, request_hash TEXT, status VARCHAR, response_status INTEGER, response_body JSONB) AS $$
+BEGIN
+    DELETE FROM idempotency_keys AS k
+    WHERE (
+        k.id = p_id AND (
+            k.created_at < NOW() - make_interval(secs => p_ttl_seconds)
+            OR (k.status = 'in_progress' AND k.created_at < NOW() - make_interval(secs => p_lock_seconds))
+        )
+    ) OR k.id IN (
+        SELECT e.id FROM idempotency_keys AS e
+        WHERE e.created_at < NOW() - make_interval(secs => p_ttl_seconds)
+        LIMIT 100
+    );
+
+    INSERT INTO idempotency_keys (id, user_id, request_hash)
+    VALUES (p_id, p_user_id, p_request_hash)
+    ON CONFLICT (id) DO NOTHING;
+
+    IF FOUND THEN
+        RETURN QUERY SELECT TRUE, p_request_hash, 'in_progress'::VARCHAR, NULL::INTEGER, NULL::JSONB;
+    ELSE
+        RETURN QUERY
+        SELECT FALSE, k.request_hash, k.status, k.response_status, k.response_body
+        FROM idempotency_keys AS k
+        WHERE k.id = p_id;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
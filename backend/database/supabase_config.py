@@ -3,7 +3,6 @@ Supabase Configuration and Initialization
 Sets up Supabase client for PostgreSQL database, Authentication, and Storage
 """
 
-from supabase import create_client, Client
 import os
 from dotenv import load_dotenv
 
@@ -13,8 +12,9 @@ load_dotenv()
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_SERVICE_KEY')
 
-# Initialize Supabase client
-supabase: Client = None
+# Initialize Supabase client (the supabase package, with its gotrue/httpx
+# stack, is imported on first use so it stays off the boot path)
+supabase = None
 
 def initialize_supabase():
     """
@@ -33,6 +33,8 @@ def initialize_supabase():
             print("Please set SUPABASE_URL and SUPABASE_SERVICE_KEY in .env file")
             return None
         
+        from supabase import create_client
+
         supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
         print("Supabase initialized successfully")
         print(f"Connected to: {SUPABASE_URL}")
@@ -78,3 +80,5 @@ INTERVIEW_SESSIONS_TABLE = 'interview_sessions'
 FLUENCY_TESTS_TABLE = 'fluency_tests'
 RESUMES_TABLE = 'resumes'
 CHAT_HISTORY_TABLE = 'chat_history'
+SCORE_FEATURES_TABLE = 'score_features'
+IDEMPOTENCY_KEYS_TABLE = 'idempotency_keys'
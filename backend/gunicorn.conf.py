@@ -0,0 +1,55 @@
+"""
+Gunicorn configuration for MockView Trainer
+Pre-fork model loading: the app (and all NLP state) is loaded in the master
+
+Set MEMORY_REPORT=true to log per-worker RSS / PSS / USS after boot and every
+MEMORY_REPORT_EVERY requests (see utils/memory_report.py).
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+workers = int(os.getenv('WEB_CONCURRENCY', 4))
+threads = int(os.getenv('GUNICORN_THREADS', 1))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+
+wsgi_app = 'wsgi:app'
+
+# Import wsgi.py (and warm every model) in the master before forking
+preload_app = True
+
+MEMORY_REPORT = os.getenv('MEMORY_REPORT', 'false').lower() == 'true'
+MEMORY_REPORT_EVERY = int(os.getenv('MEMORY_REPORT_EVERY', 500))
+
+_requests_served = 0
+
+def on_starting(server):
+    """Drop metric snapshots left by a previous master (see utils/metrics.py)"""
+    from utils.metrics import clear_snapshots
+    clear_snapshots()
+
+def when_ready(server):
+    """Log master memory once the app is preloaded"""
+    if MEMORY_REPORT:
+        from utils.memory_report import read_memory, format_memory
+        server.log.info(format_memory(read_memory(os.getpid()), 'master '))
+
+def post_worker_init(worker):
+    """Log each worker's memory right after it starts"""
+    if MEMORY_REPORT:
+        from utils.memory_report import read_memory, format_memory
+        worker.log.info(format_memory(read_memory(os.getpid()), 'worker '))
+
+def post_request(worker, req, environ, resp):
+    """Periodically log worker memory to spot pages being un-shared"""
+    global _requests_served
+
+    if not MEMORY_REPORT:
+        return
+
+    _requests_served += 1
+    if _requests_served % MEMORY_REPORT_EVERY == 0:
+        from utils.memory_report import read_memory, format_memory
+        worker.log.info(
+            format_memory(read_memory(os.getpid()), f'worker after {_requests_served} requests ')
+        )
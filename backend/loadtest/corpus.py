@@ -0,0 +1,436 @@
+"""
+Workload Corpus
+Deterministic synthetic answers, voice transcripts, resumes and user
+histories for benchmarks and load tests
+
+Usage (from backend/):
+    python -m loadtest.corpus <answers|transcripts|resumes|histories>
+                              [--count 1000] [--start 0] [--seed 1729] [--out FILE]
+                              [--words N] [--spread S] [--min-words N] [--max-words N]
+                              [--fillers 0.06] [--pauses 0.04] [--repeats 0.02]
+                              [--sessions 6] [--tests 4] [--resumes 1]
+
+Writes one JSON record per line (stdout unless --out). Every role in
+data/job_keywords.json is covered, cycling by record index.
+
+Record i depends only on (seed, kind, i): a smaller corpus is a prefix of a
+larger one, and --start lets ranges be generated in parallel and
+concatenated. Text lengths are log-normal with median --words and sigma
+--spread, clamped to [--min-words, --max-words].
+
+History records hold a user plus interview_sessions, fluency_tests and
+resumes rows shaped like database/schema.sql. The fake Supabase loads them
+with --load, and every history user can log in with CORPUS_PASSWORD.
+"""
+
+import json
+import math
+import os
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), '..')
+
+SEED = 1729
+
+CORPUS_PASSWORD = 'Corpus#2024'
+
+# Fixed origin so timestamps don't depend on when the corpus is generated
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+HISTORY_DAYS = 365
+
+SKILL_LEVELS = ['Beginner', 'Intermediate', 'Advanced']
+
+# Default length distributions per kind: (median words, sigma, min, max)
+LENGTHS = {
+    'answers': (120, 0.5, 5, 1500),
+    'transcripts': (150, 0.6, 5, 5000),
+    'resumes': (350, 0.4, 80, 2000),
+    'histories': (40, 0.5, 5, 300)
+}
+
+_TEMPLATES = [
+    'I used {kw} to {verb} the {thing} for our {team}.',
+    'The main challenge was {challenge}, so we {action} with {kw}.',
+    'In my last role I {action} and improved {metric} by {pct} percent.',
+    'We chose {kw} over {kw2} because it made the {thing} easier to {verb}.',
+    'I learned that {lesson}.',
+    'Working with {kw} taught me how to {verb} a {thing} under pressure.',
+    'Our {team} relied on {kw} and {kw2} every day.',
+    'When the {thing} started failing I {action} and wrote a short postmortem.',
+    'I would start by asking about {challenge} before choosing {kw}.',
+    'That experience showed me how {kw} affects {metric}.'
+]
+
+_WORDS = {
+    'verb': ['build', 'scale', 'debug', 'monitor', 'redesign', 'test', 'migrate', 'document', 'optimize', 'ship'],
+    'thing': ['service', 'pipeline', 'dashboard', 'release process', 'data model', 'api', 'onboarding flow',
+              'reporting system', 'search feature', 'deployment'],
+    'team': ['team', 'customers', 'stakeholders', 'support engineers', 'product group', 'clients'],
+    'challenge': ['a tight deadline', 'unclear requirements', 'legacy code', 'heavy traffic', 'a small budget',
+                  'conflicting priorities', 'missing test coverage', 'a noisy on-call rotation'],
+    'action': ['split the work into milestones', 'added automated checks', 'paired with a senior engineer',
+               'set up clear metrics', 'ran user interviews', 'simplified the design', 'introduced code reviews'],
+    'metric': ['latency', 'conversion', 'reliability', 'test coverage', 'customer satisfaction', 'build time'],
+    'lesson': ['communication matters as much as code', 'small iterations reduce risk',
+               'measuring first saves time', 'good documentation helps the whole team',
+               'asking questions early prevents rework']
+}
+
+_FILLERS = ['um', 'uh', 'like', 'you know', 'so', 'basically', 'actually', 'i mean', 'sort of', 'kind of', 'well']
+
+_UNIVERSITIES = ['State University', 'Institute of Technology', 'City College', 'Polytechnic University']
+_DEGREES = ['B.Sc. Computer Science', 'B.A. Economics', 'M.Sc. Data Science', 'B.Eng. Software Engineering',
+            'MBA', 'B.Sc. Information Systems']
+_COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Hooli', 'Stark Industries', 'Wayne Enterprises']
+_FIRST_NAMES = ['Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn']
+_LAST_NAMES = ['Smith', 'Garcia', 'Chen', 'Patel', 'Kim', 'Okafor', 'Novak', 'Rossi', 'Silva', 'Khan']
+
+_roles_cache = None
+_questions_cache = None
+
+def load_roles() -> Dict[str, List[str]]:
+    """Job roles and their keywords from data/job_keywords.json"""
+    global _roles_cache
+    if _roles_cache is None:
+        with open(os.path.join(BACKEND_DIR, 'data', 'job_keywords.json'), 'r') as f:
+            _roles_cache = json.load(f)
+    return _roles_cache
+
+def load_questions() -> Dict:
+    global _questions_cache
+    if _questions_cache is None:
+        with open(os.path.join(BACKEND_DIR, 'data', 'interview_questions.json'), 'r') as f:
+            _questions_cache = json.load(f)
+    return _questions_cache
+
+class LengthDistribution:
+    """Log-normal word counts around a median, clamped to [minimum, maximum]"""
+
+    def __init__(self, median: int, spread: float, minimum: int, maximum: int):
+        self.mu = math.log(max(median, 1))
+        self.spread = spread
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def sample(self, rng: random.Random) -> int:
+        return max(self.minimum, min(self.maximum, int(round(rng.lognormvariate(self.mu, self.spread)))))
+
+def _rng(seed: int, kind: str, index: int) -> random.Random:
+    # String seeds hash with SHA-512, so this is stable across runs and platforms
+    return random.Random(f'{seed}:{kind}:{index}')
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+def _role(index: int) -> str:
+    roles = list(load_roles())
+    return roles[index % len(roles)]
+
+def _question(rng: random.Random, job_role: str, skill_level: str) -> str:
+    by_level = load_questions().get(job_role) or load_questions()['Software Engineer']
+    return rng.choice(by_level.get(skill_level) or by_level['Beginner'])
+
+def _sentence(rng: random.Random, keywords: List[str]) -> str:
+    values = {name: rng.choice(options) for name, options in _WORDS.items()}
+    values['kw'] = rng.choice(keywords)
+    values['kw2'] = rng.choice(keywords)
+    values['pct'] = rng.randint(5, 60)
+    return rng.choice(_TEMPLATES).format(**values)
+
+def make_answer_text(rng: random.Random, job_role: str, word_count: int) -> str:
+    """Written answer of exactly word_count words, using the role's keywords"""
+    keywords = load_roles()[job_role]
+    words = []
+    while len(words) < word_count:
+        words.extend(_sentence(rng, keywords).split())
+
+    words = words[:word_count]
+    if not words[-1].endswith('.'):
+        words[-1] = words[-1].rstrip(',') + '.'
+    return ' '.join(words)
+
+def make_transcript_text(rng: random.Random, job_role: str, word_count: int, fillers: float = 0.06,
+                         pauses: float = 0.04, repeats: float = 0.02) -> str:
+    """
+    Speech-to-text style transcript of about word_count spoken words
+    Fillers, ellipsis pauses and repeated words are inserted at the given
+    per-word rates; sentence punctuation is mostly dropped, as recognizers do
+    """
+    source = make_answer_text(rng, job_role, word_count).lower().split()
+    spoken = []
+
+    for word in source:
+        if rng.random() < fillers:
+            spoken.append(rng.choice(_FILLERS))
+        if rng.random() < repeats:
+            spoken.append(word.rstrip('.,'))
+        if word.endswith('.') and rng.random() < 0.7:
+            word = word[:-1]
+        if rng.random() < pauses:
+            word = word.rstrip('.,') + '...'
+        spoken.append(word)
+
+    return ' '.join(spoken)
+
+def _speaking_duration(rng: random.Random, text: str) -> float:
+    """Audio length in seconds at a plausible speaking rate (60-220 wpm)"""
+    wpm = max(60.0, min(220.0, rng.gauss(140, 25)))
+    return round(len(text.split()) / wpm * 60, 1)
+
+def _created_at(rng: random.Random) -> str:
+    return (EPOCH + timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400))).isoformat()
+
+def answer_record(seed: int, index: int, lengths: LengthDistribution) -> Dict:
+    rng = _rng(seed, 'answers', index)
+    job_role = _role(index)
+    skill_level = rng.choice(SKILL_LEVELS)
+    answer = make_answer_text(rng, job_role, lengths.sample(rng))
+    return {
+        'id': _uuid(rng),
+        'job_role': job_role,
+        'skill_level': skill_level,
+        'question': _question(rng, job_role, skill_level),
+        'answer': answer,
+        'word_count': len(answer.split())
+    }
+
+def transcript_record(seed: int, index: int, lengths: LengthDistribution, **rates) -> Dict:
+    rng = _rng(seed, 'transcripts', index)
+    job_role = _role(index)
+    transcript = make_transcript_text(rng, job_role, lengths.sample(rng), **rates)
+    return {
+        'id': _uuid(rng),
+        'job_role': job_role,
+        'transcript': transcript,
+        'audio_duration': _speaking_duration(rng, transcript),
+        'word_count': len(transcript.split())
+    }
+
+def _resume_content(rng: random.Random, job_role: str, word_count: int) -> Dict:
+    keywords = load_roles()[job_role]
+    first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+    experience = []
+    words = 0
+    start_year = 2024
+
+    while words < word_count:
+        bullets = [make_answer_text(rng, job_role, rng.randint(12, 28)) for _ in range(rng.randint(2, 5))]
+        years = rng.randint(1, 4)
+        experience.append({
+            'title': job_role if not experience else f'{rng.choice(["Junior", "Associate", ""])} {job_role}'.strip(),
+            'company': rng.choice(_COMPANIES),
+            'start_date': str(start_year - years),
+            'end_date': 'Present' if not experience else str(start_year),
+            'description': bullets
+        })
+        start_year -= years
+        words += sum(len(bullet.split()) for bullet in bullets) + 6
+
+    return {
+        'personal_info': {
+            'name': f'{first} {last}',
+            'email': f'{first}.{last}@example.com'.lower(),
+            'phone': f'555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}',
+            'summary': make_answer_text(rng, job_role, rng.randint(25, 45))
+        },
+        'education': [{
+            'degree': rng.choice(_DEGREES),
+            'institution': rng.choice(_UNIVERSITIES),
+            'year': str(start_year - rng.randint(0, 2))
+        }],
+        'experience': experience,
+        'skills': rng.sample(keywords, min(len(keywords), rng.randint(6, 15))),
+        'certifications': [f'{rng.choice(keywords)} Certification' for _ in range(rng.randint(0, 3))],
+        'projects': [
+            {'name': f'{rng.choice(keywords)} {rng.choice(_WORDS["thing"])}',
+             'description': make_answer_text(rng, job_role, rng.randint(15, 30))}
+            for _ in range(rng.randint(0, 3))
+        ]
+    }
+
+def render_resume_text(content: Dict) -> str:
+    """Plain-text resume, as /api/resume/analyze receives it"""
+    info = content['personal_info']
+    lines = [info['name'], f"{info['email']} | {info['phone']}", '', 'SUMMARY', info['summary'], '', 'EXPERIENCE']
+    for job in content['experience']:
+        lines.append(f"{job['title']}, {job['company']} ({job['start_date']} - {job['end_date']})")
+        lines.extend(f'- {bullet}' for bullet in job['description'])
+    lines += ['', 'EDUCATION']
+    lines.extend(f"{item['degree']}, {item['institution']}, {item['year']}" for item in content['education'])
+    lines += ['', 'SKILLS', ', '.join(content['skills'])]
+    if content['certifications']:
+        lines += ['', 'CERTIFICATIONS'] + content['certifications']
+    if content['projects']:
+        lines += ['', 'PROJECTS'] + [f"{p['name']}: {p['description']}" for p in content['projects']]
+    return '\n'.join(lines)
+
+def resume_record(seed: int, index: int, lengths: LengthDistribution) -> Dict:
+    rng = _rng(seed, 'resumes', index)
+    job_role = _role(index)
+    content = _resume_content(rng, job_role, lengths.sample(rng))
+    resume_text = render_resume_text(content)
+    return {
+        'id': _uuid(rng),
+        'job_role': job_role,
+        'content': content,
+        'resume_text': resume_text,
+        'word_count': len(resume_text.split())
+    }
+
+def _score(rng: random.Random, center: float = 70, spread: float = 15) -> int:
+    return max(0, min(100, int(round(rng.gauss(center, spread)))))
+
+def _session_row(rng: random.Random, user: Dict, lengths: LengthDistribution) -> Dict:
+    job_role, skill_level = user['job_role'], user['skill_level']
+    created_at = _created_at(rng)
+    questions = [
+        {'id': f'q{n + 1}', 'question': _question(rng, job_role, skill_level)}
+        for n in range(rng.randint(3, 8))
+    ]
+    completed = rng.random() < 0.85
+    answered = questions if completed else questions[:rng.randint(0, len(questions) - 1)]
+
+    answers, scores = [], {}
+    for question in answered:
+        answers.append({
+            'id': _uuid(rng).replace('-', ''),
+            'question_id': question['id'],
+            'question': question['question'],
+            'answer': make_answer_text(rng, job_role, lengths.sample(rng)),
+            'timestamp': created_at
+        })
+        scores[question['id']] = {
+            'score': _score(rng), 'relevance': _score(rng), 'grammar': _score(rng, 80, 10),
+            'completeness': _score(rng), 'sentiment': round(rng.uniform(-0.2, 0.9), 2)
+        }
+
+    row = {
+        'id': _uuid(rng), 'user_id': user['id'], 'job_role': job_role, 'skill_level': skill_level,
+        'interview_type': rng.choice(['text', 'text', 'voice']), 'questions': questions, 'answers': answers,
+        'scores': scores, 'feedback': None, 'overall_score': None, 'status': 'in_progress',
+        'created_at': created_at, 'completed_at': None
+    }
+    if completed and scores:
+        row['status'] = 'completed'
+        row['completed_at'] = created_at
+        # TRUNC of the average, as complete_interview_session does
+        row['overall_score'] = int(sum(item['score'] for item in scores.values()) / len(scores))
+    return row
+
+def _fluency_row(rng: random.Random, user: Dict, lengths: LengthDistribution) -> Dict:
+    transcript = make_transcript_text(rng, user['job_role'], lengths.sample(rng))
+    duration = _speaking_duration(rng, transcript)
+    fluency, pronunciation, grammar = _score(rng, 72), _score(rng, 80, 10), _score(rng, 78, 12)
+    return {
+        'id': _uuid(rng), 'user_id': user['id'], 'transcript': transcript, 'audio_url': None,
+        'fluency_score': fluency, 'pronunciation_score': pronunciation, 'grammar_score': grammar,
+        'wpm': int(round(len(transcript.split()) / duration * 60)) if duration else 0,
+        'pause_count': transcript.count('...'),
+        'filler_word_count': sum(transcript.split().count(filler) for filler in _FILLERS if ' ' not in filler),
+        'grammar_errors': [], 'feedback': [],
+        'overall_score': int(fluency * 0.35 + pronunciation * 0.30 + grammar * 0.35),
+        'created_at': _created_at(rng)
+    }
+
+def _resume_row(rng: random.Random, user: Dict) -> Dict:
+    content = _resume_content(rng, user['job_role'], rng.randint(100, 250))
+    ats, grammar, keywords = _score(rng, 75), _score(rng, 85, 10), _score(rng, 60, 20)
+    created_at = _created_at(rng)
+    suggestions = [
+        {'category': category, 'suggestion': make_answer_text(rng, user['job_role'], rng.randint(8, 16))}
+        for category in rng.sample(['keywords', 'grammar', 'structure', 'ats'], rng.randint(0, 4))
+    ]
+    return {
+        'id': _uuid(rng), 'user_id': user['id'], 'resume_type': rng.choice(['uploaded', 'built']),
+        'file_url': None, 'content': content, 'parsed_text': render_resume_text(content),
+        'analysis': {'ats_score': ats, 'grammar_score': grammar, 'keyword_score': keywords},
+        'ats_score': ats, 'grammar_score': grammar, 'keyword_match_score': keywords,
+        'overall_score': int(round((ats + grammar + keywords) / 3)), 'suggestions': suggestions,
+        'target_job_role': user['job_role'], 'created_at': created_at, 'updated_at': created_at
+    }
+
+def history_record(seed: int, index: int, lengths: LengthDistribution, sessions: int = 6,
+                   tests: int = 4, resumes: int = 1) -> Dict:
+    """A user and their rows; per-user counts are uniform in [0, 2 * mean]"""
+    rng = _rng(seed, 'histories', index)
+    user = {
+        'id': _uuid(rng),
+        'email': f'corpus-{seed}-{index}@example.com',
+        'name': f'{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}',
+        'skill_level': rng.choice(SKILL_LEVELS),
+        'job_role': _role(index),
+        'avatar_url': None,
+        'created_at': EPOCH.isoformat(),
+        'updated_at': EPOCH.isoformat()
+    }
+    return {
+        'user': user,
+        'interview_sessions': [_session_row(rng, user, lengths) for _ in range(rng.randint(0, 2 * sessions))],
+        'fluency_tests': [_fluency_row(rng, user, lengths) for _ in range(rng.randint(0, 2 * tests))],
+        'resumes': [_resume_row(rng, user) for _ in range(rng.randint(0, 2 * resumes))]
+    }
+
+def generate(kind: str, count: int, seed: int = SEED, start: int = 0,
+             lengths: Optional[LengthDistribution] = None, **options) -> Iterator[Dict]:
+    """Yield records start .. start + count - 1 of a corpus"""
+    if kind not in LENGTHS:
+        raise ValueError(f"Unknown corpus kind: {kind} (expected one of {', '.join(LENGTHS)})")
+
+    lengths = lengths or LengthDistribution(*LENGTHS[kind])
+    build = {
+        'answers': answer_record,
+        'transcripts': transcript_record,
+        'resumes': resume_record,
+        'histories': history_record
+    }[kind]
+
+    for index in range(start, start + count):
+        yield build(seed, index, lengths, **options)
+
+def read_histories(path: str) -> Iterator[Dict]:
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if not args or args[0].startswith('--'):
+        print(__doc__)
+        sys.exit(1)
+
+    def option(name, default, cast=str):
+        return cast(args[args.index(name) + 1]) if name in args else default
+
+    kind = args[0]
+    median, spread, minimum, maximum = LENGTHS.get(kind, LENGTHS['answers'])
+    lengths = LengthDistribution(
+        option('--words', median, int), option('--spread', spread, float),
+        option('--min-words', minimum, int), option('--max-words', maximum, int)
+    )
+
+    options = {}
+    if kind == 'transcripts':
+        options = {'fillers': option('--fillers', 0.06, float), 'pauses': option('--pauses', 0.04, float),
+                   'repeats': option('--repeats', 0.02, float)}
+    elif kind == 'histories':
+        options = {'sessions': option('--sessions', 6, int), 'tests': option('--tests', 4, int),
+                   'resumes': option('--resumes', 1, int)}
+
+    out_path = option('--out', None)
+    out = open(out_path, 'w') if out_path else sys.stdout
+    try:
+        records = generate(kind, option('--count', 1000, int), option('--seed', SEED, int),
+                           option('--start', 0, int), lengths, **options)
+        for record in records:
+            out.write(json.dumps(record, separators=(',', ':')) + '\n')
+    except BrokenPipeError:
+        # Reader closed early (e.g. `| head`); silence the flush at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        if out_path:
+            out.close()
@@ -0,0 +1,675 @@
+"""
+Fake Supabase
+In-memory stand-in for the PostgREST, RPC and GoTrue endpoints the backend
+uses, so load tests run without a Supabase project
+
+Run standalone (then point the app's SUPABASE_URL at it):
+    python -m loadtest.fake_supabase [--port 54321] [--latency-ms 2] [--load histories.jsonl]
+
+--load preloads user histories generated by loadtest/corpus.py.
+
+Implements only what models/*.py and routes/auth_routes.py call:
+- /rest/v1/<table>: select with eq/neq/gt/gte/lt/lte/in/is filters, order,
+  limit and offset; insert, upsert (ignore/merge duplicates), update, delete
+- /rest/v1/rpc/<function>: the functions in database/schema.sql
+- /auth/v1: signup, token?grant_type=password, user, logout
+
+The RPC functions follow the SQL in database/schema.sql; keep them in step.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import math
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl
+
+JWT_SECRET = b'fake-supabase-secret'
+
+# Column defaults per table (id and created_at are added to every row)
+TABLE_DEFAULTS = {
+    'users': {'skill_level': 'Beginner', 'job_role': 'Software Engineer', 'avatar_url': None},
+    'interview_sessions': {
+        'interview_type': 'text', 'scores': None, 'feedback': None, 'overall_score': None,
+        'status': 'in_progress', 'completed_at': None
+    },
+    'fluency_tests': {
+        'audio_url': None, 'fluency_score': None, 'pronunciation_score': None, 'grammar_score': None,
+        'wpm': None, 'pause_count': None, 'filler_word_count': None, 'audio_duration': None,
+        'grammar_errors': None, 'feedback': None, 'overall_score': None
+    },
+    'resumes': {
+        'resume_type': 'uploaded', 'file_url': None, 'content': None, 'parsed_text': None,
+        'analysis': None, 'ats_score': None, 'grammar_score': None, 'keyword_match_score': None,
+        'overall_score': None, 'suggestions': None, 'target_job_role': None
+    },
+    'chat_history': {'session_id': None, 'context': None},
+    'score_features': {'session_id': None, 'question_id': None, 'user_id': None, 'score': None, 'scored_at': None},
+    'idempotency_keys': {'user_id': None, 'status': 'in_progress', 'response_status': None, 'response_body': None}
+}
+
+UNIQUE_COLUMNS = {'users': ['email']}
+
+TABLES_WITH_UPDATED_AT = ('users', 'resumes')
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def _trunc(value) -> Optional[int]:
+    """TRUNC(NUMERIC)::INTEGER"""
+    if value is None:
+        return None
+    return math.trunc(Decimal(str(value)))
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+def make_jwt(claims: Dict) -> str:
+    """HS256 token shaped like Supabase's (only this fake verifies it)"""
+    header = _b64(json.dumps({'alg': 'HS256', 'typ': 'JWT'}).encode('utf-8'))
+    payload = _b64(json.dumps(claims).encode('utf-8'))
+    signature = hmac.new(JWT_SECRET, f'{header}.{payload}'.encode('ascii'), hashlib.sha256).digest()
+    return f'{header}.{payload}.{_b64(signature)}'
+
+def service_key() -> str:
+    """A service-role key accepted by supabase.create_client"""
+    return make_jwt({'role': 'service_role', 'iss': 'fake-supabase', 'exp': int(time.time()) + 10 * 365 * 86400})
+
+class PostgrestError(Exception):
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.body = {'code': code, 'details': None, 'hint': None, 'message': message}
+
+class FakeDatabase:
+    """Tables of rows (dicts) behind one lock"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tables = {name: {} for name in TABLE_DEFAULTS}
+        # user_id -> {row id: row} per table, like the idx_*_user_id indexes
+        self.by_user = {name: {} for name in TABLE_DEFAULTS}
+        self.auth_users = {}  # email -> {'user': dict, 'password_hash': str}
+        self.tokens = {}  # access token -> user id
+
+    # ---- rows ----
+
+    def _table(self, name: str) -> Dict:
+        if name not in self.tables:
+            raise PostgrestError(404, '42P01', f'relation "public.{name}" does not exist')
+        return self.tables[name]
+
+    @staticmethod
+    def _refresh_generated(table: str, row: Dict):
+        if table == 'interview_sessions':
+            row['question_count'] = len(row.get('questions') or [])
+        elif table == 'resumes':
+            row['suggestion_count'] = len(row.get('suggestions') or [])
+
+    def _new_row(self, table: str, values: Dict) -> Dict:
+        row = {'id': str(uuid.uuid4()), 'created_at': _now()}
+        if table in TABLES_WITH_UPDATED_AT:
+            row['updated_at'] = row['created_at']
+        row.update(TABLE_DEFAULTS[table])
+        row.update(values)
+        row['id'] = str(row['id'])
+        self._refresh_generated(table, row)
+        return row
+
+    def _index(self, table: str, row: Dict):
+        if row.get('user_id') is not None:
+            self.by_user[table].setdefault(str(row['user_id']), {})[row['id']] = row
+
+    def _unindex(self, table: str, row: Dict):
+        if row.get('user_id') is not None:
+            self.by_user[table].get(str(row['user_id']), {}).pop(row['id'], None)
+
+    def _candidates(self, table: str, filters: List[Tuple]):
+        """Rows that may match: an id or user_id equality uses the index instead of a scan"""
+        rows = self._table(table)
+        for column, operator, value in filters:
+            if operator != 'eq':
+                continue
+            if column == 'id':
+                return [rows[value]] if value in rows else []
+            if column == 'user_id':
+                return list(self.by_user[table].get(value, {}).values())
+        return list(rows.values())
+
+    def _check_unique(self, table: str, row: Dict, rows: Dict):
+        for column in UNIQUE_COLUMNS.get(table, []):
+            for other in rows.values():
+                if other['id'] != row['id'] and other.get(column) == row.get(column):
+                    raise PostgrestError(
+                        409, '23505', f'duplicate key value violates unique constraint "{table}_{column}_key"'
+                    )
+
+    def insert(self, table: str, values: List[Dict], upsert: Optional[str] = None) -> List[Dict]:
+        """upsert: None (plain insert), 'ignore' or 'merge' on primary key conflicts"""
+        with self.lock:
+            rows = self._table(table)
+            written = []
+            for value in values:
+                existing = rows.get(str(value.get('id'))) if value.get('id') else None
+                if existing is not None:
+                    if upsert == 'ignore':
+                        continue
+                    if upsert != 'merge':
+                        raise PostgrestError(409, '23505', f'duplicate key value violates unique constraint "{table}_pkey"')
+                    self._unindex(table, existing)
+                    existing.update(value)
+                    self._refresh_generated(table, existing)
+                    self._index(table, existing)
+                    written.append(existing)
+                    continue
+
+                row = self._new_row(table, value)
+                self._check_unique(table, row, rows)
+                rows[row['id']] = row
+                self._index(table, row)
+                written.append(row)
+            return [dict(row) for row in written]
+
+    def select(self, table: str, filters: List[Tuple], order: List[Tuple], limit: Optional[int],
+               offset: int) -> List[Dict]:
+        with self.lock:
+            rows = [dict(row) for row in self._candidates(table, filters) if _matches(row, filters)]
+
+        for column, descending in reversed(order):
+            present = [row for row in rows if row.get(column) is not None]
+            missing = [row for row in rows if row.get(column) is None]
+            present.sort(key=lambda row: row[column], reverse=descending)
+            # Postgres default: NULLS LAST ascending, NULLS FIRST descending
+            rows = missing + present if descending else present + missing
+
+        rows = rows[offset:]
+        return rows[:limit] if limit is not None else rows
+
+    def update(self, table: str, values: Dict, filters: List[Tuple]) -> List[Dict]:
+        with self.lock:
+            updated = []
+            for row in self._candidates(table, filters):
+                if _matches(row, filters):
+                    self._unindex(table, row)
+                    row.update(values)
+                    self._index(table, row)
+                    if table in TABLES_WITH_UPDATED_AT:
+                        row['updated_at'] = _now()
+                    self._refresh_generated(table, row)
+                    updated.append(dict(row))
+            return updated
+
+    def delete(self, table: str, filters: List[Tuple]) -> List[Dict]:
+        with self.lock:
+            rows = self._table(table)
+            deleted = [row for row in self._candidates(table, filters) if _matches(row, filters)]
+            for row in deleted:
+                del rows[row['id']]
+                self._unindex(table, row)
+            return deleted
+
+    def load_histories(self, records) -> int:
+        """
+        Bulk-load user histories from loadtest/corpus.py (no unique checks)
+        Each user gets an auth account with the corpus password
+        """
+        from loadtest.corpus import CORPUS_PASSWORD
+        password_hash = self._password_hash(CORPUS_PASSWORD)
+        users = 0
+
+        with self.lock:
+            for record in records:
+                user = record['user']
+                self.tables['users'][user['id']] = dict(user)
+                self.auth_users[user['email']] = {
+                    'user': self._auth_user(user['email'], user['id'], user['created_at']),
+                    'password_hash': password_hash
+                }
+                for table in ('interview_sessions', 'fluency_tests', 'resumes'):
+                    for values in record.get(table, []):
+                        row = self._new_row(table, values)
+                        self.tables[table][row['id']] = row
+                        self._index(table, row)
+                users += 1
+        return users
+
+    # ---- RPC (database/schema.sql) ----
+
+    def rpc(self, name: str, params: Dict):
+        handler = getattr(self, f'_rpc_{name}', None)
+        if handler is None:
+            raise PostgrestError(404, 'PGRST202', f'Could not find the function public.{name}')
+        with self.lock:
+            return handler(**params)
+
+    def _owned(self, table: str, row_id: str, user_id: str) -> Optional[Dict]:
+        row = self.tables[table].get(str(row_id))
+        return row if row is not None and row.get('user_id') == str(user_id) else None
+
+    def _rpc_append_interview_answer(self, p_session_id, p_user_id, p_question_id, p_answer, p_score):
+        session = self._owned('interview_sessions', p_session_id, p_user_id)
+        if session is None:
+            return []
+        session['answers'] = (session.get('answers') or []) + [p_answer]
+        session['scores'] = {**(session.get('scores') or {}), p_question_id: p_score}
+        return [{
+            'id': session['id'], 'user_id': session['user_id'],
+            'status': session['status'], 'answer_count': len(session['answers'])
+        }]
+
+    def _rpc_complete_interview_session(self, p_session_id, p_user_id):
+        session = self._owned('interview_sessions', p_session_id, p_user_id)
+        if session is None:
+            return []
+        scores = [
+            Decimal(str(score['score'])) for score in (session.get('scores') or {}).values()
+            if isinstance(score, dict) and score.get('score') is not None
+        ]
+        session['status'] = 'completed'
+        session['overall_score'] = int(sum(scores) / len(scores)) if scores else 0
+        session['completed_at'] = _now()
+        return [dict(session)]
+
+    def _apply_fluency(self, test: Dict, data: Dict):
+        test.update({
+            'transcript': data.get('transcript'),
+            'fluency_score': _trunc(data.get('fluency_score')),
+            'pronunciation_score': _trunc(data.get('pronunciation_score')),
+            'grammar_score': _trunc(data.get('grammar_score')),
+            'wpm': _trunc(data.get('wpm')),
+            'pause_count': data.get('pause_count'),
+            'filler_word_count': data.get('filler_word_count'),
+            'audio_duration': data.get('audio_duration'),
+            'feedback': data.get('feedback') if data.get('feedback') is not None else [],
+            'grammar_errors': data.get('grammar_errors') if data.get('grammar_errors') is not None else [],
+            'overall_score': _trunc(data.get('overall_score'))
+        })
+
+    def _rpc_apply_fluency_analysis(self, p_test_id, p_user_id, p_data):
+        test = self._owned('fluency_tests', p_test_id, p_user_id)
+        if test is None:
+            return []
+        self._apply_fluency(test, p_data)
+        return [dict(test)]
+
+    def _rpc_append_interview_answers(self, p_items):
+        pending = {}
+        for item in p_items:
+            session = self.tables['interview_sessions'].get(str(item['session_id']))
+            if session is None or session.get('user_id') != str(item['user_id']):
+                continue
+            answer_id = item['answer'].get('id')
+            if any(answer.get('id') == answer_id for answer in session.get('answers') or []):
+                continue
+            pending.setdefault(session['id'], (session, []))[1].append(item)
+
+        for session, items in pending.values():
+            session['answers'] = (session.get('answers') or []) + [item['answer'] for item in items]
+            scores = dict(session.get('scores') or {})
+            for item in items:
+                scores[item['question_id']] = item['score']
+            session['scores'] = scores
+        return len(pending)
+
+    def _rpc_apply_fluency_analyses(self, p_items):
+        count = 0
+        for item in p_items:
+            test = self._owned('fluency_tests', item['test_id'], item['user_id'])
+            if test is not None:
+                self._apply_fluency(test, item['data'])
+                count += 1
+        return count
+
+    def _rescore_feature(self, feature_id: str, score):
+        feature = self.tables['score_features'].get(feature_id)
+        if feature is not None:
+            feature['score'] = score
+            feature['scored_at'] = _now()
+
+    def _rpc_apply_interview_rescores(self, p_items):
+        grouped = {}
+        for item in p_items:
+            self._rescore_feature(item['feature_id'], item['score']['score'])
+            grouped.setdefault(str(item['session_id']), {})[item['question_id']] = item['score']
+
+        count = 0
+        for session_id, scores in grouped.items():
+            session = self.tables['interview_sessions'].get(session_id)
+            if session is None:
+                continue
+            session['scores'] = {**(session.get('scores') or {}), **scores}
+            if session['status'] == 'completed':
+                values = [
+                    Decimal(str(score['score'])) for score in session['scores'].values()
+                    if isinstance(score, dict) and score.get('score') is not None
+                ]
+                session['overall_score'] = int(sum(values) / len(values)) if values else 0
+            count += 1
+        return count
+
+    def _rpc_apply_fluency_rescores(self, p_items):
+        count = 0
+        for item in p_items:
+            self._rescore_feature(item['feature_id'], item['overall_score'])
+            test = self.tables['fluency_tests'].get(str(item['test_id']))
+            if test is not None:
+                test['fluency_score'] = _trunc(item['fluency_score'])
+                test['grammar_score'] = _trunc(item['grammar_score'])
+                test['overall_score'] = _trunc(item['overall_score'])
+                count += 1
+        return count
+
+    def _rpc_apply_resume_rescores(self, p_items):
+        count = 0
+        for item in p_items:
+            self._rescore_feature(item['feature_id'], item['overall_score'])
+            resume = self.tables['resumes'].get(str(item['resume_id']))
+            if resume is not None:
+                for column, key in (('ats_score', 'ats_score'), ('grammar_score', 'grammar_score'),
+                                    ('keyword_match_score', 'keyword_score'), ('overall_score', 'overall_score')):
+                    resume[column] = math.trunc(Decimal(str(item[key])))
+                resume['analysis'] = {**(resume.get('analysis') or {}), **{
+                    key: item[key] for key in ('grammar_score', 'structure_score', 'ats_score', 'keyword_score')
+                }}
+                count += 1
+        return count
+
+    def _rpc_claim_idempotency_key(self, p_id, p_user_id, p_request_hash, p_ttl_seconds, p_lock_seconds):
+        keys = self.tables['idempotency_keys']
+        now = datetime.now(timezone.utc)
+
+        def age(row):
+            return (now - datetime.fromisoformat(row['created_at'])).total_seconds()
+
+        expired = [row for row in keys.values() if age(row) > p_ttl_seconds][:100]
+        existing = keys.get(p_id)
+        if existing is not None and (age(existing) > p_ttl_seconds or
+                                     (existing['status'] == 'in_progress' and age(existing) > p_lock_seconds)):
+            expired.append(existing)
+        for row in expired:
+            if keys.pop(row['id'], None) is not None:
+                self._unindex('idempotency_keys', row)
+
+        existing = keys.get(p_id)
+        if existing is None:
+            row = self._new_row('idempotency_keys', {'id': p_id, 'user_id': str(p_user_id), 'request_hash': p_request_hash})
+            keys[row['id']] = row
+            self._index('idempotency_keys', row)
+            return [{'claimed': True, 'request_hash': p_request_hash, 'status': 'in_progress',
+                     'response_status': None, 'response_body': None}]
+
+        return [{'claimed': False, **{
+            column: existing[column] for column in ('request_hash', 'status', 'response_status', 'response_body')
+        }}]
+
+    # ---- auth (GoTrue) ----
+
+    def _auth_user(self, email: str, user_id: str, created_at: str) -> Dict:
+        return {
+            'id': user_id, 'aud': 'authenticated', 'role': 'authenticated', 'email': email,
+            'email_confirmed_at': created_at, 'app_metadata': {'provider': 'email'},
+            'user_metadata': {}, 'created_at': created_at, 'updated_at': created_at
+        }
+
+    def _session(self, user: Dict) -> Dict:
+        expires_in = 3600
+        token = make_jwt({
+            'sub': user['id'], 'email': user['email'], 'role': 'authenticated',
+            'aud': 'authenticated', 'exp': int(time.time()) + expires_in, 'jti': uuid.uuid4().hex
+        })
+        with self.lock:
+            self.tokens[token] = user['email']
+        return {
+            'access_token': token, 'token_type': 'bearer', 'expires_in': expires_in,
+            'expires_at': int(time.time()) + expires_in, 'refresh_token': uuid.uuid4().hex, 'user': user
+        }
+
+    @staticmethod
+    def _password_hash(password: str) -> str:
+        return hashlib.sha256(password.encode('utf-8')).hexdigest()
+
+    def sign_up(self, email: str, password: str) -> Dict:
+        with self.lock:
+            if email in self.auth_users:
+                raise AuthError(422, 'user_already_exists', 'User already registered')
+            user = self._auth_user(email, str(uuid.uuid4()), _now())
+            self.auth_users[email] = {'user': user, 'password_hash': self._password_hash(password)}
+        return self._session(user)
+
+    def sign_in(self, email: str, password: str) -> Dict:
+        with self.lock:
+            entry = self.auth_users.get(email)
+        if entry is None or not hmac.compare_digest(entry['password_hash'], self._password_hash(password)):
+            raise AuthError(400, 'invalid_credentials', 'Invalid login credentials')
+        return self._session(entry['user'])
+
+    def get_user(self, token: str) -> Dict:
+        with self.lock:
+            email = self.tokens.get(token)
+            entry = self.auth_users.get(email) if email else None
+        if entry is None:
+            raise AuthError(401, 'bad_jwt', 'invalid JWT: unable to parse or verify signature')
+        return entry['user']
+
+    def sign_out(self, token: str):
+        with self.lock:
+            self.tokens.pop(token, None)
+
+class AuthError(Exception):
+    def __init__(self, status: int, error_code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.body = {'code': status, 'error_code': error_code, 'msg': message}
+
+def _coerce(value: str, current):
+    """Compare filter values with the row's type"""
+    if isinstance(current, bool):
+        return value.lower() == 'true'
+    if isinstance(current, (int, float)):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+def _matches(row: Dict, filters: List[Tuple]) -> bool:
+    for column, operator, value in filters:
+        current = row.get(column)
+        if operator == 'is':
+            if (value == 'null') != (current is None):
+                return False
+            continue
+        if operator == 'in':
+            options = [item.strip().strip('"') for item in value.strip('()').split(',')]
+            if str(current) not in options:
+                return False
+            continue
+        if current is None:
+            return False
+
+        target = _coerce(value, current)
+        current = str(current) if isinstance(target, str) else current
+        if operator == 'eq' and not current == target:
+            return False
+        if operator == 'neq' and not current != target:
+            return False
+        if operator == 'gt' and not current > target:
+            return False
+        if operator == 'gte' and not current >= target:
+            return False
+        if operator == 'lt' and not current < target:
+            return False
+        if operator == 'lte' and not current <= target:
+            return False
+    return True
+
+def _project(rows: List[Dict], select: str) -> List[Dict]:
+    columns = [column.strip() for column in select.split(',') if column.strip()]
+    if not columns or '*' in columns:
+        return rows
+    return [{column: row.get(column) for column in columns} for row in rows]
+
+def _parse_query(query: str) -> Tuple[str, List[Tuple], List[Tuple], Optional[int], int, Optional[str]]:
+    select, filters, order, limit, offset, on_conflict = '*', [], [], None, 0, None
+    for key, value in parse_qsl(query, keep_blank_values=True):
+        if key == 'select':
+            select = value
+        elif key == 'order':
+            for part in value.split(','):
+                pieces = part.split('.')
+                order.append((pieces[0], len(pieces) > 1 and pieces[1] == 'desc'))
+        elif key == 'limit':
+            limit = int(value)
+        elif key == 'offset':
+            offset = int(value)
+        elif key == 'on_conflict':
+            on_conflict = value
+        elif key == 'columns':
+            continue
+        else:
+            operator, _, operand = value.partition('.')
+            filters.append((key, operator, operand))
+    return select, filters, order, limit, offset, on_conflict
+
+def make_handler(database: FakeDatabase, latency: float):
+    class FakeSupabaseHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body=None, headers: Optional[Dict] = None):
+            payload = b'' if body is None else json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _read_body(self):
+            # Always drain the body (the client sends `{}` even with GET) so
+            # the next request on this keep-alive connection starts cleanly
+            length = int(self.headers.get('Content-Length') or 0)
+            raw = self.rfile.read(length) if length else b''
+            self._payload = json.loads(raw) if raw.strip() else None
+
+        def _body(self):
+            return self._payload
+
+        def _bearer(self) -> str:
+            return self.headers.get('Authorization', '').replace('Bearer ', '', 1)
+
+        def _handle(self):
+            self._read_body()
+            if latency:
+                time.sleep(latency)
+
+            url = urlsplit(self.path)
+            try:
+                if url.path.startswith('/rest/v1/'):
+                    self._handle_rest(url.path[len('/rest/v1/'):], url.query)
+                elif url.path.startswith('/auth/v1/'):
+                    self._handle_auth(url.path[len('/auth/v1/'):], url.query)
+                else:
+                    self._send(404, {'message': 'Not found'})
+            except PostgrestError as e:
+                self._send(e.status, e.body)
+            except AuthError as e:
+                self._send(e.status, e.body)
+            except Exception as e:
+                self._send(500, {'code': 'XX000', 'details': None, 'hint': None, 'message': str(e)})
+
+        def _handle_rest(self, path: str, query: str):
+            prefer = self.headers.get('Prefer', '')
+            minimal = 'return=minimal' in prefer
+            select, filters, order, limit, offset, _ = _parse_query(query)
+
+            if path.startswith('rpc/'):
+                result = database.rpc(path[len('rpc/'):], self._body() or {})
+                self._send(200, result)
+                return
+
+            if self.command == 'GET':
+                rows = database.select(path, filters, order, limit, offset)
+                headers = {'Content-Range': f'0-{max(len(rows) - 1, 0)}/{len(rows)}'} if 'count=' in prefer else None
+                self._send(200, _project(rows, select), headers)
+                return
+
+            if self.command == 'POST':
+                body = self._body()
+                values = body if isinstance(body, list) else [body]
+                upsert = None
+                if 'resolution=ignore-duplicates' in prefer:
+                    upsert = 'ignore'
+                elif 'resolution=merge-duplicates' in prefer:
+                    upsert = 'merge'
+                rows = database.insert(path, values, upsert)
+                self._send(201, None if minimal else _project(rows, select))
+                return
+
+            if self.command == 'PATCH':
+                rows = database.update(path, self._body() or {}, filters)
+                self._send(200, None if minimal else _project(rows, select))
+                return
+
+            if self.command == 'DELETE':
+                rows = database.delete(path, filters)
+                self._send(200, None if minimal else _project(rows, select))
+                return
+
+            self._send(405, {'message': 'Method not allowed'})
+
+        def _handle_auth(self, path: str, query: str):
+            params = dict(parse_qsl(query))
+
+            if path == 'signup' and self.command == 'POST':
+                body = self._body() or {}
+                self._send(200, database.sign_up(body.get('email', ''), body.get('password', '')))
+            elif path == 'token' and params.get('grant_type') == 'password':
+                body = self._body() or {}
+                self._send(200, database.sign_in(body.get('email', ''), body.get('password', '')))
+            elif path == 'user' and self.command == 'GET':
+                self._send(200, database.get_user(self._bearer()))
+            elif path == 'logout':
+                database.sign_out(self._bearer())
+                self._send(204)
+            else:
+                self._send(404, {'code': 404, 'error_code': 'not_found', 'msg': 'Not found'})
+
+        do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+    return FakeSupabaseHandler
+
+def start_fake_supabase(port: int = 0, latency_ms: float = 0.0) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve a fresh fake on a background thread; returns (server, base URL)"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(FakeDatabase(), latency_ms / 1000))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='fake-supabase', daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    port = int(args[args.index('--port') + 1]) if '--port' in args else 54321
+    latency_ms = float(args[args.index('--latency-ms') + 1]) if '--latency-ms' in args else 0.0
+
+    database = FakeDatabase()
+    if '--load' in args:
+        from loadtest.corpus import read_histories
+        loaded = database.load_histories(read_histories(args[args.index('--load') + 1]))
+        print(f"Loaded {loaded} user histories")
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(database, latency_ms / 1000))
+    server.daemon_threads = True
+    print(f"Fake Supabase on http://127.0.0.1:{port} (latency {latency_ms} ms)")
+    print(f"SUPABASE_SERVICE_KEY={service_key()}")
+    server.serve_forever()
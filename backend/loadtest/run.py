@@ -0,0 +1,334 @@
+"""
+Load Test
+Drives the main user flow against the API and reports latency per endpoint
+
+Usage (from backend/):
+    python -m loadtest.run [--users 10] [--iterations 3 | --duration 60]
+                           [--answers 3] [--answer-words 120]
+                           [--server gunicorn|flask] [--workers 4] [--threads 1]
+                           [--db-latency-ms 0] [--target URL]
+                           [--supabase-url URL --supabase-key KEY] [--histories FILE]
+                           [--json report.json]
+
+By default the fake Supabase (loadtest/fake_supabase.py) and the app are
+started as subprocesses, so the driver doesn't share a GIL with either.
+--target skips starting the app (point it at a server you started, whose
+SUPABASE_URL you control); --supabase-url uses a real or local Supabase
+instead of the fake.
+
+Each virtual user signs up and logs in once, then repeats: start interview,
+N x submit-answer, feedback, dashboard stats, dashboard history, fluency test
+and fluency analyze. The report has throughput, error rate and p50/p95/p99
+latency per endpoint.
+
+--histories FILE (from `python -m loadtest.corpus histories`) preloads the
+fake with those users and their rows; virtual users then log in as the
+first --users corpus users instead of signing up, so dashboard queries run
+against realistic history sizes. Answers and transcripts come from the
+corpus generators, seeded per user and iteration.
+"""
+
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import requests
+
+from loadtest.corpus import CORPUS_PASSWORD, make_answer_text, make_transcript_text, read_histories
+from loadtest.fake_supabase import service_key
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), '..')
+
+READY_TIMEOUT = 180
+
+PASSWORD = 'LoadTest#2024'
+
+class Recorder:
+    """Latencies and failures per endpoint, shared by all virtual users"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+
+    def record(self, endpoint: str, seconds: float, ok: bool):
+        with self.lock:
+            entry = self.samples.setdefault(endpoint, {'latencies': [], 'errors': 0})
+            entry['latencies'].append(seconds)
+            if not ok:
+                entry['errors'] += 1
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    # Rounded first so float noise (0.07 * 100 = 7.000000000000001) doesn't push up a rank
+    rank = max(1, math.ceil(round(fraction * len(sorted_values), 9)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(recorder: Recorder, wall_seconds: float) -> Dict:
+    endpoints = {}
+    total_requests = total_errors = 0
+
+    for endpoint, entry in sorted(recorder.samples.items()):
+        latencies = sorted(entry['latencies'])
+        count = len(latencies)
+        total_requests += count
+        total_errors += entry['errors']
+        endpoints[endpoint] = {
+            'requests': count,
+            'errors': entry['errors'],
+            'error_rate': round(entry['errors'] / count, 4) if count else 0.0,
+            'throughput_rps': round(count / wall_seconds, 2) if wall_seconds else 0.0,
+            'mean_ms': round(sum(latencies) / count * 1000, 2) if count else 0.0,
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 2)
+        }
+
+    return {
+        'wall_seconds': round(wall_seconds, 2),
+        'requests': total_requests,
+        'errors': total_errors,
+        'error_rate': round(total_errors / total_requests, 4) if total_requests else 0.0,
+        'throughput_rps': round(total_requests / wall_seconds, 2) if wall_seconds else 0.0,
+        'endpoints': endpoints
+    }
+
+def print_report(report: Dict, settings: Dict):
+    print(f"\nUsers: {settings['users']}  Server: {settings['server']}  "
+          f"Workers: {settings['workers']}  Threads: {settings['threads']}  "
+          f"DB latency: {settings['db_latency_ms']} ms")
+    print(f"Wall time: {report['wall_seconds']} s  Requests: {report['requests']}  "
+          f"Throughput: {report['throughput_rps']} req/s  Error rate: {report['error_rate'] * 100:.2f}%\n")
+
+    header = f"{'Endpoint':<42}{'Reqs':>7}{'Err%':>7}{'RPS':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    print(header)
+    print('-' * len(header))
+    for endpoint, stats in report['endpoints'].items():
+        print(f"{endpoint:<42}{stats['requests']:>7}{stats['error_rate'] * 100:>6.1f}%"
+              f"{stats['throughput_rps']:>8.1f}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}")
+
+class VirtualUser:
+    """One simulated user running the flow over a keep-alive session"""
+
+    def __init__(self, index: int, base_url: str, recorder: Recorder, settings: Dict):
+        self.index = index
+        self.base_url = base_url.rstrip('/')
+        self.recorder = recorder
+        self.settings = settings
+        self.http = requests.Session()
+        self.token = None
+        self.job_role = 'Software Engineer'
+
+    def call(self, method: str, path: str, endpoint: str, body: Optional[Dict] = None) -> Optional[Dict]:
+        headers = {'Authorization': f'Bearer {self.token}'} if self.token else {}
+        start = time.perf_counter()
+        try:
+            response = self.http.request(method, self.base_url + path, json=body, headers=headers, timeout=120)
+            ok = response.status_code < 400
+            payload = response.json() if ok else None
+        except (requests.RequestException, ValueError):
+            ok, payload = False, None
+        self.recorder.record(endpoint, time.perf_counter() - start, ok)
+        return payload
+
+    def sign_in(self) -> bool:
+        accounts = self.settings['accounts']
+        if accounts:
+            user = accounts[self.index % len(accounts)]
+            email, password, self.job_role = user['email'], CORPUS_PASSWORD, user['job_role']
+        else:
+            email, password = f"loadtest-{self.index}-{uuid.uuid4().hex[:8]}@example.com", PASSWORD
+            self.call('POST', '/api/auth/signup', 'POST /api/auth/signup', {
+                'email': email, 'password': password, 'name': f'Load Test {self.index}'
+            })
+
+        login = self.call('POST', '/api/auth/login', 'POST /api/auth/login', {'email': email, 'password': password})
+        self.token = (login or {}).get('data', {}).get('access_token')
+        return self.token is not None
+
+    def run_iteration(self, iteration: int):
+        rng = random.Random(f"{self.settings['seed']}:{self.index}:{iteration}")
+        words = self.settings['answer_words']
+        started = self.call('POST', '/api/interview/start', 'POST /api/interview/start', {
+            'job_role': self.job_role, 'skill_level': 'Intermediate',
+            'num_questions': self.settings['answers']
+        })
+
+        if started:
+            session_id = started['data']['session_id']
+            for question in started['data']['questions']:
+                self.call('POST', '/api/interview/submit-answer', 'POST /api/interview/submit-answer', {
+                    'session_id': session_id,
+                    'question_id': question['id'],
+                    'question': question['question'],
+                    'answer': make_answer_text(rng, self.job_role, words)
+                })
+            self.call('GET', f'/api/interview/feedback/{session_id}', 'GET /api/interview/feedback/<id>')
+
+        self.call('GET', '/api/dashboard/stats', 'GET /api/dashboard/stats')
+        self.call('GET', '/api/dashboard/history', 'GET /api/dashboard/history')
+
+        test = self.call('POST', '/api/fluency/test', 'POST /api/fluency/test')
+        if test:
+            self.call('POST', '/api/fluency/analyze', 'POST /api/fluency/analyze', {
+                'test_id': test['data']['test_id'],
+                'transcript': make_transcript_text(rng, self.job_role, words),
+                'audio_duration': round(words / 130 * 60, 1)
+            })
+
+    def run(self, deadline: Optional[float]):
+        if not self.sign_in():
+            return
+
+        iteration = 0
+        while True:
+            if deadline is None and iteration >= self.settings['iterations']:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            self.run_iteration(iteration)
+            iteration += 1
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def _wait_until_ready(url: str, process: Optional[subprocess.Popen] = None):
+    deadline = time.monotonic() + READY_TIMEOUT
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise Exception(f"Process exited with code {process.returncode} before becoming ready: {url}")
+        try:
+            if requests.get(url, timeout=2).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    raise Exception(f"Timed out waiting for {url}")
+
+def start_processes(settings: Dict) -> (str, List[subprocess.Popen]):
+    """Start the fake Supabase and/or the app as configured; returns (app URL, processes)"""
+    processes = []
+    env = dict(os.environ)
+
+    if settings['supabase_url']:
+        env['SUPABASE_URL'] = settings['supabase_url']
+        env['SUPABASE_SERVICE_KEY'] = settings['supabase_key'] or env.get('SUPABASE_SERVICE_KEY', '')
+    else:
+        port = _free_port()
+        command = [sys.executable, '-m', 'loadtest.fake_supabase', '--port', str(port),
+                   '--latency-ms', str(settings['db_latency_ms'])]
+        if settings['histories']:
+            command += ['--load', os.path.abspath(settings['histories'])]
+        processes.append(subprocess.Popen(command, cwd=BACKEND_DIR, stdout=subprocess.DEVNULL))
+        env['SUPABASE_URL'] = f'http://127.0.0.1:{port}'
+        env['SUPABASE_SERVICE_KEY'] = service_key()
+        # Any path answers (404), which is enough to know it is listening
+        deadline = time.monotonic() + (600 if settings['histories'] else 10)
+        while True:
+            try:
+                requests.get(env['SUPABASE_URL'], timeout=1)
+                break
+            except requests.RequestException:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+
+    if settings['target']:
+        return settings['target'], processes
+
+    port = _free_port()
+    env.update({
+        'PORT': str(port),
+        'WEB_CONCURRENCY': str(settings['workers']),
+        'GUNICORN_THREADS': str(settings['threads']),
+        'WARMUP_ON_STARTUP': 'true',
+        'FLASK_ENV': 'production'
+    })
+
+    if settings['server'] == 'gunicorn':
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py']
+    else:
+        command = [sys.executable, '-c',
+                   f"from app import create_app; create_app(warmup=True).run(port={port}, threaded=True)"]
+
+    app_process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    processes.append(app_process)
+
+    base_url = f'http://127.0.0.1:{port}'
+    _wait_until_ready(base_url + '/ready', app_process)
+    return base_url, processes
+
+def run_load_test(base_url: str, settings: Dict) -> Dict:
+    recorder = Recorder()
+    deadline = time.monotonic() + settings['duration'] if settings['duration'] else None
+
+    users = [VirtualUser(i, base_url, recorder, settings) for i in range(settings['users'])]
+    threads = [threading.Thread(target=user.run, args=(deadline,), daemon=True) for user in users]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return summarize(recorder, time.perf_counter() - start)
+
+def parse_args(args: List[str]) -> Dict:
+    def option(name, default, cast=str):
+        return cast(args[args.index(name) + 1]) if name in args else default
+
+    return {
+        'users': option('--users', 10, int),
+        'iterations': option('--iterations', 3, int),
+        'duration': option('--duration', 0, float),
+        'answers': option('--answers', 3, int),
+        'answer_words': option('--answer-words', 120, int),
+        'server': option('--server', 'gunicorn'),
+        'workers': option('--workers', 4, int),
+        'threads': option('--threads', 1, int),
+        'db_latency_ms': option('--db-latency-ms', 0.0, float),
+        'target': option('--target', None),
+        'supabase_url': option('--supabase-url', None),
+        'supabase_key': option('--supabase-key', None),
+        'histories': option('--histories', None),
+        'seed': option('--seed', 7, int),
+        'json': option('--json', None)
+    }
+
+if __name__ == '__main__':
+    settings = parse_args(sys.argv[1:])
+    settings['accounts'] = []
+    if settings['histories']:
+        for record in read_histories(settings['histories']):
+            settings['accounts'].append({'email': record['user']['email'], 'job_role': record['user']['job_role']})
+            if len(settings['accounts']) >= settings['users']:
+                break
+    base_url, processes = start_processes(settings)
+
+    try:
+        report = run_load_test(base_url, settings)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=30)
+
+    print_report(report, settings)
+
+    if settings['json']:
+        with open(settings['json'], 'w') as f:
+            json.dump({'settings': settings, 'report': report}, f, indent=2)
+
+    sys.exit(0 if report['requests'] else 1)
@@ -0,0 +1,218 @@
+"""
+Audio Features
+Duration, pauses and speaking-rate variability from the recorded audio
+
+Audio is decoded with pydub (WAV natively; webm/ogg/mp3/m4a need ffmpeg),
+mixed to mono 16 kHz, and cut into 25 ms frames every 10 ms. Everything
+after decoding is vectorized NumPy:
+- frame energy (dB) from a cumulative sum of squares
+- speech/silence by an adaptive threshold between the noise floor and the
+  speech level, ignoring blips shorter than MIN_SPEECH_SECONDS
+- pauses: silent runs between speech of at least MIN_PAUSE_SECONDS
+- syllable nuclei: energy peaks inside speech with a dip before them, giving
+  the articulation rate and its variance across speech segments
+
+Runs inside the audio worker pool (services/audio_analysis_service.py).
+"""
+
+import io
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_MS = 25
+HOP_MS = 10
+
+# Silent gaps shorter than this are articulation, not pauses
+MIN_PAUSE_SECONDS = 0.25
+# Pauses at least this long are counted in the fluency score (like an ellipsis in a transcript)
+COUNTED_PAUSE_SECONDS = 0.5
+# Voiced runs shorter than this are clicks or breaths
+MIN_SPEECH_SECONDS = 0.1
+# Speech segments shorter than this are too short for a stable rate
+MIN_RATE_SEGMENT_SECONDS = 1.0
+
+# Pause length histogram edges (seconds)
+PAUSE_BUCKETS = ((0.25, 0.5), (0.5, 1.0), (1.0, 2.0), (2.0, None))
+
+# Threshold: at least this many dB above the noise floor, or this share of the floor-to-speech range
+MIN_SNR_DB = 6.0
+THRESHOLD_SHARE = 0.35
+# Syllable peaks must rise this far above the preceding dip and the threshold
+PEAK_PROMINENCE_DB = 2.0
+
+# Frame energy floor, so log10 never sees zero
+_EPSILON = 1e-10
+
+class AudioDecodeError(Exception):
+    """The upload isn't decodable audio (or is too long)"""
+    pass
+
+def decode_audio(data: Union[bytes, str], audio_format: Optional[str] = None,
+                 max_seconds: Optional[float] = None) -> Tuple[np.ndarray, int]:
+    """
+    Decode audio to mono float32 samples in [-1, 1]
+
+    Args:
+        data: Encoded audio, or the path of a stored upload
+        audio_format: pydub/ffmpeg format name ('wav', 'webm', ...); None lets ffmpeg probe
+        max_seconds: Reject longer recordings
+
+    Returns:
+        (samples, sample_rate)
+    """
+    from pydub import AudioSegment
+
+    try:
+        source = io.BytesIO(data) if isinstance(data, bytes) else data
+        segment = AudioSegment.from_file(source, format=audio_format)
+    except Exception as e:
+        raise AudioDecodeError(f"Could not decode audio: {str(e)}")
+
+    if max_seconds and segment.duration_seconds > max_seconds:
+        raise AudioDecodeError(f"Audio is longer than {max_seconds:g} seconds")
+
+    segment = segment.set_channels(1).set_frame_rate(SAMPLE_RATE).set_sample_width(2)
+    samples = np.frombuffer(segment.raw_data, dtype=np.int16).astype(np.float32) / 32768.0
+    return samples, SAMPLE_RATE
+
+def frame_energies(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Mean-square energy in dB of each FRAME_MS frame, every HOP_MS"""
+    frame = sample_rate * FRAME_MS // 1000
+    hop = sample_rate * HOP_MS // 1000
+
+    if len(samples) < frame:
+        samples = np.pad(samples, (0, frame - len(samples)))
+
+    squares = np.concatenate(([0.0], np.cumsum(samples.astype(np.float64) ** 2)))
+    starts = np.arange(0, len(samples) - frame + 1, hop)
+    energy = (squares[starts + frame] - squares[starts]) / frame
+    return 10 * np.log10(energy + _EPSILON)
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(starts, lengths, values) of the runs of equal values in a boolean mask"""
+    if len(mask) == 0:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, np.array([], dtype=bool)
+    changes = np.flatnonzero(np.diff(mask.astype(np.int8))) + 1
+    starts = np.concatenate(([0], changes))
+    ends = np.concatenate((changes, [len(mask)]))
+    return starts, ends - starts, mask[starts]
+
+def _fill_short_runs(mask: np.ndarray, value: bool, min_frames: int) -> np.ndarray:
+    """Flip runs of `value` shorter than min_frames to the opposite value"""
+    starts, lengths, values = _runs(mask)
+    short = (values == value) & (lengths < min_frames)
+    if not short.any():
+        return mask
+    mask = mask.copy()
+    for start, length in zip(starts[short], lengths[short]):
+        mask[start:start + length] = not value
+    return mask
+
+def voice_activity(energies_db: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Speech mask per frame and the dB threshold used"""
+    floor = float(np.percentile(energies_db, 10))
+    level = float(np.percentile(energies_db, 95))
+
+    if level - floor < MIN_SNR_DB:
+        # No contrast: all silence, or continuous speech without gaps
+        silent = level < 10 * np.log10(_EPSILON) + 60
+        return np.full(len(energies_db), not silent), level
+
+    threshold = floor + max(MIN_SNR_DB, THRESHOLD_SHARE * (level - floor))
+    voiced = energies_db > threshold
+
+    frames_per_second = 1000 / HOP_MS
+    voiced = _fill_short_runs(voiced, True, int(MIN_SPEECH_SECONDS * frames_per_second))
+    voiced = _fill_short_runs(voiced, False, int(MIN_PAUSE_SECONDS * frames_per_second))
+    return voiced, threshold
+
+def syllable_peaks(energies_db: np.ndarray, voiced: np.ndarray, threshold: float) -> np.ndarray:
+    """Frame indices of likely syllable nuclei"""
+    if len(energies_db) < 3:
+        return np.array([], dtype=np.int64)
+
+    # 50 ms moving average smooths out pitch-period ripple
+    envelope = np.convolve(energies_db, np.ones(5) / 5, mode='same')
+    middle = envelope[1:-1]
+    is_peak = (
+        (middle > envelope[:-2]) & (middle >= envelope[2:]) &
+        voiced[1:-1] & (middle > threshold + PEAK_PROMINENCE_DB)
+    )
+    peaks = np.flatnonzero(is_peak) + 1
+    if len(peaks) < 2:
+        return peaks
+
+    # Keep a peak only if the envelope dipped enough since the previous one
+    dips = np.minimum.reduceat(envelope, peaks[:-1])
+    keep = np.concatenate(([True], envelope[peaks[1:]] - dips >= PEAK_PROMINENCE_DB))
+    return peaks[keep]
+
+def _pause_summary(pause_seconds: np.ndarray, pause_starts: np.ndarray) -> Dict:
+    histogram = {}
+    for low, high in PAUSE_BUCKETS:
+        label = f'{low:g}-{high:g}s' if high else f'{low:g}s+'
+        in_bucket = (pause_seconds >= low) & (pause_seconds < high) if high else (pause_seconds >= low)
+        histogram[label] = int(in_bucket.sum())
+
+    counted = pause_seconds >= COUNTED_PAUSE_SECONDS
+    has_pauses = len(pause_seconds) > 0
+    return {
+        'count': int(counted.sum()),
+        'locations': [round(float(start), 2) for start in pause_starts[counted]],
+        'all_count': int(len(pause_seconds)),
+        'total_seconds': round(float(pause_seconds.sum()), 2),
+        'mean_seconds': round(float(pause_seconds.mean()), 3) if has_pauses else 0.0,
+        'median_seconds': round(float(np.median(pause_seconds)), 3) if has_pauses else 0.0,
+        'p90_seconds': round(float(np.percentile(pause_seconds, 90)), 3) if has_pauses else 0.0,
+        'max_seconds': round(float(pause_seconds.max()), 3) if has_pauses else 0.0,
+        'histogram': histogram
+    }
+
+def analyze_samples(samples: np.ndarray, sample_rate: int) -> Dict:
+    """Audio features of decoded mono samples"""
+    hop_seconds = HOP_MS / 1000
+    duration = len(samples) / sample_rate if sample_rate else 0.0
+
+    energies = frame_energies(samples, sample_rate)
+    voiced, threshold = voice_activity(energies)
+    starts, lengths, values = _runs(voiced)
+
+    # Pauses are silences between speech, not the lead-in or trailing silence
+    inner = np.ones(len(values), dtype=bool)
+    if len(values):
+        inner[0] = inner[-1] = False
+    silent = ~values & inner
+    pause_seconds = lengths[silent] * hop_seconds
+    pause_starts = starts[silent] * hop_seconds
+
+    peaks = syllable_peaks(energies, voiced, threshold)
+    speech_seconds = float(voiced.sum()) * hop_seconds
+
+    # Articulation rate per speech segment (syllables per second)
+    segment_starts, segment_lengths = starts[values], lengths[values]
+    long_enough = segment_lengths * hop_seconds >= MIN_RATE_SEGMENT_SECONDS
+    segment_starts, segment_lengths = segment_starts[long_enough], segment_lengths[long_enough]
+    counts = np.searchsorted(peaks, segment_starts + segment_lengths) - np.searchsorted(peaks, segment_starts)
+    rates = counts / (segment_lengths * hop_seconds) if len(segment_lengths) else np.array([])
+    mean_rate = float(rates.mean()) if len(rates) else 0.0
+
+    return {
+        'duration_seconds': round(duration, 2),
+        'speech_seconds': round(speech_seconds, 2),
+        'silence_ratio': round(1 - speech_seconds / duration, 3) if duration else 0.0,
+        'pauses': _pause_summary(pause_seconds, pause_starts),
+        'syllable_count': int(len(peaks)),
+        'articulation_rate': round(len(peaks) / speech_seconds, 2) if speech_seconds else 0.0,
+        'speaking_rate_variance': round(float(rates.var()), 3) if len(rates) > 1 else 0.0,
+        'speaking_rate_cv': round(float(rates.std()) / mean_rate, 3) if len(rates) > 1 and mean_rate else 0.0,
+        'segment_count': int(len(rates))
+    }
+
+def extract_audio_features(data: Union[bytes, str], audio_format: Optional[str] = None,
+                           max_seconds: Optional[float] = None) -> Dict:
+    """Decode and analyze a recording (the worker pool entry point)"""
+    samples, sample_rate = decode_audio(data, audio_format, max_seconds)
+    return analyze_samples(samples, sample_rate)
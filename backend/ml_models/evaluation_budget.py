@@ -0,0 +1,150 @@
+"""
+Evaluation Budget
+Per-request time and size limits for the scoring pipelines
+
+Tokenizing, lemmatizing and VADER grow with the input, so an hour-long
+transcript or a pasted 30-page resume could hold a worker for seconds.
+A budget bounds that:
+
+- Size: a text over EVAL_MAX_WORDS (counted with str.split) is analyzed by
+  the expensive stages on a representative sample, evenly spaced excerpts
+  of whole sentences; word and sentence counts are extrapolated from it
+- Time: once EVAL_TIME_BUDGET_MS has passed, later samples shrink to a
+  tenth of the size and optional stages are skipped
+
+Cheap full-text passes (filler words, pauses, rule-based grammar) always
+see the whole text. Every degraded stage is recorded; the result is then
+flagged 'partial'. Without a budget the analyzers run unbounded (as the
+benchmarks and re-scoring parity checks need).
+"""
+
+import re
+import time
+from typing import Dict, Optional
+
+from config import Config
+from ml_models.nlp_processor import count_words, count_sentences
+from utils.metrics import Counter
+
+DEGRADED_STAGES = Counter(
+    'evaluation_degraded_total', 'Scoring stages sampled, estimated or skipped to stay within budget',
+    ('pipeline', 'stage', 'mode')
+)
+
+# Excerpts a sample is built from (start, middle and end of the text)
+SAMPLE_EXCERPTS = 3
+
+# Samples taken after the deadline are this fraction of max_words
+EXPIRED_SAMPLE_FRACTION = 0.1
+
+_SENTENCE_END = re.compile(r'[.!?]+\s+')
+
+class EvaluationBudget:
+    """Deadline and size limit of one evaluation, and what was degraded to meet them"""
+
+    def __init__(self, pipeline: str, time_ms: Optional[float] = None, max_words: Optional[int] = None):
+        """
+        Args:
+            pipeline: 'interview', 'fluency' or 'resume' (metrics label)
+            time_ms: Time budget from now (None: no deadline)
+            max_words: Largest text analyzed in full (None: no limit)
+        """
+        self.pipeline = pipeline
+        self.started = time.perf_counter()
+        self.deadline = None if time_ms is None else self.started + time_ms / 1000
+        self.max_words = max_words
+        self.degraded = {}
+        self._split_counts = {}
+        self._samples = {}
+
+    @classmethod
+    def for_request(cls, pipeline: str) -> 'EvaluationBudget':
+        """Budget with the configured limits, starting now"""
+        return cls(pipeline, Config.EVAL_TIME_BUDGET_MS, Config.EVAL_MAX_WORDS)
+
+    @property
+    def partial(self) -> bool:
+        """Whether any stage was sampled, estimated or skipped"""
+        return bool(self.degraded)
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def report(self) -> Dict:
+        """Fields added to a budgeted result"""
+        return {'partial': self.partial, 'degraded': dict(self.degraded)}
+
+    def _degrade(self, stage: str, mode: str):
+        if stage not in self.degraded:
+            self.degraded[stage] = mode
+            DEGRADED_STAGES.labels(self.pipeline, stage, mode).inc()
+
+    def allow(self, stage: str) -> bool:
+        """Whether an optional stage may still run (records it as skipped if not)"""
+        if not self.expired():
+            return True
+        self._degrade(stage, 'skipped')
+        return False
+
+    def _split_count(self, text: str) -> int:
+        count = self._split_counts.get(text)
+        if count is None:
+            count = self._split_counts[text] = len(text.split())
+        return count
+
+    def _limit(self) -> Optional[int]:
+        if self.max_words is None:
+            return None
+        if self.expired():
+            return max(1, int(self.max_words * EXPIRED_SAMPLE_FRACTION))
+        return self.max_words
+
+    def _excerpts(self, text: str, limit: int) -> str:
+        """Evenly spaced excerpts of about `limit` words in total, cut at sentence ends"""
+        key = (text, limit)
+        sample = self._samples.get(key)
+        if sample is not None:
+            return sample
+
+        length = len(text)
+        window = max(1, int(length * limit / self._split_count(text) / SAMPLE_EXCERPTS))
+        parts = []
+        for index in range(SAMPLE_EXCERPTS):
+            start = (length - window) * index // (SAMPLE_EXCERPTS - 1)
+            end = start + window
+            if start > 0:
+                # Start after the first sentence end (else the first space)
+                boundary = _SENTENCE_END.search(text, start, end)
+                start = boundary.end() if boundary else max(text.find(' ', start, end) + 1, start)
+            if end < length:
+                # Stop after the last sentence end (else the last space)
+                boundaries = list(_SENTENCE_END.finditer(text, start, end))
+                end = boundaries[-1].end() if boundaries else max(text.rfind(' ', start, end), start + 1)
+            parts.append(text[start:end].strip())
+
+        sample = self._samples[key] = ' '.join(part for part in parts if part)
+        return sample
+
+    def sample(self, text: str, stage: str) -> str:
+        """The text, or a representative sample of it if it is over the size limit"""
+        limit = self._limit()
+        if limit is None or self._split_count(text) <= limit:
+            return text
+        self._degrade(stage, 'sampled')
+        return self._excerpts(text, limit)
+
+    def word_count(self, text: str) -> int:
+        """count_words(text), extrapolated from a sample if the text is over the size limit"""
+        if self.max_words is None or self._split_count(text) <= self.max_words:
+            return count_words(text)
+        self._degrade('word_count', 'estimated')
+        sample = self._excerpts(text, self.max_words)
+        return round(count_words(sample) * self._split_count(text) / max(self._split_count(sample), 1))
+
+    def sentence_count(self, text: str) -> int:
+        """count_sentences(text), extrapolated from a sample if the text is over the size limit"""
+        if self.max_words is None or self._split_count(text) <= self.max_words:
+            return count_sentences(text)
+        self._degrade('sentence_count', 'estimated')
+        sample = self._excerpts(text, self.max_words)
+        return round(count_sentences(sample) * len(text) / max(len(sample), 1))
@@ -4,8 +4,14 @@ Calculates fluency scores based on speech characteristics
 """
 
 import re
-from typing import Dict, List
-from ml_models.nlp_processor import tokenize_text, remove_punctuation, detect_grammar_errors_simple
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ml_models.nlp_processor import count_words, detect_grammar_errors_simple
+from ml_models.score_features import round_scores
+from ml_models.evaluation_budget import EvaluationBudget
+from utils.metrics import stage_timer
 
 # Common filler words to detect
 FILLER_WORDS = [
@@ -13,13 +19,26 @@ FILLER_WORDS = [
     'literally', 'right', 'okay', 'well', 'i mean', 'sort of', 'kind of'
 ]
 
-def calculate_wpm(text: str, duration_seconds: float) -> float:
+# Pre-bound stage histograms for analyze_speech_fluency
+_WPM_STAGE = stage_timer('fluency', 'wpm')
+_FILLER_STAGE = stage_timer('fluency', 'filler_words')
+_PAUSE_STAGE = stage_timer('fluency', 'pauses')
+_GRAMMAR_STAGE = stage_timer('fluency', 'grammar')
+_WORD_COUNT_STAGE = stage_timer('fluency', 'word_count')
+_SCORE_STAGE = stage_timer('fluency', 'score')
+_FEEDBACK_STAGE = stage_timer('fluency', 'feedback')
+
+# Articulation rate variation (std / mean across phrases) flagged as uneven pacing
+UNEVEN_RATE_CV = 0.35
+
+def calculate_wpm(text: str, duration_seconds: float, word_count: Optional[int] = None) -> float:
     """
     Calculate Words Per Minute (WPM)
     
     Args:
         text: Transcript text
         duration_seconds: Audio duration in seconds
+        word_count: Word count of text, if already known (skips tokenizing)
         
     Returns:
         float: Words per minute
@@ -27,10 +46,8 @@ def calculate_wpm(text: str, duration_seconds: float) -> float:
     if duration_seconds <= 0:
         return 0.0
     
-    # Tokenize and count words
-    tokens = tokenize_text(text)
-    tokens = remove_punctuation(tokens)
-    word_count = len(tokens)
+    if word_count is None:
+        word_count = count_words(text)
     
     # Calculate WPM
     duration_minutes = duration_seconds / 60
@@ -38,12 +55,13 @@ def calculate_wpm(text: str, duration_seconds: float) -> float:
     
     return round(wpm, 2)
 
-def detect_filler_words(text: str) -> Dict:
+def detect_filler_words(text: str, word_count: Optional[int] = None) -> Dict:
     """
     Detect filler words in text
     
     Args:
         text: Transcript text
+        word_count: Word count of text, if already known (skips tokenizing)
         
     Returns:
         dict: {
@@ -53,12 +71,23 @@ def detect_filler_words(text: str) -> Dict:
         }
     """
     text_lower = text.lower()
+    counts = {filler: text_lower.count(filler) for filler in FILLER_WORDS}
     
+    if word_count is None:
+        word_count = count_words(text)
+    
+    return summarize_filler_counts(counts, word_count)
+
+def summarize_filler_counts(counts: Dict[str, int], word_count: int) -> Dict:
+    """
+    Filler analysis from per-filler occurrence counts
+    Shared by detect_filler_words and the streaming analyzer
+    """
     filler_details = []
     total_count = 0
     
     for filler in FILLER_WORDS:
-        count = text_lower.count(filler)
+        count = counts.get(filler, 0)
         if count > 0:
             filler_details.append({
                 'word': filler,
@@ -67,10 +96,6 @@ def detect_filler_words(text: str) -> Dict:
             total_count += count
     
     # Calculate density (filler words per 100 words)
-    tokens = tokenize_text(text)
-    tokens = remove_punctuation(tokens)
-    word_count = len(tokens)
-    
     density = (total_count / word_count * 100) if word_count > 0 else 0
     
     return {
@@ -161,56 +186,130 @@ def calculate_fluency_score(
     
     return round(score, 2)
 
-def analyze_speech_fluency(text: str, duration_seconds: float = 0) -> Dict:
+def calculate_fluency_scores(
+    wpm: np.ndarray,
+    filler_count: np.ndarray,
+    pause_count: np.ndarray,
+    grammar_errors: np.ndarray,
+    word_count: np.ndarray
+) -> np.ndarray:
+    """
+    calculate_fluency_score over arrays of results (re-scoring, calibration)
+    Element i equals calculate_fluency_score(wpm[i], ...) exactly: the same
+    penalties in the same operation order, clamping and round()
+    
+    Args:
+        wpm, filler_count, pause_count, grammar_errors, word_count: Equal-length arrays
+    
+    Returns:
+        np.ndarray: Fluency scores (0-100)
+    """
+    wpm = np.asarray(wpm, dtype=np.float64)
+    words = np.asarray(word_count, dtype=np.float64)
+    
+    score = np.full(wpm.shape, 100.0)
+    
+    # WPM scoring (the three ranges don't overlap, so each row gets at most one)
+    score -= np.where(wpm < 80, (80 - wpm) * 0.3, 0)
+    score -= np.where(wpm > 180, (wpm - 180) * 0.2, 0)
+    score += np.where((wpm >= 120) & (wpm <= 150), 5, 0)
+    
+    # Densities per 100 words; rows without words get no density penalties
+    has_words = words > 0
+    safe_words = np.where(has_words, words, 1)
+    for counts, penalty in ((filler_count, 2), (pause_count, 3), (grammar_errors, 5)):
+        density = (np.asarray(counts, dtype=np.float64) / safe_words) * 100
+        score -= np.where(has_words, density, 0) * penalty
+    
+    return round_scores(np.clip(score, 0, 100), 2)
+
+def analyze_speech_fluency(text: str, duration_seconds: float = 0, audio_features: Optional[Dict] = None,
+                           budget: Optional[EvaluationBudget] = None) -> Dict:
     """
     Complete fluency analysis of speech transcript
     
     Args:
         text: Transcript text
         duration_seconds: Audio duration in seconds (optional)
+        audio_features: extract_audio_features() of the recording (optional);
+            its duration and silent pauses replace duration_seconds and the
+            pauses marked in the transcript
+        budget: Time and size limits (None analyzes the whole transcript, however long)
         
     Returns:
-        dict: Complete fluency analysis
+        dict: Complete fluency analysis ('audio' holds the audio features, if given;
+        'partial' and 'degraded' when a budget is given)
     """
-    # Calculate WPM
-    wpm = 0
-    if duration_seconds > 0:
-        wpm = calculate_wpm(text, duration_seconds)
-    else:
-        # Estimate duration assuming average speaking rate of 130 WPM
-        tokens = tokenize_text(text)
-        tokens = remove_punctuation(tokens)
-        word_count = len(tokens)
-        duration_seconds = (word_count / 130) * 60
-        wpm = 130  # Default average
+    # Count words (tokenized once, shared by every stage below;
+    # the other stages are single passes over the text)
+    with _WORD_COUNT_STAGE.time():
+        word_count = budget.word_count(text) if budget is not None else count_words(text)
     
     # Detect filler words
-    filler_analysis = detect_filler_words(text)
+    with _FILLER_STAGE.time():
+        filler_analysis = detect_filler_words(text, word_count)
     
-    # Detect pauses
-    pause_analysis = detect_pauses(text)
+    # Detect pauses (measured in the audio when we have it, pause locations in seconds)
+    with _PAUSE_STAGE.time():
+        if audio_features is not None:
+            pause_analysis = audio_features['pauses']
+            duration_seconds = audio_features['duration_seconds']
+        else:
+            pause_analysis = detect_pauses(text)
     
     # Detect grammar errors
-    grammar_errors = detect_grammar_errors_simple(text)
+    with _GRAMMAR_STAGE.time():
+        grammar_errors = detect_grammar_errors_simple(text)
+    
+    analysis = build_fluency_analysis(word_count, duration_seconds, filler_analysis, pause_analysis, grammar_errors)
+    
+    if audio_features is not None:
+        analysis['audio'] = audio_features
+        if audio_features['speaking_rate_cv'] > UNEVEN_RATE_CV:
+            analysis['feedback'].append(
+                "Your speaking rate varies a lot between phrases. Aim for a steadier rhythm."
+            )
     
-    # Count words
-    tokens = tokenize_text(text)
-    tokens = remove_punctuation(tokens)
-    word_count = len(tokens)
+    if budget is not None:
+        analysis.update(budget.report())
+    
+    return analysis
+
+def build_fluency_analysis(
+    word_count: int,
+    duration_seconds: float,
+    filler_analysis: Dict,
+    pause_analysis: Dict,
+    grammar_errors: List
+) -> Dict:
+    """
+    WPM, score and feedback from the measured features
+    Shared by analyze_speech_fluency and the streaming analyzer
+    """
+    # Calculate WPM
+    with _WPM_STAGE.time():
+        if duration_seconds > 0:
+            wpm = round(word_count / (duration_seconds / 60), 2)
+        else:
+            # Estimate duration assuming average speaking rate of 130 WPM
+            duration_seconds = (word_count / 130) * 60
+            wpm = 130  # Default average
     
     # Calculate fluency score
-    fluency_score = calculate_fluency_score(
-        wpm=wpm,
-        filler_count=filler_analysis['total_count'],
-        pause_count=pause_analysis['count'],
-        grammar_errors=len(grammar_errors),
-        word_count=word_count
-    )
+    with _SCORE_STAGE.time():
+        fluency_score = calculate_fluency_score(
+            wpm=wpm,
+            filler_count=filler_analysis['total_count'],
+            pause_count=pause_analysis['count'],
+            grammar_errors=len(grammar_errors),
+            word_count=word_count
+        )
     
     # Generate feedback
-    feedback = generate_fluency_feedback(
-        wpm, filler_analysis, pause_analysis, grammar_errors, fluency_score
-    )
+    with _FEEDBACK_STAGE.time():
+        feedback = generate_fluency_feedback(
+            wpm, filler_analysis, pause_analysis, grammar_errors, fluency_score
+        )
     
     return {
         'fluency_score': fluency_score,
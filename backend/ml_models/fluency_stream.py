@@ -0,0 +1,286 @@
+"""
+Fluency Stream
+Incremental fluency analysis of a live transcript, fed as text deltas
+
+Each feed() costs O(len(delta)) for fillers, pauses, repeated words and the
+running WPM. Word counts are exact for finished sentences: when a delta
+contains sentence punctuation, only the still-open sentences are split
+again, and every sentence but the last two is tokenized once and committed
+(a sentence break depends on the following token, which may still be
+partial). close() tokenizes the open tail and returns exactly what
+analyze_speech_fluency returns for the whole transcript.
+"""
+
+import string
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from nltk.tokenize import sent_tokenize, word_tokenize
+
+from ml_models.fluency_scorer import FILLER_WORDS, summarize_filler_counts, build_fluency_analysis
+from ml_models.nlp_processor import remove_punctuation
+
+# Characters where the sentence tokenizer may place a break
+SENTENCE_END_CHARS = '.?!'
+
+# Lowercased text kept from the previous delta so fillers spanning two deltas are found
+_FILLER_CARRY = max(len(filler) for filler in FILLER_WORDS) - 1
+
+# Repetitions that detect_grammar_errors_simple allows
+_ALLOWED_REPEATS = ('very', 'really')
+
+# Pause runs (see detect_pauses): 2+ dots or 3+ whitespace characters
+_PAUSE_RUN_LENGTH = {'.': 2, ' ': 3}
+
+# Window for the rolling (recent) WPM in snapshots
+ROLLING_WINDOW_SECONDS = 10
+
+class FluencyStream:
+    """
+    Stateful analyzer for one transcript
+
+    Usage:
+        stream = FluencyStream()
+        stream.feed('so um I worked on ')     # -> running snapshot
+        stream.feed('the api... ', elapsed_seconds=2.0)
+        analysis = stream.close(duration_seconds=2.4)
+    """
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.elapsed_seconds = 0.0
+        self.closed = False
+
+        # (elapsed seconds, word count) per feed within the rolling window
+        self._recent = deque()
+
+        self._length = 0  # Characters received
+        self._first_char = ''
+        self._last_char = ''
+        self._double_space = False
+
+        # Fillers: counts per filler, plus the lowercased tail for matches across deltas
+        self._filler_counts = {filler: 0 for filler in FILLER_WORDS}
+        self._filler_carry = ''
+
+        # Pauses: the current run of dots or whitespace
+        self._run_kind = None
+        self._run_start = 0
+        self._run_length = 0
+        self._pause_locations = []
+
+        # Words (lowercased, whitespace split) for repeated-word detection
+        self._partial_word = ''
+        self._last_word = None
+        self._repeated_words = []
+        self._split_word_count = 0
+
+        # Sentence-tokenized word count: committed sentences plus the open tail
+        self._committed_words = 0
+        self._open_text = ''
+        self._open_estimate = 0
+        self._split_fallback = False
+
+    def feed(self, delta: str, elapsed_seconds: Optional[float] = None) -> Dict:
+        """
+        Append a transcript delta
+
+        Args:
+            delta: Newly recognized text (appended verbatim)
+            elapsed_seconds: Audio time so far (defaults to wall time since the stream started)
+
+        Returns:
+            dict: Running snapshot (see snapshot())
+        """
+        if self.closed:
+            raise ValueError("Fluency stream is closed")
+
+        self.elapsed_seconds = elapsed_seconds if elapsed_seconds is not None else time.monotonic() - self.started_at
+
+        if delta:
+            lowered = delta.lower()
+            self._track_text(delta)
+            self._track_fillers(lowered)
+            self._track_pauses(delta)
+            self._track_words(lowered)
+            self._track_sentences(lowered)
+            self._length += len(delta)
+
+        self._recent.append((self.elapsed_seconds, self._running_word_count()))
+        while len(self._recent) > 2 and self._recent[1][0] <= self.elapsed_seconds - ROLLING_WINDOW_SECONDS:
+            self._recent.popleft()
+
+        return self.snapshot()
+
+    def _running_word_count(self) -> int:
+        if self._split_fallback:
+            return self._split_word_count + (1 if self._partial_word else 0)
+        return self._committed_words + self._open_estimate
+
+    def snapshot(self) -> Dict:
+        """
+        Running figures; word_count is exact for committed sentences and
+        estimated for the rest. rolling_wpm covers about the last
+        ROLLING_WINDOW_SECONDS (the whole stream until that much has passed).
+        """
+        word_count = self._running_word_count()
+        minutes = self.elapsed_seconds / 60
+        wpm = round(word_count / minutes, 2) if minutes > 0 else 0.0
+
+        rolling_wpm = wpm
+        if len(self._recent) > 1:
+            since, words_then = self._recent[0]
+            window_minutes = (self.elapsed_seconds - since) / 60
+            if window_minutes > 0:
+                rolling_wpm = round((word_count - words_then) / window_minutes, 2)
+
+        return {
+            'word_count': word_count,
+            'elapsed_seconds': round(self.elapsed_seconds, 2),
+            'wpm': wpm,
+            'rolling_wpm': rolling_wpm,
+            'filler_count': sum(self._filler_counts.values()),
+            'filler_words': {filler: count for filler, count in self._filler_counts.items() if count},
+            'pause_count': len(self._pause_locations),
+            'repeated_word_count': len(self._repeated_words)
+        }
+
+    def close(self, duration_seconds: float = 0) -> Dict:
+        """
+        Finish the transcript
+
+        Args:
+            duration_seconds: Audio duration in seconds (0 estimates it, as the batch analyzer does)
+
+        Returns:
+            dict: Same result as analyze_speech_fluency(full_transcript, duration_seconds)
+        """
+        if self.closed:
+            raise ValueError("Fluency stream is closed")
+        self.closed = True
+
+        if self._partial_word:
+            self._complete_word(self._partial_word)
+            self._partial_word = ''
+
+        open_sentences = self._split_sentences(self._open_text)
+        if self._split_fallback:
+            word_count = self._split_word_count
+        else:
+            word_count = self._committed_words + sum(self._sentence_word_count(s) for s in open_sentences)
+
+        filler_analysis = summarize_filler_counts(self._filler_counts, word_count)
+        pause_analysis = {'count': len(self._pause_locations), 'locations': list(self._pause_locations)}
+
+        return build_fluency_analysis(
+            word_count, duration_seconds, filler_analysis, pause_analysis, self._grammar_errors()
+        )
+
+    # ---- per-delta tracking ----
+
+    def _track_text(self, delta: str):
+        if not self._first_char:
+            self._first_char = delta[0]
+        if '  ' in delta or (self._last_char == ' ' and delta[0] == ' '):
+            self._double_space = True
+        self._last_char = delta[-1]
+
+    def _track_fillers(self, lowered: str):
+        # Fillers never overlap themselves, so occurrences ending in the new
+        # text are the window's count minus those already inside the carry
+        window = self._filler_carry + lowered
+        for filler in FILLER_WORDS:
+            self._filler_counts[filler] += window.count(filler) - self._filler_carry.count(filler)
+        self._filler_carry = window[-_FILLER_CARRY:]
+
+    def _track_pauses(self, delta: str):
+        for offset, char in enumerate(delta, self._length):
+            kind = '.' if char == '.' else (' ' if char.isspace() else None)
+            if kind is not None and kind == self._run_kind:
+                self._run_length += 1
+            else:
+                self._run_kind, self._run_start, self._run_length = kind, offset, 1
+            if kind is not None and self._run_length == _PAUSE_RUN_LENGTH[kind]:
+                self._pause_locations.append(self._run_start)
+
+    def _track_words(self, lowered: str):
+        words = lowered.split()
+        if not words:
+            if self._partial_word:
+                self._complete_word(self._partial_word)
+                self._partial_word = ''
+            return
+
+        if self._partial_word:
+            if lowered[0].isspace():
+                self._complete_word(self._partial_word)
+            else:
+                words[0] = self._partial_word + words[0]
+            self._partial_word = ''
+
+        if not lowered[-1].isspace():
+            self._partial_word = words.pop()
+        for word in words:
+            self._complete_word(word)
+
+    def _complete_word(self, word: str):
+        if word == self._last_word and word not in _ALLOWED_REPEATS:
+            self._repeated_words.append(word)
+        self._last_word = word
+        if word not in string.punctuation:
+            self._split_word_count += 1
+
+    def _track_sentences(self, lowered: str):
+        if self._split_fallback:
+            return
+
+        # Running estimate for the open tail: whitespace-separated chunks
+        added = len(lowered.split())
+        if added and self._open_text and not self._open_text[-1].isspace() and not lowered[0].isspace():
+            added -= 1
+        self._open_estimate += added
+        self._open_text += lowered
+
+        if not any(char in lowered for char in SENTENCE_END_CHARS):
+            return
+
+        sentences = self._split_sentences(self._open_text)
+        if len(sentences) <= 2:
+            return
+
+        # Commit all but the last two sentences
+        cursor = 0
+        for sentence in sentences[:-2]:
+            cursor = self._open_text.index(sentence, cursor) + len(sentence)
+            self._committed_words += self._sentence_word_count(sentence)
+        self._open_text = self._open_text[self._open_text.index(sentences[-2], cursor):]
+        self._open_estimate = len(self._open_text.split())
+
+    def _split_sentences(self, text: str) -> List[str]:
+        if self._split_fallback:
+            return []
+        try:
+            return sent_tokenize(text)
+        except Exception as e:
+            # tokenize_text falls back to whitespace splitting on the same error
+            print(f"Error tokenizing sentences: {str(e)}")
+            self._split_fallback = True
+            return []
+
+    @staticmethod
+    def _sentence_word_count(sentence: str) -> int:
+        # word_tokenize on the whole text is this, per sentence
+        return len(remove_punctuation(word_tokenize(sentence, preserve_line=True)))
+
+    def _grammar_errors(self) -> List[str]:
+        """detect_grammar_errors_simple, from the tracked features"""
+        errors = []
+        if self._double_space:
+            errors.append("Multiple consecutive spaces found")
+        if self._first_char and not self._first_char.isupper():
+            errors.append("Sentence should start with a capital letter")
+        if self._last_char and self._last_char not in '.!?':
+            errors.append("Sentence should end with proper punctuation")
+        errors.extend(f"Repeated word: '{word}'" for word in self._repeated_words)
+        return errors
@@ -0,0 +1,367 @@
+"""
+Lexicon Artifact
+Compiles the VADER lexicon, stopwords, WordNet noun lemma tables and job
+keywords into one binary file that is memory-mapped and queried in place
+
+Build (after the NLTK bundle; also run by `nltk_bundle build`):
+    python -m ml_models.lexicon_artifact build
+
+Each table is a sorted UTF-8 string table plus a uint32 offset array, with
+an optional parallel value array (float64) or value string table. Lookups
+binary-search the mapped bytes, so no per-process dicts or sets are built
+and every worker on a node shares one page-cache copy.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Mapping, Set
+from typing import Dict, Iterable, List, Optional
+
+from config import Config
+from ml_models.nltk_bundle import get_bundle_path, load_bundle, BUNDLE_VERSION
+
+MAGIC = b'MVLX'
+FORMAT_VERSION = 1
+
+KIND_SET = 0
+KIND_FLOAT_MAP = 1
+KIND_STRING_LIST_MAP = 2
+
+# magic, format version, table count, meta offset, meta length
+HEADER = struct.Struct('<4sIIQQ')
+# name, kind, count, key offsets, key blob, values, value blob
+TABLE_ENTRY = struct.Struct('<32sIIQQQQ')
+
+# Separator for string-list values (never appears in keywords)
+LIST_SEPARATOR = '\x1f'
+
+VADER_LEXICON_PATH = 'sentiment/vader_lexicon.zip/vader_lexicon/vader_lexicon.txt'
+KEYWORDS_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'job_keywords.json')
+
+# Noun rules from WordNet's morphy (nltk.corpus.reader.wordnet)
+NOUN_SUBSTITUTIONS = [
+    ('s', ''), ('ses', 's'), ('ves', 'f'), ('xes', 'x'), ('zes', 'z'),
+    ('ches', 'ch'), ('shes', 'sh'), ('men', 'man'), ('ies', 'y')
+]
+
+_artifact = None
+_artifact_checked = False
+
+class _MappedTable:
+    """Sorted string table inside a mapped artifact"""
+
+    def __init__(self, buffer: mmap.mmap, view: memoryview, count: int, key_offsets: int, key_blob: int):
+        self._buffer = buffer
+        self._count = count
+        self._key_blob = key_blob
+        self._offsets = view[key_offsets:key_offsets + 4 * (count + 1)].cast('I')
+
+    def _key_bytes(self, i: int) -> bytes:
+        return self._buffer[self._key_blob + self._offsets[i]:self._key_blob + self._offsets[i + 1]]
+
+    def _index(self, key) -> int:
+        """Position of key in the table, or -1"""
+        if not isinstance(key, str):
+            return -1
+
+        target = key.encode('utf-8')
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_bytes(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        if lo < self._count and self._key_bytes(lo) == target:
+            return lo
+        return -1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._key_bytes(i).decode('utf-8')
+
+class MappedStringSet(_MappedTable, Set):
+    """Read-only set of strings backed by the artifact"""
+
+    def __contains__(self, key) -> bool:
+        return self._index(key) >= 0
+
+class MappedFloatMap(_MappedTable, Mapping):
+    """Read-only str -> float mapping backed by the artifact"""
+
+    def __init__(self, buffer, view, count, key_offsets, key_blob, values):
+        super().__init__(buffer, view, count, key_offsets, key_blob)
+        self._values = view[values:values + 8 * count].cast('d')
+
+    def __contains__(self, key) -> bool:
+        return self._index(key) >= 0
+
+    def __getitem__(self, key) -> float:
+        i = self._index(key)
+        if i < 0:
+            raise KeyError(key)
+        return self._values[i]
+
+class MappedStringListMap(_MappedTable, Mapping):
+    """Read-only str -> list of str mapping backed by the artifact"""
+
+    def __init__(self, buffer, view, count, key_offsets, key_blob, values, value_blob):
+        super().__init__(buffer, view, count, key_offsets, key_blob)
+        self._value_offsets = view[values:values + 4 * (count + 1)].cast('I')
+        self._value_blob = value_blob
+
+    def __contains__(self, key) -> bool:
+        return self._index(key) >= 0
+
+    def __getitem__(self, key) -> List[str]:
+        i = self._index(key)
+        if i < 0:
+            raise KeyError(key)
+        start = self._value_blob + self._value_offsets[i]
+        end = self._value_blob + self._value_offsets[i + 1]
+        value = self._buffer[start:end].decode('utf-8')
+        return value.split(LIST_SEPARATOR) if value else []
+
+class LexiconArtifact:
+    """Memory-mapped lexicon artifact"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._buffer)
+
+        magic, version, table_count, meta_offset, meta_length = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Not a lexicon artifact (format {FORMAT_VERSION}): {path}")
+
+        self.meta = json.loads(self._buffer[meta_offset:meta_offset + meta_length].decode('utf-8'))
+
+        self._tables = {}
+        for i in range(table_count):
+            name, kind, count, key_offsets, key_blob, values, value_blob = TABLE_ENTRY.unpack_from(
+                self._buffer, HEADER.size + i * TABLE_ENTRY.size
+            )
+            name = name.rstrip(b'\0').decode('ascii')
+            if kind == KIND_SET:
+                table = MappedStringSet(self._buffer, self._view, count, key_offsets, key_blob)
+            elif kind == KIND_FLOAT_MAP:
+                table = MappedFloatMap(self._buffer, self._view, count, key_offsets, key_blob, values)
+            else:
+                table = MappedStringListMap(self._buffer, self._view, count, key_offsets, key_blob, values, value_blob)
+            self._tables[name] = table
+
+    def table(self, name: str):
+        return self._tables[name]
+
+    @property
+    def stopwords(self) -> MappedStringSet:
+        return self._tables['stopwords']
+
+    @property
+    def vader_lexicon(self) -> MappedFloatMap:
+        return self._tables['vader_lexicon']
+
+    @property
+    def job_keywords(self) -> MappedStringListMap:
+        return self._tables['job_keywords']
+
+    @property
+    def wordnet_nouns(self) -> MappedStringSet:
+        return self._tables['wordnet_nouns']
+
+    @property
+    def wordnet_noun_exceptions(self) -> MappedStringListMap:
+        return self._tables['wordnet_noun_exceptions']
+
+class MappedLemmatizer:
+    """
+    Drop-in for WordNetLemmatizer.lemmatize on nouns (the default POS),
+    answering from the artifact instead of loading WordNet into memory
+    """
+
+    def __init__(self, artifact: LexiconArtifact):
+        self._nouns = artifact.wordnet_nouns
+        self._exceptions = artifact.wordnet_noun_exceptions
+        self._fallback = None
+
+    def lemmatize(self, word: str, pos: str = 'n') -> str:
+        if pos != 'n':
+            if self._fallback is None:
+                from nltk.stem import WordNetLemmatizer
+                self._fallback = WordNetLemmatizer()
+            return self._fallback.lemmatize(word, pos)
+
+        # Same steps as WordNet's _morphy followed by WordNetLemmatizer's shortest pick
+        if word in self._exceptions:
+            forms = self._exceptions[word]
+        else:
+            forms = [word[:-len(old)] + new for old, new in NOUN_SUBSTITUTIONS if word.endswith(old)]
+
+        lemmas = []
+        for form in [word] + forms:
+            if form not in lemmas and form in self._nouns:
+                lemmas.append(form)
+
+        return min(lemmas, key=len) if lemmas else word
+
+def _file_sha256(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _align(f, boundary: int = 8):
+    """Pad the file position to a boundary (needed for zero-copy casts)"""
+    padding = (-f.tell()) % boundary
+    if padding:
+        f.write(b'\0' * padding)
+
+def _write_string_table(f, keys: List[bytes]):
+    """Write uint32 offsets then the key bytes; returns (offsets_pos, blob_pos)"""
+    _align(f)
+    offsets_pos = f.tell()
+    offset = 0
+    offsets = [0]
+    for key in keys:
+        offset += len(key)
+        offsets.append(offset)
+    f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+    blob_pos = f.tell()
+    f.write(b''.join(keys))
+    return offsets_pos, blob_pos
+
+def write_artifact(path: str, sets: Dict[str, Iterable[str]], float_maps: Dict[str, Dict[str, float]],
+                   list_maps: Dict[str, Dict[str, List[str]]], meta: Dict):
+    """Write tables to path atomically"""
+    tables = (
+        [(name, KIND_SET, {key: None for key in keys}) for name, keys in sets.items()] +
+        [(name, KIND_FLOAT_MAP, values) for name, values in float_maps.items()] +
+        [(name, KIND_STRING_LIST_MAP, values) for name, values in list_maps.items()]
+    )
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(b'\0' * (HEADER.size + TABLE_ENTRY.size * len(tables)))
+
+        entries = []
+        for name, kind, data in tables:
+            # Sort by encoded bytes: that is the order lookups compare in
+            items = sorted((key.encode('utf-8'), value) for key, value in data.items())
+            keys = [key for key, _ in items]
+            key_offsets, key_blob = _write_string_table(f, keys)
+
+            values_pos = value_blob = 0
+            if kind == KIND_FLOAT_MAP:
+                _align(f)
+                values_pos = f.tell()
+                f.write(struct.pack(f'<{len(items)}d', *[float(value) for _, value in items]))
+            elif kind == KIND_STRING_LIST_MAP:
+                encoded = [LIST_SEPARATOR.join(value).encode('utf-8') for _, value in items]
+                values_pos, value_blob = _write_string_table(f, encoded)
+
+            entries.append(TABLE_ENTRY.pack(
+                name.encode('ascii'), kind, len(items), key_offsets, key_blob, values_pos, value_blob
+            ))
+
+        meta_bytes = json.dumps(meta, sort_keys=True).encode('utf-8')
+        meta_offset = f.tell()
+        f.write(meta_bytes)
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(tables), meta_offset, len(meta_bytes)))
+        for entry in entries:
+            f.write(entry)
+
+    os.replace(tmp_path, path)
+
+def get_artifact_path() -> str:
+    """Artifact location (defaults to lexicons.bin inside the NLTK bundle)"""
+    return Config.LEXICON_ARTIFACT_PATH or os.path.join(get_bundle_path(), 'lexicons.bin')
+
+def build_artifact(path: Optional[str] = None) -> str:
+    """Compile the lexicons from the NLTK bundle and data files"""
+    import nltk
+    from nltk.corpus import stopwords, wordnet
+
+    load_bundle()
+    path = path or get_artifact_path()
+
+    vader = {}
+    for line in nltk.data.load(VADER_LEXICON_PATH).split('\n'):
+        (word, measure) = line.strip().split('\t')[0:2]
+        vader[word] = float(measure)
+
+    wordnet.ensure_loaded()
+    nouns = [lemma for lemma, poses in wordnet._lemma_pos_offset_map.items() if 'n' in poses]
+    noun_exceptions = wordnet._exception_map['n']
+
+    with open(KEYWORDS_FILE, 'r') as f:
+        job_keywords = json.load(f)
+
+    write_artifact(
+        path,
+        sets={
+            'stopwords': set(stopwords.words('english')),
+            'wordnet_nouns': nouns
+        },
+        float_maps={'vader_lexicon': vader},
+        list_maps={
+            'wordnet_noun_exceptions': noun_exceptions,
+            'job_keywords': job_keywords
+        },
+        meta={
+            'bundle_version': BUNDLE_VERSION,
+            'nltk_version': nltk.__version__,
+            'job_keywords_sha256': _file_sha256(KEYWORDS_FILE)
+        }
+    )
+
+    print(f"Lexicon artifact written to {path}")
+    return path
+
+def get_lexicon_artifact() -> Optional[LexiconArtifact]:
+    """
+    Get the process-wide mapped artifact
+    Returns None (callers fall back to NLTK/JSON loading) if disabled,
+    missing, or built from a different bundle or keyword file
+    """
+    global _artifact, _artifact_checked
+
+    if _artifact_checked:
+        return _artifact
+    _artifact_checked = True
+
+    if not Config.LEXICON_ARTIFACT_ENABLED:
+        return None
+
+    path = get_artifact_path()
+    if not os.path.exists(path):
+        return None
+
+    try:
+        artifact = LexiconArtifact(path)
+    except Exception as e:
+        print(f"Error loading lexicon artifact: {str(e)}")
+        return None
+
+    if artifact.meta.get('bundle_version') != BUNDLE_VERSION or \
+            artifact.meta.get('job_keywords_sha256') != _file_sha256(KEYWORDS_FILE):
+        print(f"Lexicon artifact at {path} is stale, rebuild with: python -m ml_models.lexicon_artifact build")
+        return None
+
+    _artifact = artifact
+    return _artifact
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] != 'build':
+        print("Usage: python -m ml_models.lexicon_artifact build")
+        sys.exit(2)
+
+    build_artifact()
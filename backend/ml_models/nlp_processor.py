@@ -12,44 +12,39 @@ from sklearn.metrics.pairwise import cosine_similarity
 import string
 import re
 
+from ml_models.nltk_bundle import load_bundle
+from ml_models.lexicon_artifact import get_lexicon_artifact, MappedLemmatizer
+from utils.metrics import cache_counters
+
+# This module is imported lazily (on warmup or first evaluation), so point
+# NLTK at the offline bundle as soon as NLTK itself is loaded
+load_bundle()
+
 # Global variables for lazy initialization
 _stopwords = None
 _lemmatizer = None
+_stopwords_hit, _stopwords_miss = cache_counters('stopwords')
+_lemmatizer_hit, _lemmatizer_miss = cache_counters('lemmatizer')
 
 def initialize_nltk():
     """
-    Initialize NLTK by downloading required data
-    This function should be called once when the application starts
+    Initialize NLTK from the offline resource bundle (see ml_models.nltk_bundle)
+    Never downloads; raises NLTKBundleError if a resource is missing
     """
-    try:
-        # Download required NLTK data
-        required_data = [
-            'punkt',
-            'stopwords',
-            'wordnet',
-            'averaged_perceptron_tagger',
-            'omw-1.4'
-        ]
-        
-        for data in required_data:
-            try:
-                nltk.data.find(f'tokenizers/{data}')
-            except LookupError:
-                nltk.download(data, quiet=True)
-        
-        print("NLTK initialized successfully")
-        return True
-    except Exception as e:
-        print(f"Error initializing NLTK: {str(e)}")
-        return False
+    load_bundle()
+    return True
 
 def get_stopwords():
     """Get stopwords set (lazy initialization)"""
     global _stopwords
-    if _stopwords is None:
-        try:
-            _stopwords = set(stopwords.words('english'))
-        except:
+    if _stopwords is not None:
+        _stopwords_hit.inc()
+    else:
+        _stopwords_miss.inc()
+        artifact = get_lexicon_artifact()
+        if artifact is not None:
+            _stopwords = artifact.stopwords
+        else:
             initialize_nltk()
             _stopwords = set(stopwords.words('english'))
     return _stopwords
@@ -57,8 +52,17 @@ def get_stopwords():
 def get_lemmatizer():
     """Get lemmatizer instance (lazy initialization)"""
     global _lemmatizer
-    if _lemmatizer is None:
-        _lemmatizer = WordNetLemmatizer()
+    if _lemmatizer is not None:
+        _lemmatizer_hit.inc()
+    else:
+        _lemmatizer_miss.inc()
+        artifact = get_lexicon_artifact()
+        if artifact is not None:
+            # Answers from the mapped lemma tables without loading WordNet
+            _lemmatizer = MappedLemmatizer(artifact)
+        else:
+            initialize_nltk()
+            _lemmatizer = WordNetLemmatizer()
     return _lemmatizer
 
 def tokenize_text(text: str) -> list:
@@ -181,7 +185,9 @@ def calculate_text_similarity(text1: str, text2: str) -> float:
         # Calculate cosine similarity
         similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
         
-        return round(similarity, 4)
+        # Python float: round() on an np.float64 breaks ties differently, and the
+        # scores built on this must round like the re-scorer's round_scores
+        return round(float(similarity), 4)
     except Exception as e:
         print(f"Error calculating similarity: {str(e)}")
         return 0.0
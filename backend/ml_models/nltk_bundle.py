@@ -0,0 +1,268 @@
+"""
+NLTK Resource Bundle
+Builds a pinned, checksummed NLTK data bundle and loads NLTK data only from it
+
+Build (needs network, run once per deploy artifact):
+    python -m ml_models.nltk_bundle build
+
+Pin new checksums after changing NLTK_RESOURCES or upgrading NLTK (commit
+data/nltk_bundle.lock.json afterwards):
+    python -m ml_models.nltk_bundle build --update-lock
+
+Verify checksums of an existing bundle:
+    python -m ml_models.nltk_bundle verify
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+from typing import Dict
+
+from config import Config
+
+# Bump when the resource list changes so stale bundles fail at boot
+BUNDLE_VERSION = '1'
+
+# Resource id -> nltk.data path used by the code
+# punkt_tab is what word_tokenize/sent_tokenize read in NLTK >= 3.8.2
+NLTK_RESOURCES = {
+    'punkt_tab': 'tokenizers/punkt_tab',
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet',
+    'omw-1.4': 'corpora/omw-1.4',
+    'vader_lexicon': 'sentiment/vader_lexicon.zip'
+}
+
+MANIFEST_FILE = 'manifest.json'
+
+# Expected checksums, committed alongside the code (written by --update-lock)
+LOCK_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'nltk_bundle.lock.json')
+
+_loaded = False
+
+class NLTKBundleError(Exception):
+    """Raised when the NLTK bundle is missing, stale or corrupt"""
+
+def get_bundle_path() -> str:
+    """Absolute bundle directory (relative NLTK_DATA_PATH is resolved against backend/)"""
+    path = Config.NLTK_DATA_PATH
+    if not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(__file__), '..', path)
+    return os.path.abspath(path)
+
+def _resource_checksum(root: str, resource_path: str) -> str:
+    """SHA-256 over every file of a resource (relative path + contents, sorted)"""
+    digest = hashlib.sha256()
+    full_path = os.path.join(root, resource_path)
+
+    if os.path.isfile(full_path):
+        files = [full_path]
+    else:
+        # Zipped resources are unpacked next to their archive by nltk.download
+        files = []
+        base = full_path[:-4] if full_path.endswith('.zip') else full_path
+        for directory, _, names in os.walk(base):
+            files.extend(os.path.join(directory, name) for name in names)
+        if os.path.isfile(base + '.zip'):
+            files.append(base + '.zip')
+
+    if not files:
+        raise NLTKBundleError(f"Resource not found in bundle: {resource_path}")
+
+    for file_path in sorted(files):
+        digest.update(os.path.relpath(file_path, root).encode('utf-8'))
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+
+    return digest.hexdigest()
+
+def _load_lock() -> Dict:
+    """Load pinned checksums"""
+    if not os.path.exists(LOCK_FILE):
+        raise NLTKBundleError(
+            f"NLTK lock file not found at {os.path.abspath(LOCK_FILE)}. "
+            f"Pin the resources with: python -m ml_models.nltk_bundle build --update-lock"
+        )
+    with open(LOCK_FILE, 'r') as f:
+        return json.load(f)
+
+def build_bundle(update_lock: bool = False) -> Dict:
+    """
+    Download the pinned resources into a staging directory, verify them
+    against the lock file and atomically replace the bundle
+
+    Args:
+        update_lock: Write the computed checksums to the lock file instead
+                     of verifying against it
+
+    Returns:
+        dict: The bundle manifest
+    """
+    import nltk
+
+    # Without a lock there is nothing to verify against: only --update-lock may create one
+    lock = {} if update_lock else _load_lock()
+    if not update_lock:
+        if lock.get('nltk_version') != nltk.__version__:
+            raise NLTKBundleError(
+                f"Lock file pins NLTK {lock.get('nltk_version')}, installed is {nltk.__version__}"
+            )
+        unpinned = set(NLTK_RESOURCES) - set(lock.get('resources', {}))
+        if unpinned:
+            raise NLTKBundleError(
+                f"Lock file has no checksum for: {', '.join(sorted(unpinned))}. "
+                f"Pin them with: python -m ml_models.nltk_bundle build --update-lock"
+            )
+
+    bundle_path = get_bundle_path()
+    staging_path = bundle_path + '.staging'
+    shutil.rmtree(staging_path, ignore_errors=True)
+    os.makedirs(staging_path)
+
+    checksums = {}
+    for resource_id, resource_path in NLTK_RESOURCES.items():
+        if not nltk.download(resource_id, download_dir=staging_path, quiet=True, raise_on_error=True):
+            raise NLTKBundleError(f"Failed to download NLTK resource: {resource_id}")
+
+        checksums[resource_id] = _resource_checksum(staging_path, resource_path)
+
+        expected = lock.get('resources', {}).get(resource_id)
+        if not update_lock and expected != checksums[resource_id]:
+            raise NLTKBundleError(
+                f"Checksum mismatch for {resource_id}: expected {expected}, got {checksums[resource_id]}"
+            )
+
+    manifest = {
+        'bundle_version': BUNDLE_VERSION,
+        'nltk_version': nltk.__version__,
+        'resources': {
+            resource_id: {'path': NLTK_RESOURCES[resource_id], 'sha256': checksum}
+            for resource_id, checksum in checksums.items()
+        }
+    }
+
+    with open(os.path.join(staging_path, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    shutil.rmtree(bundle_path, ignore_errors=True)
+    os.rename(staging_path, bundle_path)
+
+    if update_lock:
+        with open(LOCK_FILE, 'w') as f:
+            json.dump({
+                'bundle_version': BUNDLE_VERSION,
+                'nltk_version': nltk.__version__,
+                'resources': checksums
+            }, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    print(f"NLTK bundle v{BUNDLE_VERSION} written to {bundle_path}")
+
+    # Compile the memory-mapped lexicons from the fresh bundle
+    from ml_models.lexicon_artifact import build_artifact
+    build_artifact()
+
+    return manifest
+
+def _read_manifest(bundle_path: str) -> Dict:
+    """Read and validate the bundle manifest"""
+    manifest_path = os.path.join(bundle_path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise NLTKBundleError(
+            f"NLTK bundle not found at {bundle_path}. "
+            f"Build it with: python -m ml_models.nltk_bundle build"
+        )
+
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+
+    if manifest.get('bundle_version') != BUNDLE_VERSION:
+        raise NLTKBundleError(
+            f"NLTK bundle version {manifest.get('bundle_version')} does not match "
+            f"required version {BUNDLE_VERSION}. Rebuild the bundle."
+        )
+
+    missing = set(NLTK_RESOURCES) - set(manifest.get('resources', {}))
+    if missing:
+        raise NLTKBundleError(f"NLTK bundle is missing resources: {', '.join(sorted(missing))}")
+
+    return manifest
+
+def _resource_present(bundle_path: str, resource_path: str) -> bool:
+    """Filesystem check for a resource (unpacked directory, file or .zip archive)"""
+    full_path = os.path.join(bundle_path, resource_path)
+    if os.path.exists(full_path):
+        return True
+    if full_path.endswith('.zip'):
+        return os.path.exists(full_path[:-4])
+    return os.path.exists(full_path + '.zip')
+
+def check_bundle():
+    """
+    Boot-time check that the bundle is complete, without importing NLTK
+    Raises NLTKBundleError so a bad bundle fails at boot, not mid-request
+    """
+    bundle_path = get_bundle_path()
+    _read_manifest(bundle_path)
+
+    for resource_id, resource_path in NLTK_RESOURCES.items():
+        if not _resource_present(bundle_path, resource_path):
+            raise NLTKBundleError(f"NLTK resource '{resource_id}' missing from bundle at {bundle_path}")
+
+def load_bundle():
+    """
+    Point NLTK at the bundle only and check every resource is present
+    Never downloads. Raises NLTKBundleError so a bad bundle fails at boot.
+    """
+    global _loaded
+
+    if _loaded:
+        return
+
+    import nltk
+
+    bundle_path = get_bundle_path()
+    _read_manifest(bundle_path)
+
+    # Read only from the bundle: no home-directory or system-wide fallbacks
+    nltk.data.path[:] = [bundle_path]
+
+    for resource_id, resource_path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(resource_path)
+        except LookupError:
+            raise NLTKBundleError(f"NLTK resource '{resource_id}' missing from bundle at {bundle_path}")
+
+    _loaded = True
+
+def verify_bundle() -> bool:
+    """Recompute every resource checksum and compare with the lock file"""
+    bundle_path = get_bundle_path()
+    manifest = _read_manifest(bundle_path)
+    lock = _load_lock().get('resources', {})
+
+    ok = True
+    for resource_id, entry in manifest['resources'].items():
+        actual = _resource_checksum(bundle_path, entry['path'])
+        expected = lock.get(resource_id)
+        if actual != expected:
+            print(f"✗ {resource_id}: expected {expected}, got {actual}")
+            ok = False
+        else:
+            print(f"✓ {resource_id}")
+
+    return ok
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'build'
+
+    if command == 'build':
+        build_bundle(update_lock='--update-lock' in sys.argv)
+    elif command == 'verify':
+        sys.exit(0 if verify_bundle() else 1)
+    else:
+        print("Usage: python -m ml_models.nltk_bundle [build [--update-lock] | verify]")
+        sys.exit(2)
@@ -0,0 +1,193 @@
+"""
+Score Features
+Raw per-result feature vectors, and NumPy scoring over many of them at once
+
+Every scored result stores the NLP outputs its score was computed from as
+a fixed-order vector (layouts below). The score_* functions reproduce the
+live scoring of evaluate_interview_answer, the fluency route and the resume
+route from those vectors with the current weights, so stored scores can be
+recomputed for millions of rows without re-running the NLP.
+
+Change a layout only together with FEATURE_VERSION; rows stored under an
+older version are skipped by the re-scoring job.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import Config
+
+FEATURE_VERSION = 1
+
+INTERVIEW_FEATURES = (
+    'similarity',          # Question/answer TF-IDF cosine similarity (0-1)
+    'keyword_matches',     # Answer keywords matching the job role's keywords
+    'answer_keywords',     # Keywords extracted from the answer
+    'grammar_errors',
+    'word_count',
+    'sentence_count',
+    'sentiment_compound',  # VADER compound (-1 to 1)
+    'confidence'           # analyze_confidence_from_text score (0-100)
+)
+
+FLUENCY_FEATURES = (
+    'wpm',
+    'word_count',
+    'filler_count',
+    'pause_count',
+    'grammar_errors',
+    'pronunciation_score'
+)
+
+RESUME_FEATURES = (
+    'grammar_errors',
+    'word_count',
+    'sentence_count',
+    'keywords',            # Keywords extracted from the resume
+    'matched_keywords'     # Of those, matching the job role's keywords
+)
+
+LAYOUTS = {
+    'interview_answer': INTERVIEW_FEATURES,
+    'fluency_test': FLUENCY_FEATURES,
+    'resume': RESUME_FEATURES
+}
+
+def feature_vector(kind: str, features: Dict) -> List[float]:
+    """Named features -> vector in the kind's layout"""
+    return [float(features[name]) for name in LAYOUTS[kind]]
+
+def fluency_features(analysis: Dict, pronunciation_score: float) -> Dict:
+    """Features of an analyze_speech_fluency result"""
+    return {
+        'wpm': analysis['wpm'],
+        'word_count': analysis['word_count'],
+        'filler_count': analysis['filler_words']['total_count'],
+        'pause_count': analysis['pauses']['count'],
+        'grammar_errors': len(analysis['grammar_errors']),
+        'pronunciation_score': pronunciation_score
+    }
+
+def resume_features(analysis: Dict) -> Dict:
+    """Features of a resume analysis dict"""
+    return {
+        'grammar_errors': len(analysis['grammar_errors']),
+        'word_count': analysis['word_count'],
+        'sentence_count': analysis['sentence_count'],
+        'keywords': len(analysis['keywords_found']),
+        'matched_keywords': analysis['matched_keywords']
+    }
+
+def round_scores(values: np.ndarray, digits: int = 2) -> np.ndarray:
+    """
+    Element-wise round() with the live code's results
+    np.round scales by 10**digits first, so at near-ties (84.685) it can land
+    on the other side of what Python's exact-decimal round() gives; those rare
+    values are rounded with round() itself
+    """
+    rounded = np.round(values, digits)
+    scaled = values * 10 ** digits
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(value, digits) for value in values[near_tie].tolist()]
+    return rounded
+
+def _columns(matrix: np.ndarray, layout) -> Dict[str, np.ndarray]:
+    matrix = np.asarray(matrix, dtype=np.float64).reshape(-1, len(layout))
+    return {name: matrix[:, index] for index, name in enumerate(layout)}
+
+def score_interview_answers(matrix: np.ndarray, weights: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+    """
+    Scores of interview answers (rows in INTERVIEW_FEATURES layout)
+    Same formulas as evaluate_answer_relevance/grammar/completeness and calculate_sentiment_score
+
+    Returns:
+        dict: 'relevance', 'grammar', 'completeness', 'sentiment', 'overall' arrays
+    """
+    weights = weights or Config.INTERVIEW_WEIGHTS
+    f = _columns(matrix, INTERVIEW_FEATURES)
+    words, sentences = f['word_count'], f['sentence_count']
+
+    keyword_score = np.minimum(100, f['keyword_matches'] / np.maximum(f['answer_keywords'], 1) * 100)
+    relevance = round_scores(f['similarity'] * 100 * 0.6 + keyword_score * 0.4, 2)
+
+    grammar = np.maximum(0, 100 - f['grammar_errors'] * 5)
+    grammar = grammar - np.where(words < 10, 20, 0) - np.where(sentences == 0, 30, 0)
+    grammar = round_scores(grammar, 2)
+
+    completeness = 50 + np.select([words >= 50, words >= 30, words >= 15], [30, 20, 10], default=-20)
+    completeness = completeness + np.select([sentences >= 3, sentences >= 2], [20, 10], default=0)
+    completeness = round_scores(np.clip(completeness, 0, 100), 2)
+
+    sentiment = round_scores((f['sentiment_compound'] + 1) / 2 * 100 * 0.4 + f['confidence'] * 0.6, 2)
+
+    overall = round_scores(
+        relevance * weights['relevance'] +
+        grammar * weights['grammar'] +
+        completeness * weights['completeness'] +
+        sentiment * weights['sentiment'], 2
+    )
+    return {
+        'relevance': relevance, 'grammar': grammar, 'completeness': completeness,
+        'sentiment': sentiment, 'overall': overall
+    }
+
+def score_fluency_tests(matrix: np.ndarray, weights: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+    """
+    Scores of fluency tests (rows in FLUENCY_FEATURES layout)
+    Same formulas as calculate_fluency_score, the fluency route's grammar
+    score and FluencyTest.calculate_overall_score
+
+    Returns:
+        dict: 'fluency', 'grammar', 'overall' arrays
+    """
+    from ml_models.fluency_scorer import calculate_fluency_scores
+    from models.fluency_test import FluencyTest
+
+    weights = weights or FluencyTest.OVERALL_WEIGHTS
+    f = _columns(matrix, FLUENCY_FEATURES)
+
+    fluency = calculate_fluency_scores(
+        f['wpm'], f['filler_count'], f['pause_count'], f['grammar_errors'], f['word_count']
+    )
+    grammar = 100 - f['grammar_errors'] * 5
+    overall = round_scores(
+        fluency * weights['fluency'] +
+        f['pronunciation_score'] * weights['pronunciation'] +
+        grammar * weights['grammar'], 2
+    )
+    return {'fluency': fluency, 'grammar': grammar, 'overall': overall}
+
+def score_resumes(matrix: np.ndarray, weights: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+    """
+    Scores of resumes (rows in RESUME_FEATURES layout)
+    Same formulas as the resume route and Resume.calculate_score
+
+    Returns:
+        dict: 'grammar', 'structure', 'ats', 'keyword', 'overall' arrays
+    """
+    weights = weights or Config.RESUME_WEIGHTS
+    f = _columns(matrix, RESUME_FEATURES)
+    words, sentences = f['word_count'], f['sentence_count']
+
+    grammar = np.maximum(0, 100 - f['grammar_errors'] * 5)
+    structure = np.select(
+        [(words >= 200) & (sentences >= 10), words >= 150, words >= 100], [90, 75, 60], default=40
+    ).astype(np.float64)
+    ats = 80 - np.where(f['keywords'] < 5, 20, 0).astype(np.float64)
+    keyword = np.minimum(100, f['matched_keywords'] / np.maximum(f['keywords'], 1) * 100)
+
+    overall = round_scores(
+        grammar * weights['grammar'] +
+        structure * weights['structure'] +
+        ats * weights['ats_compatibility'] +
+        keyword * weights['keywords'], 2
+    )
+    return {'grammar': grammar, 'structure': structure, 'ats': ats, 'keyword': keyword, 'overall': overall}
+
+SCORERS = {
+    'interview_answer': score_interview_answers,
+    'fluency_test': score_fluency_tests,
+    'resume': score_resumes
+}
@@ -4,25 +4,34 @@ Analyze sentiment and confidence in text using NLTK VADER
 """
 
 from nltk.sentiment import SentimentIntensityAnalyzer
-import nltk
+from nltk.sentiment.vader import VaderConstants
+
+from ml_models.nltk_bundle import load_bundle
+from ml_models.lexicon_artifact import get_lexicon_artifact
+from utils.metrics import cache_counters
 
 # Global sentiment analyzer instance
 _sia = None
+_sia_hit, _sia_miss = cache_counters('sentiment_analyzer')
 
 def initialize_sentiment_analyzer():
     """
     Initialize VADER sentiment analyzer
-    Downloads required data if not present
+    Reads the lexicon from the offline NLTK bundle (never downloads)
     """
     global _sia
     try:
-        # Download VADER lexicon if not present
-        try:
-            nltk.data.find('sentiment/vader_lexicon.zip')
-        except LookupError:
-            nltk.download('vader_lexicon', quiet=True)
-        
-        _sia = SentimentIntensityAnalyzer()
+        artifact = get_lexicon_artifact()
+        if artifact is not None:
+            # Query the memory-mapped lexicon instead of parsing it into a dict
+            sia = SentimentIntensityAnalyzer.__new__(SentimentIntensityAnalyzer)
+            sia.lexicon_file = None
+            sia.lexicon = artifact.vader_lexicon
+            sia.constants = VaderConstants()
+            _sia = sia
+        else:
+            load_bundle()
+            _sia = SentimentIntensityAnalyzer()
         print("Sentiment analyzer initialized successfully")
         return True
     except Exception as e:
@@ -32,7 +41,10 @@ def initialize_sentiment_analyzer():
 def get_sentiment_analyzer():
     """Get sentiment analyzer instance (lazy initialization)"""
     global _sia
-    if _sia is None:
+    if _sia is not None:
+        _sia_hit.inc()
+    else:
+        _sia_miss.inc()
         initialize_sentiment_analyzer()
     return _sia
 
@@ -204,6 +216,19 @@ def calculate_sentiment_score(text: str) -> float:
     Returns:
         float: Score from 0-100
     """
+    return sentiment_components(text)['score']
+
+def sentiment_components(text: str) -> dict:
+    """
+    Sentiment score with the raw values it is combined from
+    
+    Returns:
+        dict: {
+            'compound': float (VADER, -1 to 1),
+            'confidence': float (0-100),
+            'score': float (0-100, as calculate_sentiment_score)
+        }
+    """
     sentiment = analyze_sentiment(text)
     confidence = analyze_confidence_from_text(text)
     
@@ -220,4 +245,8 @@ def calculate_sentiment_score(text: str) -> float:
     # Weight: 40% sentiment, 60% confidence
     final_score = (sentiment_score * 0.4) + (confidence_score * 0.6)
     
-    return round(final_score, 2)
+    return {
+        'compound': compound,
+        'confidence': confidence_score,
+        'score': round(final_score, 2)
+    }
@@ -4,13 +4,23 @@ Represents fluency test data structure in Supabase PostgreSQL
 """
 
 from database.supabase_config import get_supabase_client, FLUENCY_TESTS_TABLE
+from utils.metrics import timed_db_call
 from datetime import datetime
 from typing import Dict, List, Optional
 
 class FluencyTest:
     """Fluency test model for Supabase"""
     
+    # Column projections (avoid pulling transcript/feedback blobs)
+    OWNER_COLUMNS = 'id, user_id'
+    SUMMARY_COLUMNS = 'id, fluency_score, overall_score, wpm, filler_word_count, pause_count, created_at'
+    SCORE_COLUMNS = 'fluency_score, created_at'
+    
+    # Overall score weights (the database stores the overall score computed here)
+    OVERALL_WEIGHTS = {'fluency': 0.35, 'pronunciation': 0.30, 'grammar': 0.35}
+    
     @staticmethod
+    @timed_db_call
     def create(user_id: str, transcript: str, audio_url: Optional[str] = None, 
                fluency_score: float = 0.0, pronunciation_score: float = 0.0,
                grammar_score: float = 0.0, wpm: float = 0.0, 
@@ -23,7 +33,7 @@ class FluencyTest:
             raise Exception("Database not available")
         
         # Calculate overall score
-        overall_score = round((fluency_score * 0.35 + pronunciation_score * 0.30 + grammar_score * 0.35), 2)
+        overall_score = FluencyTest.calculate_overall_score(fluency_score, pronunciation_score, grammar_score)
         
         data = {
             'user_id': user_id,
@@ -44,18 +54,35 @@ class FluencyTest:
         return result.data[0] if result.data else None
     
     @staticmethod
-    def get_by_id(test_id: str):
-        """Get fluency test by ID"""
+    def calculate_overall_score(fluency_score: float, pronunciation_score: float, grammar_score: float) -> float:
+        """Weighted overall score (OVERALL_WEIGHTS)"""
+        weights = FluencyTest.OVERALL_WEIGHTS
+        return round((
+            fluency_score * weights['fluency'] +
+            pronunciation_score * weights['pronunciation'] +
+            grammar_score * weights['grammar']
+        ), 2)
+    
+    @staticmethod
+    @timed_db_call
+    def get_by_id(test_id: str, columns: str = '*'):
+        """Get fluency test by ID (optionally projected to a subset of columns)"""
         supabase = get_supabase_client()
         
         if supabase is None:
             raise Exception("Database not available")
         
-        result = supabase.table(FLUENCY_TESTS_TABLE).select('*').eq('id', test_id).execute()
+        result = supabase.table(FLUENCY_TESTS_TABLE).select(columns).eq('id', test_id).execute()
         return result.data[0] if result.data else None
     
     @staticmethod
-    def get_user_tests(user_id: str, limit: int = 10):
+    def get_owner(test_id: str):
+        """Get only the id and owner of a fluency test"""
+        return FluencyTest.get_by_id(test_id, columns=FluencyTest.OWNER_COLUMNS)
+    
+    @staticmethod
+    @timed_db_call
+    def get_user_tests(user_id: str, limit: int = 10, columns: str = '*'):
         """Get user's fluency tests"""
         supabase = get_supabase_client()
         
@@ -63,7 +90,7 @@ class FluencyTest:
             raise Exception("Database not available")
         
         result = supabase.table(FLUENCY_TESTS_TABLE)\
-            .select('*')\
+            .select(columns)\
             .eq('user_id', user_id)\
             .order('created_at', desc=True)\
             .limit(limit)\
@@ -71,6 +98,32 @@ class FluencyTest:
         return result.data
     
     @staticmethod
+    def get_user_test_summaries(user_id: str, limit: int = 10):
+        """Get lightweight rows for history listings (no transcript/feedback)"""
+        return FluencyTest.get_user_tests(user_id, limit, columns=FluencyTest.SUMMARY_COLUMNS)
+    
+    @staticmethod
+    @timed_db_call
+    def get_user_scores(user_id: str, start_date: Optional[str] = None, end_date: Optional[str] = None):
+        """Get (fluency_score, created_at) pairs for a user, oldest first"""
+        supabase = get_supabase_client()
+        
+        if supabase is None:
+            raise Exception("Database not available")
+        
+        query = supabase.table(FLUENCY_TESTS_TABLE)\
+            .select(FluencyTest.SCORE_COLUMNS)\
+            .eq('user_id', user_id)
+        if start_date:
+            query = query.gte('created_at', start_date)
+        if end_date:
+            query = query.lte('created_at', end_date)
+        
+        result = query.order('created_at').execute()
+        return result.data
+    
+    @staticmethod
+    @timed_db_call
     def update(test_id: str, data: Dict):
         """Update fluency test"""
         supabase = get_supabase_client()
@@ -82,6 +135,60 @@ class FluencyTest:
         return result.data[0] if result.data else None
     
     @staticmethod
+    @timed_db_call
+    def apply_analysis(test_id: str, user_id: str, data: Dict):
+        """
+        Atomically store analysis results and recompute overall_score (one round trip)
+        Returns None if the test does not exist or is not owned by user_id
+        """
+        supabase = get_supabase_client()
+        
+        if supabase is None:
+            raise Exception("Database not available")
+        
+        result = supabase.rpc('apply_fluency_analysis', {
+            'p_test_id': test_id,
+            'p_user_id': user_id,
+            'p_data': data
+        }).execute()
+        return result.data[0] if result.data else None
+    
+    @staticmethod
+    @timed_db_call
+    def bulk_apply_analyses(items: List[Dict]):
+        """
+        Store many analyses in one round trip
+        items: [{'test_id', 'user_id', 'data'}, ...]; the last item per test wins
+        """
+        supabase = get_supabase_client()
+        
+        if supabase is None:
+            raise Exception("Database not available")
+        
+        latest = {}
+        for item in items:
+            latest[item['test_id']] = item
+        
+        result = supabase.rpc('apply_fluency_analyses', {'p_items': list(latest.values())}).execute()
+        return result.data
+    
+    @staticmethod
+    @timed_db_call
+    def bulk_apply_rescores(items: List[Dict]):
+        """
+        Replace re-computed scores in one round trip
+        items: [{'feature_id', 'test_id', 'fluency_score', 'grammar_score', 'overall_score'}, ...]
+        """
+        supabase = get_supabase_client()
+        
+        if supabase is None:
+            raise Exception("Database not available")
+        
+        result = supabase.rpc('apply_fluency_rescores', {'p_items': items}).execute()
+        return result.data
+    
+    @staticmethod
+    @timed_db_call
     def delete(test_id: str):
         """Delete fluency test"""
         supabase = get_supabase_client()
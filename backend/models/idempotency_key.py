@@ -0,0 +1,62 @@
+"""
+Idempotency Key Model
+Stored responses of requests sent with an Idempotency-Key header (Supabase PostgreSQL)
+"""
+
+from database.supabase_config import get_supabase_client, IDEMPOTENCY_KEYS_TABLE
+from utils.metrics import timed_db_call
+from typing import Dict
+
+class IdempotencyKey:
+    """Idempotency key model for Supabase"""
+
+    @staticmethod
+    @timed_db_call
+    def claim(key_id: str, user_id: str, request_hash: str, ttl_seconds: int, lock_seconds: int) -> Dict:
+        """
+        Claim a key for a request (one round trip)
+
+        Returns:
+            dict: claimed (True if this request now holds the key), plus the
+            holder's request_hash, status and, once completed, response_status
+            and response_body
+        """
+        supabase = get_supabase_client()
+
+        if supabase is None:
+            raise Exception("Database not available")
+
+        result = supabase.rpc('claim_idempotency_key', {
+            'p_id': key_id,
+            'p_user_id': user_id,
+            'p_request_hash': request_hash,
+            'p_ttl_seconds': ttl_seconds,
+            'p_lock_seconds': lock_seconds
+        }).execute()
+        return result.data[0]
+
+    @staticmethod
+    @timed_db_call
+    def complete(key_id: str, response_status: int, response_body: Dict):
+        """Store the response of a claimed key"""
+        supabase = get_supabase_client()
+
+        if supabase is None:
+            raise Exception("Database not available")
+
+        supabase.table(IDEMPOTENCY_KEYS_TABLE).update({
+            'status': 'completed',
+            'response_status': response_status,
+            'response_body': response_body
+        }).eq('id', key_id).execute()
+
+    @staticmethod
+    @timed_db_call
+    def release(key_id: str):
+        """Give up a claimed key without a response (a retry runs the request again)"""
+        supabase = get_supabase_client()
+
+        if supabase is None:
+            raise Exception("Database not available")
+
+        supabase.table(IDEMPOTENCY_KEYS_TABLE).delete().eq('id', key_id).eq('status', 'in_progress').execute()
@@ -4,13 +4,20 @@ Represents interview session data structure in Supabase PostgreSQL
 """
 
 from database.supabase_config import get_supabase_client, INTERVIEW_SESSIONS_TABLE
+from utils.metrics import timed_db_call
 from datetime import datetime
 from typing import Dict, List, Optional
 
 class InterviewSession:
     """Interview session model for Supabase"""
     
+    # Column projections (avoid pulling the questions/answers JSONB blobs)
+    OWNER_COLUMNS = 'id, user_id, job_role, skill_level'
+    SUMMARY_COLUMNS = 'id, job_role, skill_level, interview_type, status, overall_score, question_count, created_at, completed_at'
+    SCORE_COLUMNS = 'overall_score, created_at'
+    
     @staticmethod
+    @timed_db_call
     def create(user_id: str, job_role: str, skill_level: str, questions: List[Dict], interview_type: str = 'text'):
         """Create new interview session"""
         supabase = get_supabase_client()
@@ -32,17 +39,24 @@ class InterviewSession:
         return result.data[0] if result.data else None
     
     @staticmethod
-    def get_by_id(session_id: str):
-        """Get session by ID"""
+    @timed_db_call
+    def get_by_id(session_id: str, columns: str = '*'):
+        """Get session by ID (optionally projected to a subset of columns)"""
         supabase = get_supabase_client()
         
         if supabase is None:
             raise Exception("Database not available")
         
-        result = supabase.table(INTERVIEW_SESSIONS_TABLE).select('*').eq('id', session_id).execute()
+        result = supabase.table(INTERVIEW_SESSIONS_TABLE).select(columns).eq('id', session_id).execute()
         return result.data[0] if result.data else None
     
     @staticmethod
+    def get_owner_and_role(session_id: str):
+        """Get only the owner, job role and skill level of a session"""
+        return InterviewSession.get_by_id(session_id, columns=InterviewSession.OWNER_COLUMNS)
+    
+    @staticmethod
+    @timed_db_call
     def update(session_id: str, data: Dict):
         """Update interview session"""
         supabase = get_supabase_client()
@@ -54,7 +68,79 @@ class InterviewSession:
         return result.data[0] if result.data else None
     
     @staticmethod
-    def get_user_sessions(user_id: str, limit: int = 10):
+    @timed_db_call
+    def append_answer(session_id: str, user_id: str, question_id: str, answer: Dict, score: Dict):
+        """
+        Atomically append an answer record and its score summary (one round trip)
+        Returns None if the session does not exist or is not owned by user_id
+        """
+        supabase = get_supabase_client()
+        
+        if supabase is None:
+            raise Exception("Database not available")
+        
+        result = supabase.rpc('append_interview_answer', {
+            'p_session_id': session_id,
+            'p_user_id': user_id,
+            'p_question_id': question_id,
+            'p_answer': answer,
+            'p_score': score
+        }).execute()
+        return result.data[0] if result.data else None
+    
+    @staticmethod
+    @timed_db_call
+    def bulk_append_answers(items: List[Dict]):
+        """
+        Append many answers in one round trip
+        items: [{'session_id', 'user_id', 'question_id', 'answer', 'score'}, ...]
+        Answers whose 'id' is already stored are skipped, so replays are safe
+        """
+        supabase = get_supabase_client()
+        
+        if supabase is None:
+            raise Exception("Database not available")
+        
+        result = supabase.rpc('append_interview_answers', {'p_items': items}).execute()
+        return result.data
+    
+    @staticmethod
+    @timed_db_call
+    def bulk_apply_rescores(items: List[Dict]):
+        """
+        Replace re-computed answer scores in one round trip
+        items: [{'feature_id', 'session_id', 'question_id', 'score'}, ...]
+        overall_score of completed sessions is recomputed from the new scores
+        """
+        supabase = get_supabase_client()
+        
+        if supabase is None:
+            raise Exception("Database not available")
+        
+        result = supabase.rpc('apply_interview_rescores', {'p_items': items}).execute()
+        return result.data
+    
+    @staticmethod
+    @timed_db_call
+    def complete(session_id: str, user_id: str):
+        """
+        Atomically mark a session completed and return the updated row
+        Returns None if the session does not exist or is not owned by user_id
+        """
+        supabase = get_supabase_client()
+        
+        if supabase is None:
+            raise Exception("Database not available")
+        
+        result = supabase.rpc('complete_interview_session', {
+            'p_session_id': session_id,
+            'p_user_id': user_id
+        }).execute()
+        return result.data[0] if result.data else None
+    
+    @staticmethod
+    @timed_db_call
+    def get_user_sessions(user_id: str, limit: int = 10, columns: str = '*'):
         """Get user's interview sessions"""
         supabase = get_supabase_client()
         
@@ -62,7 +148,7 @@ class InterviewSession:
             raise Exception("Database not available")
         
         result = supabase.table(INTERVIEW_SESSIONS_TABLE)\
-            .select('*')\
+            .select(columns)\
             .eq('user_id', user_id)\
             .order('created_at', desc=True)\
             .limit(limit)\
@@ -70,6 +156,32 @@ class InterviewSession:
         return result.data
     
     @staticmethod
+    def get_user_session_summaries(user_id: str, limit: int = 10):
+        """Get lightweight rows for history listings (no questions/answers)"""
+        return InterviewSession.get_user_sessions(user_id, limit, columns=InterviewSession.SUMMARY_COLUMNS)
+    
+    @staticmethod
+    @timed_db_call
+    def get_user_scores(user_id: str, start_date: Optional[str] = None, end_date: Optional[str] = None):
+        """Get (overall_score, created_at) pairs for a user, oldest first"""
+        supabase = get_supabase_client()
+        
+        if supabase is None:
+            raise Exception("Database not available")
+        
+        query = supabase.table(INTERVIEW_SESSIONS_TABLE)\
+            .select(InterviewSession.SCORE_COLUMNS)\
+            .eq('user_id', user_id)
+        if start_date:
+            query = query.gte('created_at', start_date)
+        if end_date:
+            query = query.lte('created_at', end_date)
+        
+        result = query.order('created_at').execute()
+        return result.data
+    
+    @staticmethod
+    @timed_db_call
     def delete(session_id: str):
         """Delete session"""
         supabase = get_supabase_client()
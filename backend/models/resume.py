@@ -4,23 +4,26 @@ Represents resume data structure in Supabase PostgreSQL
 """
 
 from database.supabase_config import get_supabase_client, RESUMES_TABLE
+from utils.metrics import timed_db_call
+from config import Config
 from datetime import datetime
 from typing import Dict, List, Optional
 
 class Resume:
     """Resume model for Supabase"""
     
+    # Column projections (avoid pulling content/parsed_text/analysis blobs)
+    OWNER_COLUMNS = 'id, user_id'
+    SUMMARY_COLUMNS = 'id, resume_type, target_job_role, overall_score, suggestion_count, created_at'
+    FEEDBACK_COLUMNS = 'id, user_id, overall_score, analysis, suggestions, created_at'
+    SCORE_COLUMNS = 'overall_score, created_at'
+    
     @staticmethod
-    def create(user_id: str, content: Optional[Dict] = None, analysis: Optional[Dict] = None,
-               score: float = 0.0, suggestions: Optional[List] = None, file_url: Optional[str] = None,
-               resume_type: str = 'uploaded', parsed_text: Optional[str] = None,
-               target_job_role: Optional[str] = None):
-        """Create new resume"""
-        supabase = get_supabase_client()
-        
-        if supabase is None:
-            raise Exception("Database not available")
-        
+    def build_record(user_id: str, content: Optional[Dict] = None, analysis: Optional[Dict] = None,
+                     score: float = 0.0, suggestions: Optional[List] = None, file_url: Optional[str] = None,
+                     resume_type: str = 'uploaded', parsed_text: Optional[str] = None,
+                     target_job_role: Optional[str] = None, resume_id: Optional[str] = None) -> Dict:
+        """Build the row inserted for a resume"""
         data = {
             'user_id': user_id,
             'resume_type': resume_type,
@@ -33,28 +36,101 @@ class Resume:
             'target_job_role': target_job_role
         }
         
+        if resume_id:
+            data['id'] = resume_id
+        
         # Extract individual scores from analysis if available
         if analysis:
             data['ats_score'] = int(analysis.get('ats_score', 0))
             data['grammar_score'] = int(analysis.get('grammar_score', 0))
             data['keyword_match_score'] = int(analysis.get('keyword_score', 0))
         
+        return data
+    
+    @staticmethod
+    @timed_db_call
+    def create(user_id: str, content: Optional[Dict] = None, analysis: Optional[Dict] = None,
+               score: float = 0.0, suggestions: Optional[List] = None, file_url: Optional[str] = None,
+               resume_type: str = 'uploaded', parsed_text: Optional[str] = None,
+               target_job_role: Optional[str] = None):
+        """Create new resume"""
+        supabase = get_supabase_client()
+        
+        if supabase is None:
+            raise Exception("Database not available")
+        
+        data = Resume.build_record(
+            user_id, content=content, analysis=analysis, score=score, suggestions=suggestions,
+            file_url=file_url, resume_type=resume_type, parsed_text=parsed_text,
+            target_job_role=target_job_role
+        )
+        
         result = supabase.table(RESUMES_TABLE).insert(data).execute()
         return result.data[0] if result.data else None
     
     @staticmethod
-    def get_by_id(resume_id: str):
-        """Get resume by ID"""
+    @timed_db_call
+    def bulk_insert(rows: List[Dict]):
+        """
+        Insert many resumes in one round trip
+        Rows carry client-generated ids, so replays of the same row are ignored
+        """
+        supabase = get_supabase_client()
+        
+        if supabase is None:
+            raise Exception("Database not available")
+        
+        result = supabase.table(RESUMES_TABLE).upsert(rows, ignore_duplicates=True).execute()
+        return result.data
+    
+    @staticmethod
+    @timed_db_call
+    def bulk_apply_rescores(items: List[Dict]):
+        """
+        Replace re-computed scores in one round trip
+        items: [{'feature_id', 'resume_id', 'grammar_score', 'structure_score', 'ats_score',
+                 'keyword_score', 'overall_score'}, ...]
+        """
         supabase = get_supabase_client()
         
         if supabase is None:
             raise Exception("Database not available")
         
-        result = supabase.table(RESUMES_TABLE).select('*').eq('id', resume_id).execute()
+        result = supabase.rpc('apply_resume_rescores', {'p_items': items}).execute()
+        return result.data
+    
+    @staticmethod
+    def calculate_score(analysis: Dict) -> float:
+        """Weighted overall score from an analysis dict (Config.RESUME_WEIGHTS)"""
+        weights = Config.RESUME_WEIGHTS
+        score = (
+            analysis.get('grammar_score', 0) * weights['grammar'] +
+            analysis.get('structure_score', 0) * weights['structure'] +
+            analysis.get('ats_score', 0) * weights['ats_compatibility'] +
+            analysis.get('keyword_score', 0) * weights['keywords']
+        )
+        return round(score, 2)
+    
+    @staticmethod
+    @timed_db_call
+    def get_by_id(resume_id: str, columns: str = '*'):
+        """Get resume by ID (optionally projected to a subset of columns)"""
+        supabase = get_supabase_client()
+        
+        if supabase is None:
+            raise Exception("Database not available")
+        
+        result = supabase.table(RESUMES_TABLE).select(columns).eq('id', resume_id).execute()
         return result.data[0] if result.data else None
     
     @staticmethod
-    def get_user_resumes(user_id: str, limit: int = 10):
+    def get_owner(resume_id: str):
+        """Get only the id and owner of a resume"""
+        return Resume.get_by_id(resume_id, columns=Resume.OWNER_COLUMNS)
+    
+    @staticmethod
+    @timed_db_call
+    def get_user_resumes(user_id: str, limit: int = 10, columns: str = '*'):
         """Get user's resumes"""
         supabase = get_supabase_client()
         
@@ -62,7 +138,7 @@ class Resume:
             raise Exception("Database not available")
         
         result = supabase.table(RESUMES_TABLE)\
-            .select('*')\
+            .select(columns)\
             .eq('user_id', user_id)\
             .order('created_at', desc=True)\
             .limit(limit)\
@@ -70,6 +146,28 @@ class Resume:
         return result.data
     
     @staticmethod
+    def get_user_resume_summaries(user_id: str, limit: int = 10):
+        """Get lightweight rows for history listings (no content/analysis)"""
+        return Resume.get_user_resumes(user_id, limit, columns=Resume.SUMMARY_COLUMNS)
+    
+    @staticmethod
+    @timed_db_call
+    def get_user_scores(user_id: str):
+        """Get (overall_score, created_at) pairs for a user, oldest first"""
+        supabase = get_supabase_client()
+        
+        if supabase is None:
+            raise Exception("Database not available")
+        
+        result = supabase.table(RESUMES_TABLE)\
+            .select(Resume.SCORE_COLUMNS)\
+            .eq('user_id', user_id)\
+            .order('created_at')\
+            .execute()
+        return result.data
+    
+    @staticmethod
+    @timed_db_call
     def update(resume_id: str, data: Dict):
         """Update resume"""
         supabase = get_supabase_client()
@@ -81,6 +179,7 @@ class Resume:
         return result.data[0] if result.data else None
     
     @staticmethod
+    @timed_db_call
     def delete(resume_id: str):
         """Delete resume"""
         supabase = get_supabase_client()
@@ -0,0 +1,66 @@
+"""
+Score Feature Model
+Per-result feature vectors in Supabase PostgreSQL (see ml_models/score_features.py)
+"""
+
+from database.supabase_config import get_supabase_client, SCORE_FEATURES_TABLE
+from ml_models.score_features import FEATURE_VERSION, feature_vector
+from utils.metrics import timed_db_call
+from typing import Dict, List, Optional
+
+class ScoreFeature:
+    """Score feature model for Supabase"""
+
+    # Columns the re-scoring job reads (everything but timestamps)
+    RESCORE_COLUMNS = 'id, kind, result_id, session_id, question_id, version, features, score'
+
+    @staticmethod
+    def build_record(kind: str, result_id: str, user_id: str, features: Dict, score: float,
+                     session_id: Optional[str] = None, question_id: Optional[str] = None) -> Dict:
+        """Build the row stored for one scored result"""
+        return {
+            'id': f'{kind}:{result_id}',
+            'kind': kind,
+            'result_id': str(result_id),
+            'session_id': session_id,
+            'question_id': question_id,
+            'user_id': user_id,
+            'version': FEATURE_VERSION,
+            'features': feature_vector(kind, features),
+            'score': score
+        }
+
+    @staticmethod
+    @timed_db_call
+    def bulk_upsert(rows: List[Dict]):
+        """
+        Store many feature rows in one round trip
+        Ids are derived from the result, so replays overwrite the same row
+        """
+        supabase = get_supabase_client()
+
+        if supabase is None:
+            raise Exception("Database not available")
+
+        latest = {}
+        for row in rows:
+            latest[row['id']] = row
+
+        result = supabase.table(SCORE_FEATURES_TABLE).upsert(list(latest.values())).execute()
+        return result.data
+
+    @staticmethod
+    @timed_db_call
+    def get_page(kind: str, after_id: Optional[str] = None, limit: int = 5000):
+        """Next page of a kind's rows in id order (keyset pagination; after_id is the last id seen)"""
+        supabase = get_supabase_client()
+
+        if supabase is None:
+            raise Exception("Database not available")
+
+        query = supabase.table(SCORE_FEATURES_TABLE).select(ScoreFeature.RESCORE_COLUMNS).eq('kind', kind)
+        if after_id is not None:
+            query = query.gt('id', after_id)
+
+        result = query.order('id').limit(limit).execute()
+        return result.data
@@ -4,6 +4,7 @@ Represents user data structure in Supabase PostgreSQL
 """
 
 from database.supabase_config import get_supabase_client, USERS_TABLE
+from utils.metrics import timed_db_call
 from datetime import datetime
 from typing import Dict, Optional
 
@@ -11,6 +12,7 @@ class User:
     """User model for Supabase PostgreSQL"""
     
     @staticmethod
+    @timed_db_call
     def create(email: str, name: str, skill_level: str = 'Beginner', job_role: str = 'Software Engineer', user_id: Optional[str] = None):
         """Create new user in database"""
         supabase = get_supabase_client()
@@ -32,6 +34,7 @@ class User:
         return result.data[0] if result.data else None
     
     @staticmethod
+    @timed_db_call
     def get_by_id(user_id: str):
         """Get user by ID"""
         supabase = get_supabase_client()
@@ -43,6 +46,7 @@ class User:
         return result.data[0] if result.data else None
     
     @staticmethod
+    @timed_db_call
     def get_by_email(email: str):
         """Get user by email"""
         supabase = get_supabase_client()
@@ -54,6 +58,7 @@ class User:
         return result.data[0] if result.data else None
     
     @staticmethod
+    @timed_db_call
     def update(user_id: str, data: Dict):
         """Update user profile"""
         supabase = get_supabase_client()
@@ -65,6 +70,7 @@ class User:
         return result.data[0] if result.data else None
     
     @staticmethod
+    @timed_db_call
     def delete(user_id: str):
         """Delete user"""
         supabase = get_supabase_client()
@@ -0,0 +1,72 @@
+"""
+Admin Routes
+Operator-only diagnostics (requests must be signed with ADMIN_SECRET)
+"""
+
+from flask import Blueprint, request, jsonify
+
+from utils.admin_auth import require_admin
+from utils.allocations import take_snapshot, get_tracing_status, stop_tracing, GROUP_BY_OPTIONS
+
+admin_bp = Blueprint('admin', __name__)
+
+@admin_bp.route('/memory', methods=['GET'])
+@require_admin
+def memory_status():
+    """tracemalloc status of the worker answering the request"""
+    return jsonify({
+        'success': True,
+        'memory': get_tracing_status()
+    }), 200
+
+@admin_bp.route('/memory/snapshot', methods=['POST'])
+@require_admin
+def memory_snapshot():
+    """
+    Take a tracemalloc snapshot and diff it against the previous one
+    Starts tracing on first use; the first snapshot only becomes the reference
+    
+    Query params:
+        group_by: lineno (default), filename or traceback
+        top: Number of entries (default 20, max 200)
+        against: previous (default) or baseline
+        reset: true to make this snapshot the new baseline
+    """
+    try:
+        group_by = request.args.get('group_by', 'lineno')
+        if group_by not in GROUP_BY_OPTIONS:
+            return jsonify({
+                'success': False,
+                'message': f"group_by must be one of: {', '.join(GROUP_BY_OPTIONS)}"
+            }), 400
+        
+        against = request.args.get('against', 'previous')
+        if against not in ('previous', 'baseline'):
+            return jsonify({
+                'success': False,
+                'message': 'against must be previous or baseline'
+            }), 400
+        
+        top = min(int(request.args.get('top', 20)), 200)
+        reset = request.args.get('reset', 'false').lower() == 'true'
+        
+        return jsonify({
+            'success': True,
+            'snapshot': take_snapshot(group_by=group_by, top=top, against=against, reset_baseline=reset)
+        }), 200
+        
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'message': 'top must be an integer'
+        }), 400
+
+@admin_bp.route('/memory/tracing', methods=['DELETE'])
+@require_admin
+def memory_stop_tracing():
+    """Stop tracemalloc and drop stored snapshots"""
+    stop_tracing()
+    return jsonify({
+        'success': True,
+        'message': 'Tracing stopped'
+    }), 200
@@ -10,9 +10,17 @@ from functools import wraps
 from database.supabase_config import get_supabase_client
 from models.user import User
 from utils.validators import validate_email, validate_password
+from utils.tracing import span
+from utils.rate_limit import check_user
 
 auth_bp = Blueprint('auth', __name__)
 
+def verify_token(supabase, token: str):
+    """Supabase user for an access token, or None if the token is invalid"""
+    with span('require_auth'):
+        user_response = supabase.auth.get_user(token)
+    return user_response.user if user_response else None
+
 def require_auth(f):
     """Decorator to require authentication for routes"""
     @wraps(f)
@@ -36,11 +44,16 @@ def require_auth(f):
                 }), 503
             
             # Verify token with Supabase
-            user_response = supabase.auth.get_user(token)
+            user = verify_token(supabase, token)
             
-            if user_response and user_response.user:
-                request.user_id = user_response.user.id
-                request.user_email = user_response.user.email
+            if user:
+                request.user_id = user.id
+                request.user_email = user.email
+                
+                limited = check_user(user.id)
+                if limited:
+                    return limited
+                
                 return f(*args, **kwargs)
             else:
                 return jsonify({
@@ -7,12 +7,9 @@ from flask import Blueprint, request, jsonify
 from datetime import datetime, timedelta
 
 from routes.auth_routes import require_auth
-from database.firebase_config import (
-    get_firestore_client,
-    INTERVIEW_SESSIONS_COLLECTION,
-    FLUENCY_TESTS_COLLECTION,
-    RESUMES_COLLECTION
-)
+from models.interview_session import InterviewSession
+from models.fluency_test import FluencyTest
+from models.resume import Resume
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
@@ -24,59 +21,43 @@ def get_stats():
     Returns counts, averages, and trends
     """
     try:
-        db = get_firestore_client()
-        if db is None:
-            return jsonify({
-                'success': False,
-                'message': 'Database not available'
-            }), 503
-        
         user_id = request.user_id
         
-        # Get interview sessions
-        interview_sessions = db.collection(INTERVIEW_SESSIONS_COLLECTION)\
-            .where('user_id', '==', user_id)\
-            .get()
+        # Get interview session scores (score columns only)
+        interview_sessions = InterviewSession.get_user_scores(user_id)
         
         interview_count = len(interview_sessions)
         interview_scores = []
         
-        for session in interview_sessions:
-            session_data = session.to_dict()
-            score = session_data.get('overall_score', 0)
+        for session_data in interview_sessions:
+            score = session_data.get('overall_score') or 0
             if score > 0:
                 interview_scores.append(score)
         
         avg_interview_score = sum(interview_scores) / len(interview_scores) if interview_scores else 0
         
-        # Get fluency tests
-        fluency_tests = db.collection(FLUENCY_TESTS_COLLECTION)\
-            .where('user_id', '==', user_id)\
-            .get()
+        # Get fluency test scores
+        fluency_tests = FluencyTest.get_user_scores(user_id)
         
         fluency_count = len(fluency_tests)
         fluency_scores = []
         
-        for test in fluency_tests:
-            test_data = test.to_dict()
-            score = test_data.get('fluency_score', 0)
+        for test_data in fluency_tests:
+            score = test_data.get('fluency_score') or 0
             if score > 0:
                 fluency_scores.append(score)
         
         latest_fluency_score = fluency_scores[-1] if fluency_scores else 0
         avg_fluency_score = sum(fluency_scores) / len(fluency_scores) if fluency_scores else 0
         
-        # Get resumes
-        resumes = db.collection(RESUMES_COLLECTION)\
-            .where('user_id', '==', user_id)\
-            .get()
+        # Get resume scores
+        resumes = Resume.get_user_scores(user_id)
         
         resume_count = len(resumes)
         resume_scores = []
         
-        for resume in resumes:
-            resume_data = resume.to_dict()
-            score = resume_data.get('score', 0)
+        for resume_data in resumes:
+            score = resume_data.get('overall_score') or 0
             if score > 0:
                 resume_scores.append(score)
         
@@ -121,86 +102,58 @@ def get_history():
     Returns recent interviews, fluency tests, and resumes
     """
     try:
-        db = get_firestore_client()
-        if db is None:
-            return jsonify({
-                'success': False,
-                'message': 'Database not available'
-            }), 503
-        
         user_id = request.user_id
         limit = int(request.args.get('limit', 10))
         
         history = []
         
-        # Get recent interview sessions
-        interview_sessions = db.collection(INTERVIEW_SESSIONS_COLLECTION)\
-            .where('user_id', '==', user_id)\
-            .order_by('timestamp', direction='DESCENDING')\
-            .limit(limit)\
-            .get()
-        
-        for session in interview_sessions:
-            session_data = session.to_dict()
+        # Get recent interview sessions (summary columns only)
+        for session_data in InterviewSession.get_user_session_summaries(user_id, limit):
             history.append({
-                'id': session_data.get('session_id'),
+                'id': session_data.get('id'),
                 'type': 'interview',
                 'title': f"{session_data.get('job_role')} Interview - {session_data.get('skill_level')}",
-                'score': session_data.get('overall_score', 0),
+                'score': session_data.get('overall_score') or 0,
                 'status': session_data.get('status', 'completed'),
-                'timestamp': session_data.get('timestamp'),
+                'timestamp': session_data.get('created_at'),
                 'details': {
                     'job_role': session_data.get('job_role'),
                     'skill_level': session_data.get('skill_level'),
-                    'questions_count': len(session_data.get('questions', []))
+                    'questions_count': session_data.get('question_count') or 0
                 }
             })
         
         # Get recent fluency tests
-        fluency_tests = db.collection(FLUENCY_TESTS_COLLECTION)\
-            .where('user_id', '==', user_id)\
-            .order_by('timestamp', direction='DESCENDING')\
-            .limit(limit)\
-            .get()
-        
-        for test in fluency_tests:
-            test_data = test.to_dict()
+        for test_data in FluencyTest.get_user_test_summaries(user_id, limit):
             history.append({
-                'id': test_data.get('test_id'),
+                'id': test_data.get('id'),
                 'type': 'fluency',
                 'title': 'English Fluency Test',
-                'score': test_data.get('fluency_score', 0),
+                'score': test_data.get('fluency_score') or 0,
                 'status': 'completed',
-                'timestamp': test_data.get('timestamp'),
+                'timestamp': test_data.get('created_at'),
                 'details': {
-                    'wpm': test_data.get('wpm', 0),
-                    'filler_word_count': test_data.get('filler_word_count', 0)
+                    'wpm': test_data.get('wpm') or 0,
+                    'filler_word_count': test_data.get('filler_word_count') or 0
                 }
             })
         
         # Get recent resumes
-        resumes = db.collection(RESUMES_COLLECTION)\
-            .where('user_id', '==', user_id)\
-            .order_by('timestamp', direction='DESCENDING')\
-            .limit(limit)\
-            .get()
-        
-        for resume in resumes:
-            resume_data = resume.to_dict()
+        for resume_data in Resume.get_user_resume_summaries(user_id, limit):
             history.append({
-                'id': resume_data.get('resume_id'),
+                'id': resume_data.get('id'),
                 'type': 'resume',
                 'title': 'Resume Analysis',
-                'score': resume_data.get('score', 0),
+                'score': resume_data.get('overall_score') or 0,
                 'status': 'completed',
-                'timestamp': resume_data.get('timestamp'),
+                'timestamp': resume_data.get('created_at'),
                 'details': {
-                    'suggestions_count': len(resume_data.get('suggestions', []))
+                    'suggestions_count': resume_data.get('suggestion_count') or 0
                 }
             })
         
         # Sort by timestamp (most recent first)
-        history.sort(key=lambda x: x['timestamp'] if x['timestamp'] else datetime.min, reverse=True)
+        history.sort(key=lambda x: x['timestamp'] or '', reverse=True)
         
         # Limit results
         history = history[:limit]
@@ -228,13 +181,6 @@ def get_trends():
     Returns score trends for the past 30 days
     """
     try:
-        db = get_firestore_client()
-        if db is None:
-            return jsonify({
-                'success': False,
-                'message': 'Database not available'
-            }), 503
-        
         user_id = request.user_id
         days = int(request.args.get('days', 30))
         
@@ -242,44 +188,28 @@ def get_trends():
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         
-        # Get interview sessions in date range
-        interview_sessions = db.collection(INTERVIEW_SESSIONS_COLLECTION)\
-            .where('user_id', '==', user_id)\
-            .where('timestamp', '>=', start_date)\
-            .where('timestamp', '<=', end_date)\
-            .order_by('timestamp')\
-            .get()
-        
+        # Get interview scores in date range
         interview_trend = []
-        for session in interview_sessions:
-            session_data = session.to_dict()
+        for session_data in InterviewSession.get_user_scores(user_id, start_date.isoformat(), end_date.isoformat()):
             interview_trend.append({
-                'date': session_data.get('timestamp'),
-                'score': session_data.get('overall_score', 0)
+                'date': session_data.get('created_at'),
+                'score': session_data.get('overall_score') or 0
             })
         
-        # Get fluency tests in date range
-        fluency_tests = db.collection(FLUENCY_TESTS_COLLECTION)\
-            .where('user_id', '==', user_id)\
-            .where('timestamp', '>=', start_date)\
-            .where('timestamp', '<=', end_date)\
-            .order_by('timestamp')\
-            .get()
-        
+        # Get fluency scores in date range
         fluency_trend = []
-        for test in fluency_tests:
-            test_data = test.to_dict()
+        for test_data in FluencyTest.get_user_scores(user_id, start_date.isoformat(), end_date.isoformat()):
             fluency_trend.append({
-                'date': test_data.get('timestamp'),
-                'score': test_data.get('fluency_score', 0)
+                'date': test_data.get('created_at'),
+                'score': test_data.get('fluency_score') or 0
             })
         
         return jsonify({
             'success': True,
             'data': {
                 'date_range': {
-                    'start': start_date,
-                    'end': end_date,
+                    'start': start_date.isoformat(),
+                    'end': end_date.isoformat(),
                     'days': days
                 },
                 'trends': {
@@ -7,12 +7,24 @@ from flask import Blueprint, request, jsonify
 from datetime import datetime
 
 from routes.auth_routes import require_auth
-from database.firebase_config import get_firestore_client, FLUENCY_TESTS_COLLECTION
+from utils.admission import admission_control
+from services.idempotency_service import idempotent
 from models.fluency_test import FluencyTest
-from ml_models.fluency_scorer import analyze_speech_fluency
+from services.write_behind_service import get_write_buffer
+from services.upload_service import UploadError, open_upload
+from routes.upload_routes import upload_error_response
 
 fluency_bp = Blueprint('fluency', __name__)
 
+# Placeholder until pronunciation is scored from audio
+PLACEHOLDER_PRONUNCIATION_SCORE = 85.0
+
+# Column projection for score reads (everything except the transcript)
+SCORE_COLUMNS = (
+    'id, user_id, fluency_score, pronunciation_score, grammar_score, wpm, '
+    'filler_word_count, pause_count, overall_score, feedback, grammar_errors, created_at'
+)
+
 @fluency_bp.route('/test', methods=['POST'])
 @require_auth
 def start_fluency_test():
@@ -20,24 +32,20 @@ def start_fluency_test():
     Start a new fluency test
     """
     try:
-        # Create new fluency test
-        test = FluencyTest(user_id=request.user_id)
+        # Create new fluency test (transcript is filled in by /analyze)
+        test = FluencyTest.create(user_id=request.user_id, transcript='')
         
-        # Save to Firestore
-        db = get_firestore_client()
-        if db is None:
+        if not test:
             return jsonify({
                 'success': False,
-                'message': 'Database not available'
-            }), 503
-        
-        db.collection(FLUENCY_TESTS_COLLECTION).document(test.test_id).set(test.to_dict())
+                'message': 'Failed to create fluency test'
+            }), 500
         
         return jsonify({
             'success': True,
             'message': 'Fluency test started',
             'data': {
-                'test_id': test.test_id
+                'test_id': test['id']
             }
         }), 201
         
@@ -50,17 +58,25 @@ def start_fluency_test():
 
 @fluency_bp.route('/analyze', methods=['POST'])
 @require_auth
+@idempotent
+@admission_control('fluency')
 def analyze_fluency():
     """
     Analyze speech fluency from transcript
     Provides detailed analysis and scoring
+    
+    JSON body, or multipart/form-data with the same fields plus the recording
+    as 'audio'; or JSON with audio_upload_id of a completed chunked upload.
+    With a recording, duration and pauses are measured from the audio
+    instead of trusting audio_duration and the transcript's ellipses.
     """
     try:
-        data = request.get_json()
+        audio = request.files.get('audio')
+        data = request.form if audio is not None else (request.get_json() or {})
         
         test_id = data.get('test_id')
-        transcript = data.get('transcript', '').strip()
-        audio_duration = data.get('audio_duration', 0)
+        transcript = (data.get('transcript') or '').strip()
+        audio_duration = float(data.get('audio_duration') or 0)
         
         if not test_id or not transcript:
             return jsonify({
@@ -68,73 +84,130 @@ def analyze_fluency():
                 'message': 'test_id and transcript are required'
             }), 400
         
-        # Analyze fluency
-        analysis = analyze_speech_fluency(transcript, audio_duration)
+        audio_features = None
+        audio_upload_id = data.get('audio_upload_id')
+        if audio is not None or audio_upload_id:
+            # Audio stack (NumPy, pydub) is imported on first use
+            from services.audio_analysis_service import AudioAnalysisBusy, analyze_audio, audio_format_for
+            from ml_models.audio_features import AudioDecodeError
+            try:
+                if audio is not None:
+                    audio_features = analyze_audio(audio.read(), audio_format_for(audio.filename, audio.mimetype))
+                else:
+                    # Chunked upload: the audio worker reads the stored file
+                    upload = open_upload(audio_upload_id, request.user_id, 'audio')
+                    audio_features = analyze_audio(
+                        upload['path'], audio_format_for(upload['filename'], upload['content_type'])
+                    )
+            except UploadError as e:
+                return upload_error_response(e)
+            except AudioDecodeError as e:
+                return jsonify({
+                    'success': False,
+                    'message': str(e)
+                }), 400
+            except AudioAnalysisBusy as e:
+                response = jsonify({
+                    'success': False,
+                    'message': str(e)
+                })
+                response.headers['Retry-After'] = '5'
+                return response, 503
         
-        # Get Firestore client
-        db = get_firestore_client()
-        if db is None:
-            return jsonify({
-                'success': False,
-                'message': 'Database not available'
-            }), 503
-        
-        # Get test document
-        test_ref = db.collection(FLUENCY_TESTS_COLLECTION).document(test_id)
-        test_doc = test_ref.get()
+        # Analyze fluency (NLP stack is imported on first use; an oversized
+        # transcript's word count is estimated from a sample)
+        from ml_models.fluency_scorer import analyze_speech_fluency
+        from ml_models.evaluation_budget import EvaluationBudget
+        analysis = analyze_speech_fluency(
+            transcript, audio_duration, audio_features, EvaluationBudget.for_request('fluency')
+        )
         
-        if not test_doc.exists:
-            return jsonify({
-                'success': False,
-                'message': 'Fluency test not found'
-            }), 404
-        
-        test_data = test_doc.to_dict()
-        
-        # Verify ownership
-        if test_data['user_id'] != request.user_id:
-            return jsonify({
-                'success': False,
-                'message': 'Unauthorized access to test'
-            }), 403
+        grammar_score = 100 - (len(analysis['grammar_errors']) * 5)
+        overall_score = FluencyTest.calculate_overall_score(
+            analysis['fluency_score'], PLACEHOLDER_PRONUNCIATION_SCORE, grammar_score
+        )
         
-        # Update test with analysis results
-        test_ref.update({
+        result_data = {
             'transcript': transcript,
-            'audio_duration': audio_duration,
+            # Measured from the recording when there is one
+            'audio_duration': audio_features['duration_seconds'] if audio_features else audio_duration,
             'fluency_score': analysis['fluency_score'],
-            'pronunciation_score': 85.0,  # Placeholder - needs audio analysis
-            'grammar_score': 100 - (len(analysis['grammar_errors']) * 5),
+            'pronunciation_score': PLACEHOLDER_PRONUNCIATION_SCORE,
+            'grammar_score': grammar_score,
             'wpm': analysis['wpm'],
             'pause_count': analysis['pauses']['count'],
             'filler_word_count': analysis['filler_words']['total_count'],
             'feedback': analysis['feedback'],
-            'detailed_analysis': {
-                'filler_words': analysis['filler_words'],
-                'pauses': analysis['pauses'],
-                'grammar_errors': analysis['grammar_errors']
-            }
-        })
+            'grammar_errors': analysis['grammar_errors'],
+            # Stored truncated to an integer on both paths below
+            'overall_score': overall_score
+        }
         
-        # Get updated test
-        updated_test = test_ref.get().to_dict()
-        test_obj = FluencyTest.from_dict(updated_test)
-        overall_score = test_obj.calculate_overall_score()
+        buffer = get_write_buffer()
+        if buffer is not None:
+            # Check ownership now, persist in the next bulk flush
+            owner = FluencyTest.get_owner(test_id)
+            if not owner:
+                return jsonify({
+                    'success': False,
+                    'message': 'Fluency test not found'
+                }), 404
+            
+            if owner['user_id'] != request.user_id:
+                return jsonify({
+                    'success': False,
+                    'message': 'Unauthorized access to test'
+                }), 403
+            
+            buffer.submit('fluency_result', {
+                'test_id': test_id,
+                'user_id': request.user_id,
+                'data': result_data
+            })
+            stored_overall_score = int(overall_score)
+        else:
+            # Store results in one round trip
+            # (ownership is checked inside the database function)
+            updated_test = FluencyTest.apply_analysis(test_id, request.user_id, result_data)
+            
+            if not updated_test:
+                owner = FluencyTest.get_owner(test_id)
+                if not owner:
+                    return jsonify({
+                        'success': False,
+                        'message': 'Fluency test not found'
+                    }), 404
+                
+                return jsonify({
+                    'success': False,
+                    'message': 'Unauthorized access to test'
+                }), 403
+            
+            stored_overall_score = updated_test.get('overall_score') or 0
+        
+        # Keep the raw features so the score can be recomputed when weights change
+        from ml_models.score_features import fluency_features
+        from services.rescoring_service import record_features
+        record_features(
+            'fluency_test', test_id, request.user_id,
+            fluency_features(analysis, PLACEHOLDER_PRONUNCIATION_SCORE), overall_score
+        )
         
         return jsonify({
             'success': True,
             'message': 'Fluency analyzed successfully',
             'data': {
                 'test_id': test_id,
-                'overall_score': overall_score,
+                'overall_score': stored_overall_score,
                 'fluency_score': analysis['fluency_score'],
-                'pronunciation_score': 85.0,
-                'grammar_score': 100 - (len(analysis['grammar_errors']) * 5),
+                'pronunciation_score': PLACEHOLDER_PRONUNCIATION_SCORE,
+                'grammar_score': grammar_score,
                 'wpm': analysis['wpm'],
                 'word_count': analysis['word_count'],
                 'filler_word_count': analysis['filler_words']['total_count'],
                 'pause_count': analysis['pauses']['count'],
                 'feedback': analysis['feedback'],
+                'partial': analysis['partial'],
                 'detailed_analysis': analysis
             }
         }), 200
@@ -153,24 +226,15 @@ def get_fluency_score(test_id):
     Get fluency test results by test ID
     """
     try:
-        db = get_firestore_client()
-        if db is None:
-            return jsonify({
-                'success': False,
-                'message': 'Database not available'
-            }), 503
+        # Get test (score columns only, no transcript)
+        test_data = FluencyTest.get_by_id(test_id, columns=SCORE_COLUMNS)
         
-        # Get test
-        test_doc = db.collection(FLUENCY_TESTS_COLLECTION).document(test_id).get()
-        
-        if not test_doc.exists:
+        if not test_data:
             return jsonify({
                 'success': False,
                 'message': 'Fluency test not found'
             }), 404
         
-        test_data = test_doc.to_dict()
-        
         # Verify ownership
         if test_data['user_id'] != request.user_id:
             return jsonify({
@@ -178,24 +242,22 @@ def get_fluency_score(test_id):
                 'message': 'Unauthorized access to test'
             }), 403
         
-        # Calculate overall score
-        test_obj = FluencyTest.from_dict(test_data)
-        overall_score = test_obj.calculate_overall_score()
-        
         return jsonify({
             'success': True,
             'data': {
                 'test_id': test_id,
-                'overall_score': overall_score,
-                'fluency_score': test_data.get('fluency_score', 0),
-                'pronunciation_score': test_data.get('pronunciation_score', 0),
-                'grammar_score': test_data.get('grammar_score', 0),
-                'wpm': test_data.get('wpm', 0),
-                'filler_word_count': test_data.get('filler_word_count', 0),
-                'pause_count': test_data.get('pause_count', 0),
-                'feedback': test_data.get('feedback', []),
-                'detailed_analysis': test_data.get('detailed_analysis', {}),
-                'timestamp': test_data.get('timestamp')
+                'overall_score': test_data.get('overall_score') or 0,
+                'fluency_score': test_data.get('fluency_score') or 0,
+                'pronunciation_score': test_data.get('pronunciation_score') or 0,
+                'grammar_score': test_data.get('grammar_score') or 0,
+                'wpm': test_data.get('wpm') or 0,
+                'filler_word_count': test_data.get('filler_word_count') or 0,
+                'pause_count': test_data.get('pause_count') or 0,
+                'feedback': test_data.get('feedback') or [],
+                'detailed_analysis': {
+                    'grammar_errors': test_data.get('grammar_errors') or []
+                },
+                'timestamp': test_data.get('created_at')
             }
         }), 200
         
@@ -5,11 +5,14 @@ Handles mock interview sessions, questions, and answer evaluation
 
 from flask import Blueprint, request, jsonify
 from datetime import datetime
+import uuid
 
 from routes.auth_routes import require_auth
+from utils.admission import admission_control
+from services.idempotency_service import idempotent, coalesce_answers
 from models.interview_session import InterviewSession
 from services.question_generator_service import get_questions_for_role, generate_follow_up_question
-from services.ai_interview_service import evaluate_interview_answer
+from services.write_behind_service import get_write_buffer
 
 interview_bp = Blueprint('interview', __name__)
 
@@ -100,6 +103,9 @@ def get_questions():
 
 @interview_bp.route('/submit-answer', methods=['POST'])
 @require_auth
+@idempotent
+@coalesce_answers('answer')
+@admission_control('interview')
 def submit_answer():
     """
     Submit an answer for evaluation
@@ -119,32 +125,30 @@ def submit_answer():
                 'message': 'session_id, question_id, question, and answer are required'
             }), 400
         
-        # Get session
-        session = InterviewSession.get_by_id(session_id)
+        # Session answers are scored on every dimension, so the session
+        # average and the re-scorer only ever see full scores
+        if request.args.get('dimensions'):
+            return subset_not_allowed_response()
         
-        if not session:
-            return jsonify({
-                'success': False,
-                'message': 'Interview session not found'
-            }), 404
+        job_role, skill_level, error = resolve_session_role(session_id)
+        if error is not None:
+            return error
         
-        # Verify session belongs to user
-        if session['user_id'] != request.user_id:
-            return jsonify({
-                'success': False,
-                'message': 'Unauthorized access to session'
-            }), 403
-        
-        # Evaluate answer using AI
-        evaluation = evaluate_interview_answer(
+        # Evaluate answer using AI (the NLP stack is imported on first use;
+        # time and size limits keep an oversized answer from holding the worker)
+        from services.ai_interview_service import evaluate_interview_answer_with_features
+        from ml_models.evaluation_budget import EvaluationBudget
+        evaluation, features = evaluate_interview_answer_with_features(
             question=question_text,
             answer=answer,
-            job_role=session['job_role'],
-            skill_level=session['skill_level']
+            job_role=job_role,
+            skill_level=skill_level,
+            budget=EvaluationBudget.for_request('interview')
         )
         
         # Create answer record
         answer_record = {
+            'id': uuid.uuid4().hex,
             'question_id': question_id,
             'question': question_text,
             'answer': answer,
@@ -152,24 +156,9 @@ def submit_answer():
             'timestamp': datetime.now().isoformat()
         }
         
-        # Update session with answer
-        answers = session.get('answers', [])
-        answers.append(answer_record)
-        
-        # Update scores
-        scores = session.get('scores', {})
-        scores[question_id] = {
-            'score': evaluation['overall_score'],
-            'relevance': evaluation['relevance']['score'],
-            'grammar': evaluation['grammar']['score'],
-            'completeness': evaluation['completeness']['score'],
-            'sentiment': evaluation['sentiment_score']
-        }
-        
-        InterviewSession.update(session_id, {
-            'answers': answers,
-            'scores': scores
-        })
+        # Persist answer and score (ownership re-checked in the database)
+        if not persist_answer(session_id, question_id, answer_record, evaluation, features):
+            return session_access_error(None)
         
         return jsonify({
             'success': True,
@@ -189,6 +178,9 @@ def submit_answer():
 
 @interview_bp.route('/voice-answer', methods=['POST'])
 @require_auth
+@idempotent
+@coalesce_answers('transcript')
+@admission_control('interview')
 def submit_voice_answer():
     """
     Submit a voice-based answer (with transcript)
@@ -209,31 +201,30 @@ def submit_voice_answer():
                 'message': 'session_id, question_id, question, and transcript are required'
             }), 400
         
-        # Get session
-        session = InterviewSession.get_by_id(session_id)
+        # Session answers are scored on every dimension, so the session
+        # average and the re-scorer only ever see full scores
+        if request.args.get('dimensions'):
+            return subset_not_allowed_response()
         
-        if not session:
-            return jsonify({
-                'success': False,
-                'message': 'Interview session not found'
-            }), 404
-        
-        if session['user_id'] != request.user_id:
-            return jsonify({
-                'success': False,
-                'message': 'Unauthorized access to session'
-            }), 403
+        job_role, skill_level, error = resolve_session_role(session_id)
+        if error is not None:
+            return error
         
-        # Evaluate transcript
-        evaluation = evaluate_interview_answer(
+        # Evaluate transcript (the NLP stack is imported on first use;
+        # time and size limits keep an oversized answer from holding the worker)
+        from services.ai_interview_service import evaluate_interview_answer_with_features
+        from ml_models.evaluation_budget import EvaluationBudget
+        evaluation, features = evaluate_interview_answer_with_features(
             question=question_text,
             answer=transcript,
-            job_role=session['job_role'],
-            skill_level=session['skill_level']
+            job_role=job_role,
+            skill_level=skill_level,
+            budget=EvaluationBudget.for_request('interview')
         )
         
         # Create answer record
         answer_record = {
+            'id': uuid.uuid4().hex,
             'question_id': question_id,
             'question': question_text,
             'answer': transcript,
@@ -243,23 +234,9 @@ def submit_voice_answer():
             'timestamp': datetime.now().isoformat()
         }
         
-        # Update session
-        answers = session.get('answers', [])
-        answers.append(answer_record)
-        
-        scores = session.get('scores', {})
-        scores[question_id] = {
-            'score': evaluation['overall_score'],
-            'relevance': evaluation['relevance']['score'],
-            'grammar': evaluation['grammar']['score'],
-            'completeness': evaluation['completeness']['score'],
-            'sentiment': evaluation['sentiment_score']
-        }
-        
-        InterviewSession.update(session_id, {
-            'answers': answers,
-            'scores': scores
-        })
+        # Persist answer and score (ownership re-checked in the database)
+        if not persist_answer(session_id, question_id, answer_record, evaluation, features):
+            return session_access_error(None)
         
         return jsonify({
             'success': True,
@@ -277,6 +254,63 @@ def submit_voice_answer():
             'error': str(e)
         }), 500
 
+@interview_bp.route('/evaluate', methods=['POST'])
+@require_auth
+@admission_control('interview')
+def evaluate_answer():
+    """
+    Score an answer without storing it (quick practice)
+    ?dimensions=relevance,completeness scores only the listed dimensions
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        
+        answer = (data.get('answer') or '').strip()
+        question_text = data.get('question')
+        job_role = data.get('job_role', 'Software Engineer')
+        skill_level = data.get('skill_level', 'Beginner')
+        
+        if not answer or not question_text:
+            return jsonify({
+                'success': False,
+                'message': 'question and answer are required'
+            }), 400
+        
+        # The NLP stack is imported on first use
+        from services.ai_interview_service import DIMENSIONS, evaluate_interview_answer, parse_dimensions
+        from ml_models.evaluation_budget import EvaluationBudget
+        try:
+            dimensions = parse_dimensions(request.args.get('dimensions'))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+        
+        evaluation = evaluate_interview_answer(
+            question=question_text,
+            answer=answer,
+            job_role=job_role,
+            skill_level=skill_level,
+            budget=EvaluationBudget.for_request('interview'),
+            dimensions=dimensions
+        )
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'evaluation': evaluation,
+                'dimensions': dimensions or list(DIMENSIONS)
+            }
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Failed to evaluate answer',
+            'error': str(e)
+        }), 500
+
 @interview_bp.route('/feedback/<session_id>', methods=['GET'])
 @require_auth
 def get_feedback(session_id):
@@ -285,37 +319,30 @@ def get_feedback(session_id):
     Includes overall score, individual scores, and recommendations
     """
     try:
-        # Get session
-        session = InterviewSession.get_by_id(session_id)
+        # Mark session as completed and get the updated row in one round trip
+        session = InterviewSession.complete(session_id, request.user_id)
         
         if not session:
-            return jsonify({
-                'success': False,
-                'message': 'Interview session not found'
-            }), 404
-        
-        # Verify ownership
-        if session['user_id'] != request.user_id:
+            owner = InterviewSession.get_owner_and_role(session_id)
+            if not owner:
+                return jsonify({
+                    'success': False,
+                    'message': 'Interview session not found'
+                }), 404
+            
             return jsonify({
                 'success': False,
                 'message': 'Unauthorized access to session'
             }), 403
         
         # Calculate overall session score
-        scores = session.get('scores', {})
+        scores = session.get('scores') or {}
         if scores:
             score_values = [s['score'] for s in scores.values()]
             overall_score = sum(score_values) / len(score_values)
         else:
             overall_score = 0
         
-        # Mark session as completed
-        InterviewSession.update(session_id, {
-            'status': 'completed',
-            'overall_score': int(overall_score),
-            'completed_at': datetime.now().isoformat()
-        })
-        
         return jsonify({
             'success': True,
             'data': {
@@ -324,8 +351,8 @@ def get_feedback(session_id):
                 'skill_level': session['skill_level'],
                 'overall_score': round(overall_score, 2),
                 'scores': scores,
-                'answers': session.get('answers', []),
-                'questions': session.get('questions', []),
+                'answers': session.get('answers') or [],
+                'questions': session.get('questions') or [],
                 'created_at': session.get('created_at')
             }
         }), 200
@@ -336,3 +363,91 @@ def get_feedback(session_id):
             'message': 'Failed to get feedback',
             'error': str(e)
         }), 500
+
+def subset_not_allowed_response():
+    """400 for ?dimensions on a session answer (only /evaluate scores a subset)"""
+    return jsonify({
+        'success': False,
+        'message': 'dimensions is only supported on /api/interview/evaluate; '
+                   'session answers are scored on every dimension'
+    }), 400
+
+def build_score_summary(evaluation: dict) -> dict:
+    """Per-question score summary stored in the session's scores map"""
+    summary = {'score': evaluation['overall_score']}
+    for dimension in ('relevance', 'grammar', 'completeness'):
+        if dimension in evaluation:
+            summary[dimension] = evaluation[dimension]['score']
+    if 'sentiment_score' in evaluation:
+        summary['sentiment'] = evaluation['sentiment_score']
+    return summary
+
+def session_access_error(session):
+    """404/403 response if the session is missing or not the user's, else None"""
+    if not session:
+        return jsonify({
+            'success': False,
+            'message': 'Interview session not found'
+        }), 404
+    
+    if session['user_id'] != request.user_id:
+        return jsonify({
+            'success': False,
+            'message': 'Unauthorized access to session'
+        }), 403
+    
+    return None
+
+def resolve_session_role(session_id: str):
+    """
+    Job role and skill level to evaluate an answer for: (job_role, skill_level, error_response)
+    Always read from the session (owner and role only), never taken from the client
+    """
+    session = InterviewSession.get_owner_and_role(session_id)
+    error = session_access_error(session)
+    if error is not None:
+        return None, None, error
+    
+    return session['job_role'], session['skill_level'], None
+
+def persist_answer(session_id: str, question_id: str, answer_record: dict, evaluation: dict,
+                   features: dict) -> bool:
+    """
+    Append an answer to its session
+    Queued on the write-behind buffer when enabled, otherwise written in one RPC
+    Returns False if the session no longer exists for this user
+    """
+    score = build_score_summary(evaluation)
+    
+    buffer = get_write_buffer()
+    if buffer is not None:
+        buffer.submit('interview_answer', {
+            'session_id': session_id,
+            'user_id': request.user_id,
+            'question_id': question_id,
+            'answer': answer_record,
+            'score': score
+        })
+        record_answer_features(session_id, question_id, answer_record, evaluation, features)
+        return True
+    
+    updated = InterviewSession.append_answer(
+        session_id, request.user_id, question_id, answer_record, score
+    )
+    if updated is None:
+        return False
+    
+    record_answer_features(session_id, question_id, answer_record, evaluation, features)
+    return True
+
+def record_answer_features(session_id: str, question_id: str, answer_record: dict, evaluation: dict,
+                           features: dict):
+    """
+    Keep an answer's raw features so its score can be recomputed when weights change
+    (only in score_features: they are not part of the stored answer or the response)
+    """
+    from services.rescoring_service import record_features
+    record_features(
+        'interview_answer', answer_record['id'], request.user_id, features,
+        evaluation['overall_score'], session_id=session_id, question_id=question_id
+    )
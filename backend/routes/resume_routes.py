@@ -5,10 +5,17 @@ Handles resume building, analysis, and export
 
 from flask import Blueprint, request, jsonify
 from datetime import datetime
+import uuid
 
+from config import Config
 from routes.auth_routes import require_auth
-from database.firebase_config import get_firestore_client, RESUMES_COLLECTION
+from utils.admission import admission_control
+from services.idempotency_service import idempotent
+from routes.upload_routes import upload_error_response
 from models.resume import Resume
+from services.write_behind_service import get_write_buffer
+from services.upload_service import UploadError, open_upload
+from utils.document_text import extract_document_text
 
 resume_bp = Blueprint('resume', __name__)
 
@@ -33,26 +40,23 @@ def build_resume():
         }
         
         # Create resume
-        resume = Resume(
+        resume = Resume.create(
             user_id=request.user_id,
-            content=content
+            content=content,
+            resume_type='built'
         )
         
-        # Save to Firestore
-        db = get_firestore_client()
-        if db is None:
+        if not resume:
             return jsonify({
                 'success': False,
-                'message': 'Database not available'
-            }), 503
-        
-        db.collection(RESUMES_COLLECTION).document(resume.resume_id).set(resume.to_dict())
+                'message': 'Failed to create resume'
+            }), 500
         
         return jsonify({
             'success': True,
             'message': 'Resume created successfully',
             'data': {
-                'resume_id': resume.resume_id,
+                'resume_id': resume['id'],
                 'content': content
             }
         }), 201
@@ -66,6 +70,8 @@ def build_resume():
 
 @resume_bp.route('/analyze', methods=['POST'])
 @require_auth
+@idempotent
+@admission_control('resume')
 def analyze_resume():
     """
     Analyze uploaded resume
@@ -74,25 +80,44 @@ def analyze_resume():
     try:
         data = request.get_json()
         
-        resume_text = data.get('resume_text', '').strip()
+        resume_text = (data.get('resume_text') or '').strip()
         job_role = data.get('job_role', 'Software Engineer')
+        upload_id = data.get('upload_id')
+        file_url = None
+        
+        if not resume_text and upload_id:
+            # Completed chunked upload: extract the text from the stored file
+            try:
+                upload = open_upload(upload_id, request.user_id, 'resume')
+                resume_text = extract_document_text(
+                    upload['path'], upload['filename'], Config.RESUME_TEXT_MAX_CHARS
+                ).strip()
+            except UploadError as e:
+                return upload_error_response(e)
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'message': str(e)
+                }), 400
+            file_url = f"upload:{upload_id}"
         
         if not resume_text:
             return jsonify({
                 'success': False,
-                'message': 'resume_text is required'
+                'message': 'resume_text or upload_id is required'
             }), 400
         
         # Perform basic analysis (simplified version)
         # In production, this would use advanced NLP and ATS compatibility checks
         
-        from ml_models.nlp_processor import (
-            count_words, count_sentences, extract_keywords, detect_grammar_errors_simple
-        )
+        from ml_models.nlp_processor import extract_keywords, detect_grammar_errors_simple
+        from ml_models.evaluation_budget import EvaluationBudget
         
-        word_count = count_words(resume_text)
-        sentence_count = count_sentences(resume_text)
-        keywords = extract_keywords(resume_text, top_n=15)
+        # An oversized resume is counted and keyword-matched on a representative sample
+        budget = EvaluationBudget.for_request('resume')
+        word_count = budget.word_count(resume_text)
+        sentence_count = budget.sentence_count(resume_text)
+        keywords = extract_keywords(budget.sample(resume_text, 'keywords'), top_n=15)
         grammar_errors = detect_grammar_errors_simple(resume_text)
         
         # Calculate scores
@@ -139,38 +164,46 @@ def analyze_resume():
             'grammar_errors': grammar_errors
         }
         
-        # Create resume object
-        resume = Resume(
-            user_id=request.user_id,
-            content={'text': resume_text, 'job_role': job_role},
-            analysis=analysis
-        )
-        
         # Calculate overall score
-        overall_score = resume.calculate_score()
+        overall_score = Resume.calculate_score(analysis)
         
         # Generate suggestions
         suggestions = generate_resume_suggestions(analysis, job_role)
-        resume.suggestions = suggestions
         
-        # Save to Firestore
-        db = get_firestore_client()
-        if db is None:
-            return jsonify({
-                'success': False,
-                'message': 'Database not available'
-            }), 503
+        record = Resume.build_record(
+            request.user_id,
+            content={'text': resume_text, 'job_role': job_role},
+            analysis=analysis,
+            score=overall_score,
+            suggestions=suggestions,
+            file_url=file_url,
+            parsed_text=resume_text,
+            target_job_role=job_role,
+            resume_id=str(uuid.uuid4())
+        )
+        
+        buffer = get_write_buffer()
+        if buffer is not None:
+            # Persist in the next bulk flush
+            buffer.submit('resume', record)
+        else:
+            Resume.bulk_insert([record])
         
-        db.collection(RESUMES_COLLECTION).document(resume.resume_id).set(resume.to_dict())
+        # Keep the raw features so the score can be recomputed when weights change
+        from ml_models.score_features import resume_features
+        from services.rescoring_service import record_features
+        record_features('resume', record['id'], request.user_id, resume_features(analysis), overall_score)
         
         return jsonify({
             'success': True,
             'message': 'Resume analyzed successfully',
             'data': {
-                'resume_id': resume.resume_id,
+                'resume_id': record['id'],
                 'overall_score': overall_score,
                 'analysis': analysis,
-                'suggestions': suggestions
+                'suggestions': suggestions,
+                'partial': budget.partial,
+                'degraded': budget.degraded
             }
         }), 200
         
@@ -261,24 +294,15 @@ def get_resume_feedback(resume_id):
     Get detailed resume feedback and suggestions
     """
     try:
-        db = get_firestore_client()
-        if db is None:
-            return jsonify({
-                'success': False,
-                'message': 'Database not available'
-            }), 503
+        # Get resume (feedback columns only, no content/parsed_text)
+        resume_data = Resume.get_by_id(resume_id, columns=Resume.FEEDBACK_COLUMNS)
         
-        # Get resume
-        resume_doc = db.collection(RESUMES_COLLECTION).document(resume_id).get()
-        
-        if not resume_doc.exists:
+        if not resume_data:
             return jsonify({
                 'success': False,
                 'message': 'Resume not found'
             }), 404
         
-        resume_data = resume_doc.to_dict()
-        
         # Verify ownership
         if resume_data['user_id'] != request.user_id:
             return jsonify({
@@ -290,10 +314,10 @@ def get_resume_feedback(resume_id):
             'success': True,
             'data': {
                 'resume_id': resume_id,
-                'score': resume_data.get('score', 0),
-                'analysis': resume_data.get('analysis', {}),
-                'suggestions': resume_data.get('suggestions', []),
-                'timestamp': resume_data.get('timestamp')
+                'score': resume_data.get('overall_score') or 0,
+                'analysis': resume_data.get('analysis') or {},
+                'suggestions': resume_data.get('suggestions') or [],
+                'timestamp': resume_data.get('created_at')
             }
         }), 200
         
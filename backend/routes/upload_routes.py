@@ -0,0 +1,143 @@
+"""
+Upload Routes
+Chunked, resumable file uploads (audio recordings and resumes)
+
+    POST   /api/uploads                 start: {"kind", "filename", "size", "content_type"?, "sha256"?}
+    PATCH  /api/uploads/<upload_id>     append the raw request body at the Upload-Offset header
+    GET    /api/uploads/<upload_id>     status; "offset" is where to resume
+    DELETE /api/uploads/<upload_id>     abort
+
+Chunk bodies are streamed straight to disk (services/upload_service.py), so
+a chunk is never parsed or buffered in memory. Completed uploads are handed
+to the analyzers by id (audio_upload_id on /api/fluency/analyze, upload_id on
+/api/resume/analyze).
+"""
+
+from flask import Blueprint, request, jsonify
+
+from config import Config
+from routes.auth_routes import require_auth
+from services.upload_service import UploadError, create_upload, get_upload, append_chunk, delete_upload
+
+upload_bp = Blueprint('upload', __name__)
+
+def upload_error_response(error: UploadError):
+    """JSON error for an UploadError, with the resume offset when known"""
+    body = {'success': False, 'message': str(error)}
+    if error.offset is not None:
+        body['offset'] = error.offset
+    response = jsonify(body)
+    if error.offset is not None:
+        response.headers['Upload-Offset'] = str(error.offset)
+    return response, error.status
+
+def _status_response(status: dict, code: int = 200):
+    response = jsonify({'success': True, 'data': status})
+    response.headers['Upload-Offset'] = str(status['offset'])
+    return response, code
+
+@upload_bp.route('', methods=['POST'])
+@require_auth
+def start_upload():
+    """
+    Start a chunked upload
+    """
+    try:
+        data = request.get_json() or {}
+
+        status = create_upload(
+            request.user_id,
+            kind=data.get('kind'),
+            filename=data.get('filename'),
+            size=data.get('size'),
+            content_type=data.get('content_type'),
+            sha256=data.get('sha256')
+        )
+        status['chunk_size'] = Config.UPLOAD_CHUNK_BYTES
+
+        return _status_response(status, 201)
+
+    except UploadError as e:
+        return upload_error_response(e)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Failed to start upload',
+            'error': str(e)
+        }), 500
+
+@upload_bp.route('/<upload_id>', methods=['PATCH'])
+@require_auth
+def upload_chunk(upload_id):
+    """
+    Append a chunk (raw body) at the Upload-Offset header
+    On a 409, resume from the returned offset
+    """
+    try:
+        offset = request.headers.get('Upload-Offset', type=int)
+        length = request.content_length
+
+        if offset is None:
+            return jsonify({
+                'success': False,
+                'message': 'Upload-Offset header is required'
+            }), 400
+
+        if length is None:
+            return jsonify({
+                'success': False,
+                'message': 'Content-Length is required'
+            }), 411
+
+        status = append_chunk(upload_id, request.user_id, offset, request.stream, length)
+        return _status_response(status)
+
+    except UploadError as e:
+        return upload_error_response(e)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Failed to store chunk',
+            'error': str(e)
+        }), 500
+
+@upload_bp.route('/<upload_id>', methods=['GET'])
+@require_auth
+def upload_status(upload_id):
+    """
+    Get upload progress (the offset to resume from)
+    """
+    try:
+        return _status_response(get_upload(upload_id, request.user_id))
+
+    except UploadError as e:
+        return upload_error_response(e)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Failed to get upload',
+            'error': str(e)
+        }), 500
+
+@upload_bp.route('/<upload_id>', methods=['DELETE'])
+@require_auth
+def abort_upload(upload_id):
+    """
+    Abort an upload
+    """
+    try:
+        delete_upload(upload_id, request.user_id)
+
+        return jsonify({
+            'success': True,
+            'message': 'Upload deleted'
+        }), 200
+
+    except UploadError as e:
+        return upload_error_response(e)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Failed to delete upload',
+            'error': str(e)
+        }), 500
@@ -0,0 +1,329 @@
+"""
+Voice Stream Routes
+Live fluency metrics over a WebSocket while a voice answer is spoken
+
+WebSocket /api/interview/voice-stream (needs flask-sock; skipped otherwise)
+
+Client -> server (JSON text frames):
+    {"type": "start", "token": "<access token>", "session_id": "...",
+     "question_id": "...", "question": "..."}
+    {"type": "chunk", "text": "<new transcript text>", "t": <seconds since the answer started>}
+    {"type": "end", "audio_duration": <seconds, optional>}
+
+Server -> client:
+    {"type": "ready", "question_id": "..."}
+    {"type": "metrics", ...}                 after every chunk (FluencyStream snapshot)
+    {"type": "alert", "kind": "filler" | "pause" | "pace", "message": "...", ...}
+    {"type": "result", "evaluation": {...}, "fluency": {...}}
+    {"type": "error", "message": "..."}
+
+The answer is evaluated and persisted like /voice-answer when the client
+sends "end", and also when the connection drops or goes idle after some text
+was received. Browsers can't set headers on WebSockets, so the token comes
+in the first message.
+
+Each connection holds a worker thread for its lifetime: run gunicorn with
+GUNICORN_THREADS > 1 (a sync worker would be killed after GUNICORN_TIMEOUT).
+"""
+
+import importlib.util
+import json
+import time
+import uuid
+from datetime import datetime
+
+from flask import request
+
+from config import Config
+from database.supabase_config import get_supabase_client
+from models.interview_session import InterviewSession
+from routes.auth_routes import verify_token
+from utils.metrics import stage_timer
+
+VOICE_STREAM_PATH = '/api/interview/voice-stream'
+
+# flask-sock (and its websocket stack) is imported on the first connection,
+# so it stays off the boot path; set together with _websocket_view
+ConnectionClosed = None
+_websocket_view = None
+
+# Close codes (RFC 6455)
+POLICY_VIOLATION = 1008
+INTERNAL_ERROR = 1011
+
+# Speaking pace limits used by calculate_fluency_score
+SLOW_WPM = 80
+FAST_WPM = 180
+
+# Seconds of speech before pace alerts, so the first words don't trigger them
+PACE_ALERT_AFTER_SECONDS = 5
+
+_CHUNK_STAGE = stage_timer('voice_stream', 'chunk')
+
+class _Disconnected(Exception):
+    pass
+
+def _send(ws, message: dict):
+    try:
+        ws.send(json.dumps(message))
+    except ConnectionClosed:
+        raise _Disconnected()
+
+def _receive(ws, timeout: float):
+    """Next JSON message, None on timeout; raises _Disconnected when the client is gone"""
+    try:
+        raw = ws.receive(timeout=timeout)
+    except ConnectionClosed:
+        raise _Disconnected()
+    if raw is None:
+        return None
+    try:
+        message = json.loads(raw)
+    except (TypeError, ValueError):
+        return {}
+    return message if isinstance(message, dict) else {}
+
+def _seconds(value):
+    """A finite, non-negative number of seconds as float, else None (JSON allows NaN, and bools are ints)"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    value = float(value)
+    return value if 0 <= value < float('inf') else None
+
+def _reject(ws, message: str, code: int = POLICY_VIOLATION):
+    _send(ws, {'type': 'error', 'message': message})
+    ws.close(reason=code, message=message)
+
+def _authorize(ws, start: dict):
+    """Validate the start message; returns the session (owner and role) or None after rejecting"""
+    if not start or start.get('type') != 'start':
+        _reject(ws, 'First message must be {"type": "start", ...}')
+        return None
+
+    required = ('token', 'session_id', 'question_id', 'question')
+    if not all(isinstance(start.get(field), str) and start[field] for field in required):
+        _reject(ws, 'token, session_id, question_id, and question are required strings')
+        return None
+
+    supabase = get_supabase_client()
+    if supabase is None:
+        _reject(ws, 'Database not available', INTERNAL_ERROR)
+        return None
+
+    try:
+        user = verify_token(supabase, start['token'])
+    except Exception as e:
+        _reject(ws, f'Authentication failed: {str(e)}')
+        return None
+    if not user:
+        _reject(ws, 'Invalid token')
+        return None
+
+    session = InterviewSession.get_owner_and_role(start['session_id'])
+    if not session:
+        _reject(ws, 'Interview session not found')
+        return None
+    if session['user_id'] != user.id:
+        _reject(ws, 'Unauthorized access to session')
+        return None
+
+    # persist_answer reads the user from the request, as with require_auth
+    request.user_id = user.id
+    request.user_email = user.email
+    return session
+
+def _alerts(previous: dict, current: dict, pace: dict) -> list:
+    """Alerts for what changed with the latest chunk"""
+    alerts = []
+
+    new_fillers = [
+        word for word, count in current['filler_words'].items()
+        if count > previous['filler_words'].get(word, 0)
+    ]
+    if new_fillers:
+        alerts.append({
+            'type': 'alert', 'kind': 'filler', 'words': new_fillers, 'filler_count': current['filler_count'],
+            'message': f"Filler words: {', '.join(repr(word) for word in new_fillers)}"
+        })
+
+    if current['pause_count'] > previous['pause_count']:
+        alerts.append({
+            'type': 'alert', 'kind': 'pause', 'pause_count': current['pause_count'],
+            'message': 'Pause detected. Try to keep a steady flow between thoughts.'
+        })
+
+    # Pace alerts only when the state changes, not on every chunk
+    if current['elapsed_seconds'] >= PACE_ALERT_AFTER_SECONDS:
+        wpm = current['rolling_wpm']
+        state = 'slow' if wpm < SLOW_WPM else ('fast' if wpm > FAST_WPM else 'ok')
+        if state != pace['state']:
+            pace['state'] = state
+            if state != 'ok':
+                alerts.append({
+                    'type': 'alert', 'kind': 'pace', 'pace': state, 'wpm': wpm,
+                    'message': f"You're speaking too {state} ({wpm} WPM). Aim for 120-150 WPM."
+                })
+
+    return alerts
+
+def _finish(session_id: str, question_id: str, question: str, session: dict, transcript: str,
+            stream, audio_duration: float) -> dict:
+    """Evaluate and persist the answer, as /voice-answer does"""
+    from services.ai_interview_service import evaluate_interview_answer_with_features
+    from ml_models.evaluation_budget import EvaluationBudget
+    from routes.interview_routes import persist_answer
+
+    fluency = stream.close(audio_duration)
+    evaluation, features = evaluate_interview_answer_with_features(
+        question=question,
+        answer=transcript,
+        job_role=session['job_role'],
+        skill_level=session['skill_level'],
+        budget=EvaluationBudget.for_request('interview')
+    )
+
+    answer_record = {
+        'id': uuid.uuid4().hex,
+        'question_id': question_id,
+        'question': question,
+        'answer': transcript,
+        'is_voice': True,
+        'audio_duration': audio_duration,
+        'evaluation': evaluation,
+        'fluency': {
+            'fluency_score': fluency['fluency_score'],
+            'wpm': fluency['wpm'],
+            'filler_count': fluency['filler_words']['total_count'],
+            'pause_count': fluency['pauses']['count']
+        },
+        'timestamp': datetime.now().isoformat()
+    }
+
+    persisted = persist_answer(session_id, question_id, answer_record, evaluation, features)
+    return {'type': 'result', 'persisted': persisted, 'evaluation': evaluation, 'fluency': fluency}
+
+def voice_stream(ws):
+    """One voice answer: start, transcript chunks, end"""
+    from ml_models.fluency_stream import FluencyStream
+
+    idle_timeout = Config.VOICE_STREAM_IDLE_TIMEOUT_S
+
+    try:
+        start = _receive(ws, idle_timeout)
+        session = _authorize(ws, start)
+    except _Disconnected:
+        return
+    if session is None:
+        return
+
+    session_id, question_id, question = start['session_id'], start['question_id'], start['question']
+    stream = FluencyStream()
+    chunks = []
+    received = 0
+    audio_duration = 0.0
+    pace = {'state': 'ok'}
+    connected = True
+    deadline = time.monotonic() + Config.VOICE_STREAM_MAX_SECONDS
+
+    try:
+        _send(ws, {'type': 'ready', 'question_id': question_id})
+        while time.monotonic() < deadline:
+            message = _receive(ws, idle_timeout)
+            if message is None:
+                _send(ws, {'type': 'error', 'message': 'Idle timeout'})
+                break
+
+            # Malformed frames get an error reply; the answer carries on
+            kind = message.get('type')
+            if kind == 'end':
+                duration = message.get('audio_duration')
+                if duration is not None and _seconds(duration) is None:
+                    _send(ws, {'type': 'error', 'message': 'audio_duration must be a non-negative number'})
+                    continue
+                audio_duration = _seconds(duration) or audio_duration
+                break
+            if kind != 'chunk':
+                _send(ws, {'type': 'error', 'message': f'Unknown message type: {kind}'})
+                continue
+
+            text = message.get('text')
+            if text is None:
+                text = ''
+            elapsed = message.get('t')
+            if not isinstance(text, str):
+                _send(ws, {'type': 'error', 'message': 'text must be a string'})
+                continue
+            if elapsed is not None and _seconds(elapsed) is None:
+                _send(ws, {'type': 'error', 'message': 't must be a non-negative number'})
+                continue
+
+            received += len(text)
+            if received > Config.VOICE_STREAM_MAX_CHARS:
+                _send(ws, {'type': 'error', 'message': 'Transcript too long'})
+                break
+
+            with _CHUNK_STAGE.time():
+                if elapsed is not None:
+                    audio_duration = max(audio_duration, _seconds(elapsed))
+                previous = stream.snapshot()
+                chunks.append(text)
+                current = stream.feed(text, elapsed_seconds=audio_duration if elapsed is not None else None)
+                _send(ws, {'type': 'metrics', **current})
+                for alert in _alerts(previous, current, pace):
+                    _send(ws, alert)
+    except _Disconnected:
+        connected = False
+
+    transcript = ''.join(chunks).strip()
+    try:
+        if not transcript:
+            if connected:
+                _reject(ws, 'transcript is empty')
+            return
+
+        try:
+            result = _finish(session_id, question_id, question, session, transcript, stream,
+                             audio_duration or stream.elapsed_seconds)
+        except Exception as e:
+            if connected:
+                _reject(ws, f'Failed to submit voice answer: {str(e)}', INTERNAL_ERROR)
+            return
+
+        if connected:
+            _send(ws, result)
+    except _Disconnected:
+        pass
+
+class _ViewCapture:
+    """Stands in for the blueprint Sock.route registers on, keeping the wrapped view"""
+
+    def __init__(self):
+        self.view = None
+
+    def route(self, path, **options):
+        def register(view):
+            self.view = view
+        return register
+
+def _voice_stream_route(*args, **kwargs):
+    """flask-sock's WebSocket view around voice_stream, built on the first connection"""
+    global ConnectionClosed, _websocket_view
+
+    if _websocket_view is None:
+        from flask_sock import Sock
+        from simple_websocket import ConnectionClosed as connection_closed
+
+        capture = _ViewCapture()
+        Sock().route(VOICE_STREAM_PATH, bp=capture)(voice_stream)
+        ConnectionClosed = connection_closed
+        _websocket_view = capture.view
+
+    return _websocket_view(*args, **kwargs)
+
+def init_app(app):
+    """Register the WebSocket route (no-op without flask-sock)"""
+    if importlib.util.find_spec('flask_sock') is None:
+        print("Voice streaming disabled, flask-sock not installed")
+        return
+
+    app.add_url_rule(VOICE_STREAM_PATH, 'voice_stream', _voice_stream_route, websocket=True)
@@ -5,24 +5,43 @@ Evaluates interview answers using NLP and ML techniques
 
 import json
 import os
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from ml_models.nlp_processor import (
     tokenize_text, remove_punctuation, extract_keywords,
     calculate_text_similarity, count_words, count_sentences,
     detect_grammar_errors_simple
 )
-from ml_models.sentiment_analyzer import analyze_sentiment, calculate_sentiment_score
+from ml_models.sentiment_analyzer import analyze_sentiment, sentiment_components
+from ml_models.lexicon_artifact import get_lexicon_artifact
+from ml_models.evaluation_budget import EvaluationBudget
 from config import Config
+from utils.metrics import stage_timer, cache_counters
+from utils.tracing import span, traced
 
 # Load job keywords
 KEYWORDS_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'job_keywords.json')
 _keywords_cache = None
+_keywords_hit, _keywords_miss = cache_counters('job_keywords')
+
+# Pre-bound stage histograms for evaluate_interview_answer
+_RELEVANCE_STAGE = stage_timer('interview', 'relevance')
+_GRAMMAR_STAGE = stage_timer('interview', 'grammar')
+_COMPLETENESS_STAGE = stage_timer('interview', 'completeness')
+_SENTIMENT_STAGE = stage_timer('interview', 'sentiment')
+_FEEDBACK_STAGE = stage_timer('interview', 'feedback')
 
 def load_job_keywords() -> Dict:
     """Load job keywords from JSON file"""
     global _keywords_cache
     
     if _keywords_cache is not None:
+        _keywords_hit.inc()
+        return _keywords_cache
+    
+    _keywords_miss.inc()
+    artifact = get_lexicon_artifact()
+    if artifact is not None:
+        _keywords_cache = artifact.job_keywords
         return _keywords_cache
     
     try:
@@ -33,6 +52,7 @@ def load_job_keywords() -> Dict:
         print(f"Error loading job keywords: {str(e)}")
         return {}
 
+@traced('evaluate_answer_relevance')
 def evaluate_answer_relevance(
     question: str,
     answer: str,
@@ -82,15 +102,24 @@ def evaluate_answer_relevance(
         'similarity_score': round(similarity_score * 100, 2),
         'keyword_score': round(keyword_score, 2),
         'matched_keywords': matched_keywords[:5],  # Top 5 matched keywords
-        'total_keyword_matches': keyword_matches
+        'total_keyword_matches': keyword_matches,
+        'answer_keyword_count': len(answer_keywords),
+        'raw_similarity': similarity_score
     }
 
-def evaluate_answer_grammar(answer: str) -> Dict:
+@traced('evaluate_answer_grammar')
+def evaluate_answer_grammar(
+    answer: str,
+    word_count: Optional[int] = None,
+    sentence_count: Optional[int] = None
+) -> Dict:
     """
     Evaluate grammar quality of the answer
     
     Args:
         answer: User's answer
+        word_count: Word count of the answer, if already known (skips tokenizing)
+        sentence_count: Sentence count of the answer, if already known
         
     Returns:
         dict: Grammar evaluation with score and errors
@@ -99,8 +128,10 @@ def evaluate_answer_grammar(answer: str) -> Dict:
     errors = detect_grammar_errors_simple(answer)
     
     # Count words and sentences
-    word_count = count_words(answer)
-    sentence_count = count_sentences(answer)
+    if word_count is None:
+        word_count = count_words(answer)
+    if sentence_count is None:
+        sentence_count = count_sentences(answer)
     
     # Calculate grammar score (0-100)
     # Start with 100 and deduct points for errors
@@ -123,19 +154,29 @@ def evaluate_answer_grammar(answer: str) -> Dict:
         'sentence_count': sentence_count
     }
 
-def evaluate_answer_completeness(answer: str, question: str) -> Dict:
+@traced('evaluate_answer_completeness')
+def evaluate_answer_completeness(
+    answer: str,
+    question: str,
+    word_count: Optional[int] = None,
+    sentence_count: Optional[int] = None
+) -> Dict:
     """
     Evaluate answer completeness and depth
     
     Args:
         answer: User's answer
         question: Original question
+        word_count: Word count of the answer, if already known (skips tokenizing)
+        sentence_count: Sentence count of the answer, if already known
         
     Returns:
         dict: Completeness evaluation
     """
-    word_count = count_words(answer)
-    sentence_count = count_sentences(answer)
+    if word_count is None:
+        word_count = count_words(answer)
+    if sentence_count is None:
+        sentence_count = count_sentences(answer)
     
     # Score based on answer length and structure
     base_score = 50
@@ -165,67 +206,208 @@ def evaluate_answer_completeness(answer: str, question: str) -> Dict:
         'is_adequate': word_count >= 20 and sentence_count >= 2
     }
 
+class AnswerContext:
+    """One answer being evaluated: its inputs, budget and the shared text features computed for it"""
+    
+    def __init__(self, question: str, answer: str, job_role: str, limits: EvaluationBudget):
+        self.question = question
+        self.answer = answer
+        self.job_role = job_role
+        self.limits = limits
+        self.features = {}
+
+def _relevance_stage(context: AnswerContext) -> Dict:
+    return evaluate_answer_relevance(
+        context.question, context.limits.sample(context.answer, 'relevance'), context.job_role
+    )
+
+def _grammar_stage(context: AnswerContext) -> Dict:
+    return evaluate_answer_grammar(
+        context.answer, context.features['word_count'], context.features['sentence_count']
+    )
+
+def _completeness_stage(context: AnswerContext) -> Dict:
+    return evaluate_answer_completeness(
+        context.answer, context.question, context.features['word_count'], context.features['sentence_count']
+    )
+
+def _sentiment_stage(context: AnswerContext) -> Dict:
+    with span('calculate_sentiment_score'):
+        # Past the deadline, score sentiment as neutral (an empty answer's)
+        limits = context.limits
+        text = limits.sample(context.answer, 'sentiment') if limits.allow('sentiment') else ''
+        return sentiment_components(text)
+
+# Text features shared by several stages, each computed at most once per answer
+ANSWER_FEATURES = {
+    'word_count': lambda context: context.limits.word_count(context.answer),
+    'sentence_count': lambda context: context.limits.sentence_count(context.answer)
+}
+
+# Scoring dimensions (keys of Config.INTERVIEW_WEIGHTS), in evaluation order:
+# dimension -> (shared features it reads, stage function, stage timer)
+# Each stage returns a dict with the dimension's 0-100 'score'
+DIMENSIONS = {
+    'relevance': ((), _relevance_stage, _RELEVANCE_STAGE),
+    'grammar': (('word_count', 'sentence_count'), _grammar_stage, _GRAMMAR_STAGE),
+    'completeness': (('word_count', 'sentence_count'), _completeness_stage, _COMPLETENESS_STAGE),
+    'sentiment': ((), _sentiment_stage, _SENTIMENT_STAGE)
+}
+
+# Stage outputs kept only as re-scoring features
+FEATURE_ONLY_FIELDS = ('raw_similarity', 'answer_keyword_count')
+
+def parse_dimensions(value: Optional[str]) -> Optional[List[str]]:
+    """
+    Dimensions from a comma-separated list (e.g. 'relevance,completeness')
+    
+    Returns:
+        list: Dimensions in evaluation order, or None (all) for an empty value
+        
+    Raises:
+        ValueError: An unknown dimension
+    """
+    if not value or not value.strip():
+        return None
+    
+    requested = {name.strip().lower() for name in value.split(',') if name.strip()}
+    unknown = requested - DIMENSIONS.keys()
+    if unknown:
+        raise ValueError(
+            f"Unknown dimensions: {', '.join(sorted(unknown))} (available: {', '.join(DIMENSIONS)})"
+        )
+    return [name for name in DIMENSIONS if name in requested]
+
 def evaluate_interview_answer(
     question: str,
     answer: str,
     job_role: str,
-    skill_level: str = 'Beginner'
+    skill_level: str = 'Beginner',
+    budget: Optional[EvaluationBudget] = None,
+    dimensions: Optional[List[str]] = None
 ) -> Dict:
+    """Evaluation of an interview answer (see evaluate_interview_answer_with_features)"""
+    return evaluate_interview_answer_with_features(question, answer, job_role, skill_level, budget, dimensions)[0]
+
+@traced('evaluate_interview_answer')
+def evaluate_interview_answer_with_features(
+    question: str,
+    answer: str,
+    job_role: str,
+    skill_level: str = 'Beginner',
+    budget: Optional[EvaluationBudget] = None,
+    dimensions: Optional[List[str]] = None
+) -> Tuple[Dict, Dict]:
     """
     Complete evaluation of an interview answer
     Uses NLP and ML to score multiple dimensions
     
+    Runs the stage of each selected dimension, after computing the shared
+    features those stages read; stages and features nothing selected needs
+    are skipped.
+    
     Args:
         question: Interview question
         answer: User's answer
         job_role: Job role
         skill_level: Skill level
+        budget: Time and size limits (None evaluates the whole answer, however long)
+        dimensions: Dimensions to score (None scores all; see parse_dimensions)
         
     Returns:
-        dict: Complete evaluation with scores and feedback
+        tuple: (evaluation, features)
+            evaluation: Scores and feedback, as stored and returned to the
+                client; only the selected dimensions' results are included,
+                and overall_score is their weighted average ('partial' and
+                'degraded' when a budget is given)
+            features: Raw NLP outputs (INTERVIEW_FEATURES) for re-scoring,
+                complete only when every dimension was scored
     """
     # Get evaluation weights from config
     weights = Config.INTERVIEW_WEIGHTS
+    selected = list(DIMENSIONS) if dimensions is None else [name for name in DIMENSIONS if name in dimensions]
+    if not selected:
+        raise ValueError("At least one dimension must be selected")
+    
+    context = AnswerContext(question, answer, job_role, budget or EvaluationBudget('interview'))
+    
+    # Shared features of the selected stages (word and sentence counts are
+    # tokenized once for grammar and completeness)
+    needed = {feature for name in selected for feature in DIMENSIONS[name][0]}
+    for feature, compute in ANSWER_FEATURES.items():
+        if feature in needed:
+            context.features[feature] = compute(context)
     
     # Evaluate different aspects
-    relevance = evaluate_answer_relevance(question, answer, job_role)
-    grammar = evaluate_answer_grammar(answer)
-    completeness = evaluate_answer_completeness(answer, question)
-    sentiment = calculate_sentiment_score(answer)
-    
-    # Calculate overall score (weighted average)
-    overall_score = (
-        relevance['score'] * weights['relevance'] +
-        grammar['score'] * weights['grammar'] +
-        completeness['score'] * weights['completeness'] +
-        sentiment * weights['sentiment']
-    )
+    results = {}
+    for name in selected:
+        _, stage, timer = DIMENSIONS[name]
+        with timer.time():
+            results[name] = stage(context)
+    
+    # Calculate overall score (weighted average, over the selected dimensions)
+    overall_score = sum(results[name]['score'] * weights[name] for name in selected)
+    if len(selected) < len(DIMENSIONS):
+        overall_score /= sum(weights[name] for name in selected)
+    
+    relevance = results.get('relevance')
+    grammar = results.get('grammar')
+    completeness = results.get('completeness')
+    sentiment = results['sentiment']['score'] if 'sentiment' in results else None
     
     # Generate feedback
-    feedback = generate_answer_feedback(
-        relevance, grammar, completeness, sentiment, overall_score
-    )
-    
-    return {
-        'overall_score': round(overall_score, 2),
-        'relevance': relevance,
-        'grammar': grammar,
-        'completeness': completeness,
-        'sentiment_score': sentiment,
+    with _FEEDBACK_STAGE.time():
+        feedback = generate_answer_feedback(
+            relevance, grammar, completeness, sentiment, overall_score
+        )
+    
+    # Raw NLP outputs (INTERVIEW_FEATURES) for re-scoring with new weights
+    features = {}
+    if relevance is not None:
+        features.update({
+            'similarity': relevance['raw_similarity'],
+            'keyword_matches': relevance['total_keyword_matches'],
+            'answer_keywords': relevance['answer_keyword_count']
+        })
+    if grammar is not None:
+        features['grammar_errors'] = grammar['error_count']
+    if 'word_count' in context.features:
+        features['word_count'] = context.features['word_count']
+        features['sentence_count'] = context.features['sentence_count']
+    if sentiment is not None:
+        features['sentiment_compound'] = results['sentiment']['compound']
+        features['confidence'] = results['sentiment']['confidence']
+    
+    # Features stay out of the evaluation, which is stored in the answer and returned
+    evaluation = {'overall_score': round(overall_score, 2)}
+    for name in ('relevance', 'grammar', 'completeness'):
+        if name in results:
+            evaluation[name] = {
+                key: value for key, value in results[name].items() if key not in FEATURE_ONLY_FIELDS
+            }
+    if sentiment is not None:
+        evaluation['sentiment_score'] = sentiment
+    evaluation.update({
         'feedback': feedback,
         'question': question,
         'answer_preview': answer[:100] + '...' if len(answer) > 100 else answer
-    }
+    })
+    
+    if budget is not None:
+        evaluation.update(budget.report())
+    
+    return evaluation, features
 
 def generate_answer_feedback(
-    relevance: Dict,
-    grammar: Dict,
-    completeness: Dict,
-    sentiment_score: float,
+    relevance: Optional[Dict],
+    grammar: Optional[Dict],
+    completeness: Optional[Dict],
+    sentiment_score: Optional[float],
     overall_score: float
 ) -> List[str]:
     """
     Generate specific feedback based on evaluation
+    (dimensions that were not scored are None and get no feedback)
     
     Returns:
         list: List of feedback strings
@@ -243,26 +425,29 @@ def generate_answer_feedback(
         feedback.append("Your answer needs more development and clarity.")
     
     # Relevance feedback
-    if relevance['score'] < 60:
-        feedback.append("Try to address the question more directly and use relevant technical terms.")
-    elif relevance['matched_keywords']:
-        feedback.append(f"Good use of relevant keywords: {', '.join(relevance['matched_keywords'][:3])}")
+    if relevance is not None:
+        if relevance['score'] < 60:
+            feedback.append("Try to address the question more directly and use relevant technical terms.")
+        elif relevance['matched_keywords']:
+            feedback.append(f"Good use of relevant keywords: {', '.join(relevance['matched_keywords'][:3])}")
     
     # Grammar feedback
-    if grammar['error_count'] > 0:
+    if grammar is not None and grammar['error_count'] > 0:
         feedback.append(f"Watch out for grammar issues. Found {grammar['error_count']} potential errors.")
     
     # Completeness feedback
-    if completeness['word_count'] < 20:
-        feedback.append("Your answer is too brief. Provide more details and examples.")
-    elif completeness['word_count'] > 200:
-        feedback.append("Good detailed answer! Make sure to stay focused on the key points.")
+    if completeness is not None:
+        if completeness['word_count'] < 20:
+            feedback.append("Your answer is too brief. Provide more details and examples.")
+        elif completeness['word_count'] > 200:
+            feedback.append("Good detailed answer! Make sure to stay focused on the key points.")
     
     # Confidence feedback (from sentiment)
-    if sentiment_score < 50:
-        feedback.append("Show more confidence in your responses. Use assertive language.")
-    elif sentiment_score >= 75:
-        feedback.append("Great confidence level in your answer!")
+    if sentiment_score is not None:
+        if sentiment_score < 50:
+            feedback.append("Show more confidence in your responses. Use assertive language.")
+        elif sentiment_score >= 75:
+            feedback.append("Great confidence level in your answer!")
     
     # Positive reinforcement
     if overall_score >= 75:
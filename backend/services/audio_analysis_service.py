@@ -0,0 +1,138 @@
+"""
+Audio Analysis Service
+Runs audio feature extraction on a bounded process pool, off the request threads
+
+Decoding and the NumPy passes are CPU-bound and would hold the GIL inside a
+threaded gunicorn worker, so each recording is analyzed in a separate
+process. At most AUDIO_WORKERS recordings are analyzed at once per gunicorn
+worker, plus as many waiting; further uploads are turned away (AudioAnalysisBusy)
+instead of queueing without bound. AUDIO_WORKERS=0 analyzes inline.
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Union
+
+from config import Config
+from ml_models.audio_features import AudioDecodeError, extract_audio_features
+from utils.metrics import stage_timer
+
+# Global pool instance (per process; reset in forked children)
+_pool = None
+_pool_lock = threading.Lock()
+_slots = None
+
+# Formats pydub can name from common upload MIME types
+MIME_FORMATS = {
+    'audio/wav': 'wav',
+    'audio/x-wav': 'wav',
+    'audio/wave': 'wav',
+    'audio/webm': 'webm',
+    'audio/ogg': 'ogg',
+    'audio/mpeg': 'mp3',
+    'audio/mp3': 'mp3',
+    'audio/mp4': 'mp4',
+    'audio/x-m4a': 'mp4',
+    'audio/flac': 'flac'
+}
+
+_ANALYZE_STAGE = stage_timer('audio', 'analyze')
+
+class AudioAnalysisBusy(Exception):
+    """Every analysis slot is taken, or the analysis timed out"""
+    pass
+
+def audio_format_for(filename: Optional[str], mimetype: Optional[str]) -> Optional[str]:
+    """pydub format of an upload from its MIME type or extension (None lets ffmpeg probe)"""
+    if mimetype:
+        audio_format = MIME_FORMATS.get(mimetype.split(';')[0].strip().lower())
+        if audio_format:
+            return audio_format
+    if filename and '.' in filename:
+        extension = filename.rsplit('.', 1)[1].lower()
+        return 'mp4' if extension == 'm4a' else extension
+    return None
+
+def _reset_after_fork():
+    # A forked gunicorn worker must not reuse the master's pool or lock
+    global _pool, _pool_lock, _slots
+    _pool = None
+    _pool_lock = threading.Lock()
+    _slots = None
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+def _shutdown_pool():
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+
+def get_audio_pool() -> Optional[ProcessPoolExecutor]:
+    """Get the process-wide audio worker pool (None when analysis runs inline)"""
+    global _pool, _slots
+
+    if Config.AUDIO_WORKERS <= 0:
+        return None
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _slots = threading.BoundedSemaphore(Config.AUDIO_WORKERS * 2)
+                # spawn: forking a process with request threads running can deadlock
+                _pool = ProcessPoolExecutor(
+                    max_workers=Config.AUDIO_WORKERS,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                atexit.register(_shutdown_pool)
+
+    return _pool
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next upload starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def analyze_audio(data: Union[bytes, str], audio_format: Optional[str] = None) -> Dict:
+    """
+    Extract audio features from an uploaded recording
+
+    Args:
+        data: Encoded audio, or the path of a stored upload (the worker reads it from disk)
+        audio_format: pydub format name (see audio_format_for)
+
+    Raises:
+        AudioDecodeError: Undecodable or too long (a client error)
+        AudioAnalysisBusy: No free slot, or the analysis took longer than AUDIO_ANALYSIS_TIMEOUT_S
+    """
+    size = len(data) if isinstance(data, bytes) else os.path.getsize(data)
+    if size > Config.AUDIO_MAX_BYTES:
+        raise AudioDecodeError(f"Audio is larger than {Config.AUDIO_MAX_BYTES} bytes")
+
+    pool = get_audio_pool()
+    if pool is None:
+        with _ANALYZE_STAGE.time():
+            return extract_audio_features(data, audio_format, Config.AUDIO_MAX_SECONDS)
+
+    slots = _slots
+    if not slots.acquire(blocking=False):
+        raise AudioAnalysisBusy("Audio analysis is busy, try again shortly")
+
+    try:
+        with _ANALYZE_STAGE.time():
+            future = pool.submit(extract_audio_features, data, audio_format, Config.AUDIO_MAX_SECONDS)
+            try:
+                return future.result(timeout=Config.AUDIO_ANALYSIS_TIMEOUT_S)
+            except FutureTimeoutError:
+                future.cancel()
+                raise AudioAnalysisBusy("Audio analysis timed out")
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        raise AudioAnalysisBusy("Audio worker crashed, try again")
+    finally:
+        slots.release()
@@ -0,0 +1,187 @@
+"""
+Idempotency Service
+Makes retried evaluation requests cheap and free of side effects
+
+Clients on flaky networks retry requests whose response they never got. Two
+decorators keep a retry from re-running the NLP pipeline and appending a
+duplicate answer:
+
+- idempotent: a request sent with an Idempotency-Key header claims the key
+  in the database before running; its response (anything but a 5xx) is
+  stored and replayed, with Idempotent-Replayed: true, to later requests
+  with the same key for IDEMPOTENCY_TTL_HOURS. The same key on a different
+  request is a 422; while the first request is still running, a repeat gets
+  409 with Retry-After. If the key store is unreachable the request runs
+  normally.
+- coalesce_answers: concurrent submissions of the same answer (same user,
+  session, question and answer text) in one worker process run once, and
+  every waiting request gets that one response.
+"""
+
+import hashlib
+import json
+from functools import wraps
+from typing import Dict
+
+from flask import current_app, jsonify, make_response, request
+
+from config import Config
+from models.idempotency_key import IdempotencyKey
+from utils.metrics import Counter
+from utils.singleflight import SingleFlight
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+# Upload bytes hashed per read when fingerprinting multipart requests
+HASH_BLOCK_BYTES = 64 * 1024
+
+IDEMPOTENT_REQUESTS = Counter(
+    'idempotent_requests_total', 'Requests with an Idempotency-Key by outcome '
+    '(executed, replayed, in_progress, mismatch, unavailable)', ('endpoint', 'outcome')
+)
+
+COALESCED_REQUESTS = Counter(
+    'coalesced_requests_total', 'Requests answered with the response of an identical one in flight', ('endpoint',)
+)
+
+_answers_in_flight = SingleFlight()
+
+def request_fingerprint() -> str:
+    """SHA-256 of the method, path, query and body (JSON compared by value, uploads by content)"""
+    digest = hashlib.sha256(f'{request.method} {request.full_path}\n'.encode('utf-8'))
+
+    if request.is_json:
+        digest.update(json.dumps(request.get_json(silent=True), sort_keys=True).encode('utf-8'))
+    else:
+        for name, value in sorted(request.form.items(multi=True)):
+            digest.update(f'{name}={value}\n'.encode('utf-8'))
+        for name, upload in sorted(request.files.items(multi=True), key=lambda item: item[0]):
+            digest.update(f'{name}:{upload.filename}\n'.encode('utf-8'))
+            for block in iter(lambda: upload.stream.read(HASH_BLOCK_BYTES), b''):
+                digest.update(block)
+            upload.stream.seek(0)
+
+    return digest.hexdigest()
+
+def _existing_key_response(claim: Dict, fingerprint: str):
+    """Response to a request whose key is already held"""
+    if claim['request_hash'] != fingerprint:
+        IDEMPOTENT_REQUESTS.labels(request.endpoint, 'mismatch').inc()
+        return jsonify({
+            'success': False,
+            'message': f'{IDEMPOTENCY_HEADER} was already used for a different request'
+        }), 422
+
+    if claim['status'] != 'completed':
+        IDEMPOTENT_REQUESTS.labels(request.endpoint, 'in_progress').inc()
+        response = jsonify({
+            'success': False,
+            'message': f'A request with this {IDEMPOTENCY_HEADER} is still in progress'
+        })
+        response.headers['Retry-After'] = '1'
+        return response, 409
+
+    IDEMPOTENT_REQUESTS.labels(request.endpoint, 'replayed').inc()
+    response = jsonify(claim['response_body'])
+    response.headers[REPLAYED_HEADER] = 'true'
+    return response, claim['response_status']
+
+def idempotent(f):
+    """
+    Decorator replaying the stored response of a repeated Idempotency-Key
+
+    Goes below require_auth (keys are scoped per user) and above
+    admission_control, so replays never wait for an evaluation slot
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return f(*args, **kwargs)
+
+        if len(key) > MAX_KEY_LENGTH:
+            return jsonify({
+                'success': False,
+                'message': f'{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters'
+            }), 400
+
+        key_id = f'{request.user_id}:{key}'
+        fingerprint = request_fingerprint()
+        try:
+            claim = IdempotencyKey.claim(
+                key_id, request.user_id, fingerprint,
+                int(Config.IDEMPOTENCY_TTL_HOURS * 3600), Config.IDEMPOTENCY_LOCK_SECONDS
+            )
+        except Exception as e:
+            print(f"Error claiming idempotency key: {str(e)}")
+            IDEMPOTENT_REQUESTS.labels(request.endpoint, 'unavailable').inc()
+            return f(*args, **kwargs)
+
+        if not claim['claimed']:
+            return _existing_key_response(claim, fingerprint)
+
+        IDEMPOTENT_REQUESTS.labels(request.endpoint, 'executed').inc()
+        try:
+            response = make_response(f(*args, **kwargs))
+        except BaseException:
+            _release(key_id)
+            raise
+
+        body = response.get_json(silent=True)
+        if response.status_code >= 500 or body is None:
+            # Not final: let a retry run the request again
+            _release(key_id)
+        else:
+            try:
+                IdempotencyKey.complete(key_id, response.status_code, body)
+            except Exception as e:
+                print(f"Error storing idempotent response: {str(e)}")
+
+        return response
+
+    return decorated_function
+
+def _release(key_id: str):
+    try:
+        IdempotencyKey.release(key_id)
+    except Exception as e:
+        print(f"Error releasing idempotency key: {str(e)}")
+
+def _captured_response(f, args, kwargs):
+    # A response object serves one request; waiters get copies
+    response = make_response(f(*args, **kwargs))
+    return response.get_data(), response.status_code, list(response.headers)
+
+def coalesce_answers(answer_field: str):
+    """
+    Decorator running concurrent identical answer submissions once
+
+    Identical means same user, endpoint, query string, session_id, question_id
+    and answer text (JSON field `answer_field`, compared by SHA-256). Goes
+    below idempotent and above admission_control, so waiters hold no
+    evaluation slot.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            data = request.get_json(silent=True) or {}
+            answer = data.get(answer_field)
+            if not isinstance(answer, str) or not answer.strip():
+                # Invalid request: the route answers it
+                return f(*args, **kwargs)
+
+            key = (
+                request.endpoint, request.query_string, request.user_id, data.get('session_id'),
+                data.get('question_id'), hashlib.sha256(answer.strip().encode('utf-8')).hexdigest()
+            )
+            (body, status, headers), shared = _answers_in_flight.do(key, _captured_response, f, args, kwargs)
+            if shared:
+                COALESCED_REQUESTS.labels(request.endpoint).inc()
+
+            return current_app.response_class(body, status=status, headers=headers)
+
+        return decorated_function
+
+    return decorator
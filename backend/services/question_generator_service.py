@@ -8,11 +8,14 @@ import random
 import os
 from typing import List, Dict
 
+from utils.metrics import cache_counters
+
 # Path to questions data file
 QUESTIONS_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'interview_questions.json')
 
 # Cache for questions
 _questions_cache = None
+_questions_hit, _questions_miss = cache_counters('interview_questions')
 
 def load_questions() -> Dict:
     """
@@ -24,8 +27,10 @@ def load_questions() -> Dict:
     global _questions_cache
     
     if _questions_cache is not None:
+        _questions_hit.inc()
         return _questions_cache
     
+    _questions_miss.inc()
     try:
         with open(QUESTIONS_FILE, 'r') as f:
             _questions_cache = json.load(f)
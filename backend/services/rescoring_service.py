@@ -0,0 +1,237 @@
+"""
+Rescoring Service
+Stores per-result feature vectors, and recomputes stored scores from them in bulk
+
+Every interview answer, fluency test and resume records the raw NLP outputs
+its score came from (ml_models/score_features.py). When the scoring weights
+change, the job below pages through those vectors in id order (keyset
+pagination), scores a whole page at once with NumPy and writes only the rows
+whose score changed, one RPC per page. The next page is fetched while the
+current one is scored and written, so the database and the CPU overlap.
+
+    python -m services.rescoring_service --kind interview_answer [--page-size 5000] [--dry-run]
+
+Calibrating weights against historic data is a dry run with candidate weights:
+
+    python -m services.rescoring_service --kind fluency_test --dry-run \
+        --weights '{"fluency": 0.5, "pronunciation": 0.2, "grammar": 0.3}'
+
+Re-running the job is safe: it writes the same values again, and rows that
+already carry the current score are skipped. Interview answers get their
+session's scores map (and overall_score, once completed) replaced; the
+evaluation stored inside each answer record is left as it was scored.
+"""
+
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ml_models.score_features import FEATURE_VERSION, LAYOUTS, SCORERS
+from models.score_feature import ScoreFeature
+from services.write_behind_service import get_write_buffer
+
+DEFAULT_PAGE_SIZE = 5000
+
+# Scores within this distance count as unchanged (stored scores have 2 decimals)
+SCORE_TOLERANCE = 0.005
+
+def record_features(kind: str, result_id: str, user_id: str, features: Dict, score: float,
+                    session_id: Optional[str] = None, question_id: Optional[str] = None):
+    """
+    Store the feature vector of a scored result (best effort)
+    Queued on the write-behind buffer when enabled, otherwise upserted directly;
+    a failure is logged and never fails the request that produced the score
+    """
+    try:
+        record = ScoreFeature.build_record(
+            kind, result_id, user_id, features, score,
+            session_id=session_id, question_id=question_id
+        )
+
+        buffer = get_write_buffer()
+        if buffer is not None:
+            buffer.submit('score_features', record)
+        else:
+            ScoreFeature.bulk_upsert([record])
+    except Exception as e:
+        print(f"Error recording score features for {kind} {result_id}: {str(e)}")
+
+def _interview_items(rows: List[Dict], scores: Dict[str, np.ndarray]) -> List[Dict]:
+    return [{
+        'feature_id': row['id'],
+        'session_id': row['session_id'],
+        'question_id': row['question_id'],
+        'score': {
+            'score': float(scores['overall'][index]),
+            'relevance': float(scores['relevance'][index]),
+            'grammar': float(scores['grammar'][index]),
+            'completeness': float(scores['completeness'][index]),
+            'sentiment': float(scores['sentiment'][index])
+        }
+    } for index, row in rows]
+
+def _fluency_items(rows: List[Dict], scores: Dict[str, np.ndarray]) -> List[Dict]:
+    return [{
+        'feature_id': row['id'],
+        'test_id': row['result_id'],
+        'fluency_score': float(scores['fluency'][index]),
+        'grammar_score': float(scores['grammar'][index]),
+        'overall_score': float(scores['overall'][index])
+    } for index, row in rows]
+
+def _resume_items(rows: List[Dict], scores: Dict[str, np.ndarray]) -> List[Dict]:
+    return [{
+        'feature_id': row['id'],
+        'resume_id': row['result_id'],
+        'grammar_score': float(scores['grammar'][index]),
+        'structure_score': float(scores['structure'][index]),
+        'ats_score': float(scores['ats'][index]),
+        'keyword_score': float(scores['keyword'][index]),
+        'overall_score': float(scores['overall'][index])
+    } for index, row in rows]
+
+_ITEM_BUILDERS = {
+    'interview_answer': _interview_items,
+    'fluency_test': _fluency_items,
+    'resume': _resume_items
+}
+
+def _writer(kind: str):
+    from models.interview_session import InterviewSession
+    from models.fluency_test import FluencyTest
+    from models.resume import Resume
+
+    return {
+        'interview_answer': InterviewSession.bulk_apply_rescores,
+        'fluency_test': FluencyTest.bulk_apply_rescores,
+        'resume': Resume.bulk_apply_rescores
+    }[kind]
+
+def score_page(kind: str, rows: List[Dict], weights: Optional[Dict] = None) -> Dict:
+    """
+    Score one page of feature rows
+
+    Returns:
+        dict: 'items' (RPC items for the changed rows), 'skipped' (other
+        feature versions), 'scores' (new overall scores) and 'deltas'
+        (|new - stored| of rows that had a score)
+    """
+    current = [row for row in rows if row['version'] == FEATURE_VERSION]
+    if not current:
+        return {'items': [], 'skipped': len(rows), 'scores': np.empty(0), 'deltas': np.empty(0)}
+
+    matrix = np.asarray([row['features'] for row in current], dtype=np.float64)
+    scores = SCORERS[kind](matrix, weights)
+
+    stored = np.array([np.nan if row['score'] is None else float(row['score']) for row in current])
+    deltas = np.abs(scores['overall'] - stored)
+    changed = np.isnan(stored) | (deltas > SCORE_TOLERANCE)
+
+    changed_rows = [(index, current[index]) for index in np.flatnonzero(changed)]
+    return {
+        'items': _ITEM_BUILDERS[kind](changed_rows, scores),
+        'skipped': len(rows) - len(current),
+        'scores': scores['overall'],
+        'deltas': deltas[~np.isnan(stored)]
+    }
+
+def rescore(kind: str, page_size: int = DEFAULT_PAGE_SIZE, dry_run: bool = False,
+            weights: Optional[Dict] = None) -> Dict:
+    """
+    Recompute the stored scores of every result of a kind
+
+    Args:
+        kind: 'interview_answer', 'fluency_test' or 'resume'
+        page_size: Rows per read (and at most per write)
+        dry_run: Score and report without writing
+        weights: Override the configured weights (defaults to the current ones)
+
+    Returns:
+        dict: rows, skipped, changed, mean_delta, max_delta, the new scores'
+        mean and percentiles, seconds, rows_per_second
+    """
+    if kind not in LAYOUTS:
+        raise ValueError(f"kind must be one of: {', '.join(LAYOUTS)}")
+
+    write = _writer(kind)
+    stats = {'kind': kind, 'rows': 0, 'skipped': 0, 'changed': 0}
+    delta_sum = 0.0
+    delta_count = 0
+    delta_max = 0.0
+    new_scores = []
+    start = time.perf_counter()
+
+    # One read ahead and one write in flight
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix='rescore') as executor:
+        pending_page = executor.submit(ScoreFeature.get_page, kind, None, page_size)
+        pending_write = None
+
+        while True:
+            rows = pending_page.result()
+            if not rows:
+                break
+            if len(rows) == page_size:
+                pending_page = executor.submit(ScoreFeature.get_page, kind, rows[-1]['id'], page_size)
+            else:
+                pending_page = None
+
+            page = score_page(kind, rows, weights)
+            stats['rows'] += len(rows)
+            stats['skipped'] += page['skipped']
+            stats['changed'] += len(page['items'])
+            new_scores.append(page['scores'])
+            if len(page['deltas']):
+                delta_sum += float(page['deltas'].sum())
+                delta_count += len(page['deltas'])
+                delta_max = max(delta_max, float(page['deltas'].max()))
+
+            if page['items'] and not dry_run:
+                if pending_write is not None:
+                    pending_write.result()
+                pending_write = executor.submit(write, page['items'])
+
+            if pending_page is None:
+                break
+
+        if pending_write is not None:
+            pending_write.result()
+
+    seconds = time.perf_counter() - start
+    new_scores = np.concatenate(new_scores) if new_scores else np.empty(0)
+    stats.update({
+        'mean_delta': round(delta_sum / delta_count, 4) if delta_count else 0.0,
+        'max_delta': round(delta_max, 4),
+        'mean_score': round(float(new_scores.mean()), 2) if len(new_scores) else None,
+        'score_percentiles': {
+            f'p{q}': round(float(value), 2)
+            for q, value in zip((10, 50, 90), np.percentile(new_scores, (10, 50, 90)))
+        } if len(new_scores) else {},
+        'seconds': round(seconds, 3),
+        'rows_per_second': round(stats['rows'] / seconds, 1) if seconds > 0 else 0.0,
+        'dry_run': dry_run
+    })
+    return stats
+
+def parse_args(args: List[str]) -> Dict:
+    def option(name, default, cast=str):
+        return cast(args[args.index(name) + 1]) if name in args else default
+
+    return {
+        'kind': option('--kind', None),
+        'page_size': option('--page-size', DEFAULT_PAGE_SIZE, int),
+        'dry_run': '--dry-run' in args,
+        'weights': option('--weights', None, json.loads)
+    }
+
+if __name__ == '__main__':
+    settings = parse_args(sys.argv[1:])
+    if settings['kind'] not in LAYOUTS:
+        print(f"Usage: python -m services.rescoring_service --kind {{{','.join(LAYOUTS)}}} "
+              f"[--page-size N] [--dry-run] [--weights JSON]")
+        sys.exit(2)
+
+    print(json.dumps(rescore(**settings), indent=2))
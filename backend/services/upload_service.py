@@ -0,0 +1,398 @@
+"""
+Upload Service
+Chunked, resumable uploads streamed to disk, with a local content-addressed object store
+
+Layout under UPLOAD_FOLDER:
+    meta/<upload_id>.json       upload state (owner, kind, declared size, sha256 once complete)
+    partial/<upload_id>.part    bytes received so far; its length is the resume offset
+    objects/<ab>/<sha256>       completed files, stored once per content
+
+Chunks are copied from the request stream in COPY_BLOCK_BYTES blocks and
+hashed as they are written, so neither a chunk nor the file is ever held
+in memory. The running SHA-256 is kept per process, for the
+HASHER_CACHE_SIZE most recently appended uploads; a chunk that lands on
+another gunicorn worker, or whose hasher was evicted, rehashes the partial
+file from disk (still in blocks).
+Appends to one upload are serialized with an exclusive flock on its partial file.
+
+Unfinished uploads are deleted UPLOAD_EXPIRY_HOURS after their last chunk,
+completed ones UPLOAD_EXPIRY_HOURS after they were completed or last handed
+to an analyzer, and a stored object once no upload refers to it. Completing
+and opening an upload hold store.lock shared; the sweep holds it exclusive.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import BinaryIO, Dict, Optional
+
+from config import Config
+from utils.validators import validate_file_extension
+
+COPY_BLOCK_BYTES = 64 * 1024
+
+# Allowed extensions per upload kind
+UPLOAD_KINDS = {
+    'audio': {'wav', 'webm', 'ogg', 'mp3', 'm4a', 'mp4', 'flac'},
+    'resume': Config.ALLOWED_RESUME_EXTENSIONS
+}
+
+# Seconds between sweeps of expired uploads, per process
+SWEEP_INTERVAL = 60
+
+_swept_at = 0.0
+
+# Running hashes kept per process; older ones are rehashed from disk when needed
+HASHER_CACHE_SIZE = 256
+
+# upload_id -> (offset, running sha256) for uploads this process appended to, least recent first
+_hashers = OrderedDict()
+_hashers_lock = threading.Lock()
+
+class UploadError(Exception):
+    """An upload request that can't be served; status is the HTTP status to answer with"""
+
+    def __init__(self, message: str, status: int = 400, offset: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+def _path(*parts: str) -> str:
+    return os.path.join(Config.UPLOAD_FOLDER, *parts)
+
+def _meta_path(upload_id: str) -> str:
+    return _path('meta', f'{upload_id}.json')
+
+def _partial_path(upload_id: str) -> str:
+    return _path('partial', f'{upload_id}.part')
+
+def _object_path(sha256: str) -> str:
+    return _path('objects', sha256[:2], sha256)
+
+def _lock_store(operation: int):
+    """store.lock flocked with LOCK_SH or LOCK_EX; closing the returned file releases it"""
+    lock_file = open(_path('store.lock'), 'a')
+    fcntl.flock(lock_file, operation)
+    return lock_file
+
+def _write_meta(meta: Dict):
+    # Write-then-rename so readers never see a half-written file
+    path = _meta_path(meta['id'])
+    temporary = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(meta, f)
+    os.replace(temporary, path)
+
+def _read_meta(upload_id: str) -> Optional[Dict]:
+    # Ids are hex uuids; anything else can't name a file of ours
+    if not upload_id or not all(char in '0123456789abcdef' for char in upload_id):
+        return None
+    try:
+        with open(_meta_path(upload_id)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _status(meta: Dict) -> Dict:
+    """Public view of an upload"""
+    complete = meta.get('sha256') is not None
+    if complete:
+        offset = meta['size']
+    else:
+        try:
+            offset = os.path.getsize(_partial_path(meta['id']))
+        except FileNotFoundError:
+            offset = 0
+    return {
+        'upload_id': meta['id'],
+        'kind': meta['kind'],
+        'filename': meta['filename'],
+        'size': meta['size'],
+        'offset': offset,
+        'complete': complete,
+        'sha256': meta.get('sha256'),
+        'expires_at': _last_activity(meta) + Config.UPLOAD_EXPIRY_HOURS * 3600
+    }
+
+def _last_activity(meta: Dict) -> float:
+    """When the upload was started, completed or last handed to an analyzer"""
+    return meta.get('used_at') or meta.get('completed_at') or meta['created_at']
+
+def create_upload(user_id: str, kind: str, filename: str, size: int,
+                  content_type: Optional[str] = None, sha256: Optional[str] = None) -> Dict:
+    """
+    Start an upload
+
+    Args:
+        kind: 'audio' or 'resume'
+        filename: Original file name (its extension must be allowed for the kind)
+        size: Total size in bytes
+        content_type: MIME type, passed on to the analyzer
+        sha256: Expected hex digest (optional; checked when the last chunk arrives)
+
+    Returns:
+        dict: Upload status (offset 0)
+    """
+    if kind not in UPLOAD_KINDS:
+        raise UploadError(f"kind must be one of: {', '.join(sorted(UPLOAD_KINDS))}")
+    if not filename or not validate_file_extension(filename, UPLOAD_KINDS[kind]):
+        raise UploadError(f"File type not allowed for {kind} uploads")
+    if not isinstance(size, int) or size <= 0:
+        raise UploadError("size must be a positive number of bytes")
+    if size > Config.UPLOAD_MAX_BYTES:
+        raise UploadError(f"File is larger than {Config.UPLOAD_MAX_BYTES} bytes", 413)
+
+    for directory in ('meta', 'partial', 'objects'):
+        os.makedirs(_path(directory), exist_ok=True)
+    sweep_expired()
+
+    meta = {
+        'id': uuid.uuid4().hex,
+        'user_id': user_id,
+        'kind': kind,
+        'filename': os.path.basename(filename),
+        'content_type': content_type,
+        'size': size,
+        'expected_sha256': sha256.lower() if sha256 else None,
+        'sha256': None,
+        'created_at': int(time.time())
+    }
+    open(_partial_path(meta['id']), 'wb').close()
+    _write_meta(meta)
+    return _status(meta)
+
+def get_upload(upload_id: str, user_id: str) -> Dict:
+    """Status of an upload owned by user_id"""
+    meta = _read_meta(upload_id)
+    if meta is None:
+        raise UploadError("Upload not found", 404)
+    if meta['user_id'] != user_id:
+        raise UploadError("Unauthorized access to upload", 403)
+    return _status(meta)
+
+def _hasher_at(upload_id: str, part, offset: int):
+    """Running sha256 of the first `offset` bytes of the partial file"""
+    with _hashers_lock:
+        cached = _hashers.get(upload_id)
+    if cached is not None and cached[0] == offset:
+        return cached[1]
+
+    # Another worker appended the earlier chunks: rehash what is on disk
+    hasher = hashlib.sha256()
+    part.seek(0)
+    remaining = offset
+    while remaining:
+        block = part.read(min(COPY_BLOCK_BYTES, remaining))
+        if not block:
+            break
+        hasher.update(block)
+        remaining -= len(block)
+    return hasher
+
+def append_chunk(upload_id: str, user_id: str, offset: int, stream: BinaryIO, length: int) -> Dict:
+    """
+    Append one chunk from a stream
+
+    Args:
+        offset: Where the chunk starts; must equal the bytes received so far
+        stream: Request body stream
+        length: Chunk length (Content-Length)
+
+    Returns:
+        dict: Upload status; complete with sha256 once the last byte arrived
+    """
+    meta = _read_meta(upload_id)
+    if meta is None:
+        raise UploadError("Upload not found", 404)
+    if meta['user_id'] != user_id:
+        raise UploadError("Unauthorized access to upload", 403)
+    if meta.get('sha256'):
+        raise UploadError("Upload is already complete", 409, meta['size'])
+    if length > Config.UPLOAD_CHUNK_BYTES:
+        raise UploadError(f"Chunks must be at most {Config.UPLOAD_CHUNK_BYTES} bytes", 413)
+
+    try:
+        part = open(_partial_path(upload_id), 'r+b')
+    except FileNotFoundError:
+        # Completed or aborted since the metadata was read
+        if _read_meta(upload_id) is None:
+            raise UploadError("Upload not found", 404)
+        raise UploadError("Upload is already complete", 409, meta['size'])
+
+    with part:
+        try:
+            fcntl.flock(part, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadError("Another chunk of this upload is being received", 409)
+
+        current = os.fstat(part.fileno()).st_size
+        if offset != current:
+            raise UploadError("Upload-Offset does not match the bytes received", 409, current)
+        if current + length > meta['size']:
+            raise UploadError("Chunk goes past the declared size", 413, current)
+
+        hasher = _hasher_at(upload_id, part, current)
+        part.seek(current)
+        remaining = length
+        try:
+            while remaining:
+                block = stream.read(min(COPY_BLOCK_BYTES, remaining))
+                if not block:
+                    break
+                part.write(block)
+                hasher.update(block)
+                remaining -= len(block)
+        except BaseException:
+            # The next chunk rehashes from disk
+            with _hashers_lock:
+                _hashers.pop(upload_id, None)
+            raise
+        finally:
+            # Whatever arrived stays, so a dropped connection resumes from here
+            part.flush()
+            os.fsync(part.fileno())
+
+        with _hashers_lock:
+            _hashers[upload_id] = (part.tell(), hasher)
+            _hashers.move_to_end(upload_id)
+            while len(_hashers) > HASHER_CACHE_SIZE:
+                # Abandoned, or finished on another worker
+                _hashers.popitem(last=False)
+
+        if part.tell() < meta['size']:
+            return _status(meta)
+
+        return _complete(meta, hasher.hexdigest())
+
+def _complete(meta: Dict, sha256: str) -> Dict:
+    """Move the finished file into the object store"""
+    upload_id = meta['id']
+    with _hashers_lock:
+        _hashers.pop(upload_id, None)
+
+    if meta['expected_sha256'] and meta['expected_sha256'] != sha256:
+        _discard(upload_id)
+        raise UploadError("Checksum mismatch; start the upload again", 422)
+
+    # Shared with other completions; the sweep can't collect the object before the metadata names it
+    with _lock_store(fcntl.LOCK_SH):
+        target = _object_path(sha256)
+        if os.path.exists(target):
+            # Same content uploaded before: keep one copy
+            os.remove(_partial_path(upload_id))
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(_partial_path(upload_id), target)
+
+        meta['sha256'] = sha256
+        meta['completed_at'] = int(time.time())
+        _write_meta(meta)
+    return _status(meta)
+
+def _discard(upload_id: str):
+    with _hashers_lock:
+        _hashers.pop(upload_id, None)
+    for path in (_partial_path(upload_id), _meta_path(upload_id)):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def delete_upload(upload_id: str, user_id: str):
+    """Abort an upload (the sweep removes a complete one's stored object once no other upload shares it)"""
+    get_upload(upload_id, user_id)
+    _discard(upload_id)
+
+def open_upload(upload_id: str, user_id: str, kind: str) -> Dict:
+    """
+    Hand a completed upload to an analyzer
+
+    Returns:
+        dict: {'path', 'filename', 'content_type', 'size', 'sha256'}
+    """
+    with _lock_store(fcntl.LOCK_SH):
+        status = get_upload(upload_id, user_id)
+        if status['kind'] != kind:
+            raise UploadError(f"Upload is not a {kind} file")
+        if not status['complete']:
+            raise UploadError("Upload is not complete", 409, status['offset'])
+
+        # Each use restarts the expiry clock
+        meta = _read_meta(upload_id)
+        meta['used_at'] = int(time.time())
+        _write_meta(meta)
+
+    return {
+        'path': _object_path(meta['sha256']),
+        'filename': meta['filename'],
+        'content_type': meta['content_type'],
+        'size': meta['size'],
+        'sha256': meta['sha256']
+    }
+
+def sweep_expired(force: bool = False):
+    """
+    Delete expired uploads and the stored objects no upload refers to
+    (at most once per SWEEP_INTERVAL per process unless forced)
+    """
+    global _swept_at
+
+    now = time.time()
+    if not force and now - _swept_at < SWEEP_INTERVAL:
+        return
+    _swept_at = now
+    cutoff = now - Config.UPLOAD_EXPIRY_HOURS * 3600
+
+    try:
+        lock_file = _lock_store(fcntl.LOCK_EX)
+    except FileNotFoundError:
+        return
+
+    with lock_file:
+        # Unfinished: no chunk for UPLOAD_EXPIRY_HOURS
+        with os.scandir(_path('partial')) as entries:
+            for entry in entries:
+                if entry.name.endswith('.part') and entry.stat().st_mtime < cutoff:
+                    _discard(entry.name[:-len('.part')])
+
+        # Completed and unused for UPLOAD_EXPIRY_HOURS, metadata whose partial
+        # file is gone, and temporaries left by a crash
+        referenced = set()
+        with os.scandir(_path('meta')) as entries:
+            for entry in entries:
+                if entry.name.endswith('.tmp'):
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                    continue
+
+                meta = _read_meta(entry.name[:-len('.json')])
+                if meta is None:
+                    continue
+                if meta.get('sha256'):
+                    if _last_activity(meta) < cutoff:
+                        _discard(meta['id'])
+                    else:
+                        referenced.add(meta['sha256'])
+                elif meta['created_at'] < cutoff and not os.path.exists(_partial_path(meta['id'])):
+                    _discard(meta['id'])
+
+        # Objects: kept while any upload refers to them
+        with os.scandir(_path('objects')) as directories:
+            for directory in directories:
+                if not directory.is_dir():
+                    continue
+                with os.scandir(directory.path) as entries:
+                    for entry in entries:
+                        if entry.name not in referenced:
+                            os.remove(entry.path)
+
+    # Hashers of uploads completed, aborted or swept by another worker
+    with _hashers_lock:
+        for upload_id in list(_hashers):
+            if not os.path.exists(_partial_path(upload_id)):
+                del _hashers[upload_id]
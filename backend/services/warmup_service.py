@@ -0,0 +1,139 @@
+"""
+Warmup Service
+Loads NLP models, lexicons and data files before a worker accepts traffic
+"""
+
+import gc
+import time
+from typing import Callable, Dict, List, Tuple
+
+# Component name -> {'loaded': bool, 'seconds': float, 'error': str (optional)}
+_status = {}
+_warmup_complete = False
+
+def _load_nltk_bundle():
+    """Check the offline NLTK bundle and point NLTK at it"""
+    from ml_models.nltk_bundle import load_bundle
+    load_bundle()
+
+def _warm_tokenizer():
+    """Load the Punkt sentence model and Treebank tokenizer"""
+    from ml_models.nlp_processor import tokenize_text, tokenize_sentences
+    tokenize_sentences("Warm up the tokenizer. It loads Punkt.")
+    tokenize_text("Warm up the tokenizer.")
+
+def _warm_stopwords():
+    """Load the English stopword set"""
+    from ml_models.nlp_processor import get_stopwords
+    get_stopwords()
+
+def _warm_lemmatizer():
+    """Load WordNet (the lemmatizer reads it on first use)"""
+    from ml_models.nlp_processor import get_lemmatizer
+    get_lemmatizer().lemmatize('running')
+
+def _warm_similarity():
+    """Import scikit-learn and run one TF-IDF similarity"""
+    from ml_models.nlp_processor import calculate_text_similarity
+    calculate_text_similarity("warm up text", "warm up similarity")
+
+def _warm_sentiment_analyzer():
+    """Load the VADER lexicon"""
+    from ml_models.sentiment_analyzer import get_sentiment_analyzer
+    sia = get_sentiment_analyzer()
+    if sia is None:
+        raise Exception("Sentiment analyzer not available")
+    sia.polarity_scores("Warm up the sentiment analyzer")
+
+def _warm_job_keywords():
+    """Load job_keywords.json"""
+    from services.ai_interview_service import load_job_keywords
+    if not load_job_keywords():
+        raise Exception("Job keywords not loaded")
+
+def _warm_interview_questions():
+    """Load interview_questions.json"""
+    from services.question_generator_service import load_questions
+    load_questions()
+
+def _warm_audio_features():
+    """Import NumPy and analyze a second of silence (the audio worker pool starts on first upload)"""
+    import numpy as np
+    from ml_models.audio_features import SAMPLE_RATE, analyze_samples
+    analyze_samples(np.zeros(SAMPLE_RATE, dtype=np.float32), SAMPLE_RATE)
+
+def _import_database_client():
+    """Import the Supabase client library (the client itself connects on first use, after fork)"""
+    import supabase
+
+# Components in load order
+WARMUP_COMPONENTS: List[Tuple[str, Callable[[], None]]] = [
+    ('nltk_bundle', _load_nltk_bundle),
+    ('tokenizer', _warm_tokenizer),
+    ('stopwords', _warm_stopwords),
+    ('lemmatizer', _warm_lemmatizer),
+    ('similarity', _warm_similarity),
+    ('sentiment_analyzer', _warm_sentiment_analyzer),
+    ('job_keywords', _warm_job_keywords),
+    ('interview_questions', _warm_interview_questions),
+    ('audio_features', _warm_audio_features),
+    ('database_client', _import_database_client)
+]
+
+def warm_up() -> Dict:
+    """
+    Load every component, recording whether it loaded and how long it took
+
+    Returns:
+        dict: Component status keyed by component name
+    """
+    global _warmup_complete
+
+    for name, load in WARMUP_COMPONENTS:
+        start = time.perf_counter()
+        try:
+            load()
+            _status[name] = {'loaded': True}
+        except Exception as e:
+            print(f"Warmup of {name} failed: {str(e)}")
+            _status[name] = {'loaded': False, 'error': str(e)}
+        _status[name]['seconds'] = round(time.perf_counter() - start, 4)
+
+    _warmup_complete = True
+
+    total = sum(component['seconds'] for component in _status.values())
+    print(f"Warmup finished in {total:.2f}s")
+
+    return dict(_status)
+
+def get_readiness() -> Dict:
+    """
+    Readiness report for the /ready endpoint
+
+    Returns:
+        dict: {
+            'ready': bool (warmup ran and every component loaded),
+            'warmup_complete': bool,
+            'components': dict
+        }
+    """
+    ready = _warmup_complete and all(component['loaded'] for component in _status.values())
+
+    return {
+        'ready': ready,
+        'warmup_complete': _warmup_complete,
+        'components': dict(_status)
+    }
+
+def prepare_for_fork():
+    """
+    Freeze everything loaded so far before a pre-fork server forks workers
+
+    Objects moved to the permanent generation are never scanned by the
+    workers' garbage collector, so the pages holding the models, lexicons
+    and data files stay shared copy-on-write instead of being copied into
+    every worker. Pair with gc.disable() before loading (see wsgi.py).
+    """
+    gc.freeze()
+    gc.enable()
+    print(f"Froze {gc.get_freeze_count()} objects for copy-on-write sharing")
@@ -0,0 +1,406 @@
+"""
+Write-Behind Service
+Buffers result records in-process and persists them in bulk, off the response path
+"""
+
+import atexit
+import fcntl
+import json
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from config import Config
+
+# Global buffer instance (None when write-behind is disabled)
+_buffer = None
+_buffer_lock = threading.Lock()
+
+class _Entry:
+    """A pending record and how many times writing it has failed"""
+
+    __slots__ = ('kind', 'record', 'attempts')
+
+    def __init__(self, kind: str, record: Dict, attempts: int = 0):
+        self.kind = kind
+        self.record = record
+        self.attempts = attempts
+
+    def to_line(self) -> str:
+        return json.dumps({'kind': self.kind, 'record': self.record, 'attempts': self.attempts}, default=str) + '\n'
+
+class WriteBehindBuffer:
+    """
+    In-process write-behind buffer with a durable spill file
+
+    Every submitted record is appended to a local spill segment (JSON lines)
+    before it is acknowledged. A background thread flushes pending records
+    in bulk every flush_interval_ms, or as soon as max_batch records are
+    waiting, grouped by kind and handed to that kind's bulk handler in
+    chunks of at most max_batch. Segments left behind by a crashed process
+    are replayed on startup.
+
+    Failures are isolated per kind and per chunk:
+    - Chunks that were written are dropped; a failed chunk and the rest of
+      its kind stay queued in order, other kinds carry on
+    - A record that has failed once is retried on its own, so one bad
+      record can't fail its neighbours; after max_attempts it is appended
+      to the dead-letter file and dropped
+    - A kind that failed waits flush_interval * 2**(failures - 1), capped at
+      max_backoff_ms, before its next attempt
+
+    After a flush, records still queued are rewritten (with their attempt
+    counts) into one fresh segment and the flushed segments are deleted.
+    Handlers must be idempotent: a crash between the two replays some
+    records that were already written.
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, Callable[[List[Dict]], object]],
+        flush_interval_ms: int = 200,
+        max_batch: int = 100,
+        spill_dir: str = 'write_behind_spill',
+        fsync: bool = True,
+        max_attempts: int = 8,
+        max_backoff_ms: int = 30000,
+        dead_letter_path: str = 'write_behind_dead_letter.jsonl'
+    ):
+        self._handlers = handlers
+        self._flush_interval = flush_interval_ms / 1000.0
+        self._max_batch = max_batch
+        self._spill_dir = spill_dir
+        self._fsync = fsync
+        self._max_attempts = max(1, max_attempts)
+        self._max_backoff = max_backoff_ms / 1000.0
+        self._dead_letter_path = dead_letter_path
+
+        # Kind -> (consecutive failed flushes, monotonic time of next attempt)
+        self._backoff = {}
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+
+        # Records waiting to be flushed, and closed segments holding them
+        self._pending = []
+        self._retained_segments = []
+
+        os.makedirs(spill_dir, exist_ok=True)
+        self._segment = self._open_segment()
+        self._replay_orphaned_segments()
+
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+
+    def submit(self, kind: str, record: Dict):
+        """Accept a record for bulk persistence (durable once this returns)"""
+        if kind not in self._handlers:
+            raise ValueError(f"No write-behind handler for '{kind}'")
+
+        line = json.dumps({'kind': kind, 'record': record}, default=str) + '\n'
+
+        with self._lock:
+            if self._closed:
+                raise Exception("Write-behind buffer is closed")
+
+            segment_file = self._segment[1]
+            segment_file.write(line)
+            segment_file.flush()
+            if self._fsync:
+                os.fsync(segment_file.fileno())
+
+            self._pending.append(_Entry(kind, record))
+            pending_count = len(self._pending)
+
+        if pending_count >= self._max_batch:
+            self._wakeup.set()
+
+    def pending_count(self) -> int:
+        """Number of records not yet persisted"""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self, force: bool = False) -> bool:
+        """
+        Persist pending records now (kinds backing off are skipped unless force)
+        Returns True if everything was written (or nothing was pending)
+        """
+        with self._flush_lock:
+            now = time.monotonic()
+            with self._lock:
+                if not self._pending:
+                    return True
+
+                if not force and self._backoff:
+                    kinds = {entry.kind for entry in self._pending}
+                    if all(self._backoff.get(kind, (0, 0))[1] > now for kind in kinds):
+                        # Nothing due yet: leave the spill files alone
+                        return False
+
+                batch = self._pending
+                self._pending = []
+
+                # Rotate so new submissions go to a fresh segment
+                segments = self._retained_segments + [self._segment]
+                self._retained_segments = []
+                if not self._closed:
+                    self._segment = self._open_segment()
+
+            by_kind = {}
+            for entry in batch:
+                by_kind.setdefault(entry.kind, []).append(entry)
+
+            remaining = []
+            for kind, entries in by_kind.items():
+                if not force and self._backoff.get(kind, (0, 0))[1] > now:
+                    remaining.extend(entries)
+                else:
+                    remaining.extend(self._flush_kind(kind, entries))
+
+            # Keep what is left durable, then drop the flushed segments
+            if remaining:
+                retry_segment = self._open_segment()
+                retry_segment[1].write(''.join(entry.to_line() for entry in remaining))
+                retry_segment[1].flush()
+                if self._fsync:
+                    os.fsync(retry_segment[1].fileno())
+
+            for segment in segments:
+                self._remove_segment(segment)
+
+            if remaining:
+                with self._lock:
+                    # Ahead of newer submissions, so each kind stays in order
+                    self._pending = remaining + self._pending
+                    self._retained_segments = [retry_segment] + self._retained_segments
+
+            return not remaining
+
+    def _chunks(self, entries: List[_Entry]) -> List[List[_Entry]]:
+        """Bulk chunks of up to max_batch; records that have failed before go alone"""
+        chunks = []
+        for entry in entries:
+            if entry.attempts or not chunks or chunks[-1][-1].attempts or len(chunks[-1]) >= self._max_batch:
+                chunks.append([entry])
+            else:
+                chunks[-1].append(entry)
+        return chunks
+
+    def _flush_kind(self, kind: str, entries: List[_Entry]) -> List[_Entry]:
+        """Write one kind's records in order, stopping at the first failed chunk; returns what's left"""
+        chunks = self._chunks(entries)
+
+        for index, chunk in enumerate(chunks):
+            try:
+                self._handlers[kind]([entry.record for entry in chunk])
+            except Exception as e:
+                failures = self._backoff.get(kind, (0, 0))[0] + 1
+                delay = min(self._flush_interval * 2 ** (failures - 1), self._max_backoff)
+                self._backoff[kind] = (failures, time.monotonic() + delay)
+                print(f"Write-behind flush of {len(chunk)} '{kind}' records failed, retrying in {delay:.1f}s: {str(e)}")
+
+                for entry in chunk:
+                    entry.attempts += 1
+
+                rest = [entry for later in chunks[index + 1:] for entry in later]
+                if len(chunk) == 1 and chunk[0].attempts >= self._max_attempts:
+                    self._dead_letter(chunk[0], e)
+                    return rest
+                return chunk + rest
+
+        self._backoff.pop(kind, None)
+        return []
+
+    def _dead_letter(self, entry: _Entry, error: Exception):
+        """Append a record that keeps failing to the dead-letter file (shared by all processes)"""
+        line = json.dumps({
+            'kind': entry.kind,
+            'record': entry.record,
+            'attempts': entry.attempts,
+            'error': str(error),
+            'failed_at': time.time()
+        }, default=str) + '\n'
+
+        with open(self._dead_letter_path, 'a', encoding='utf-8') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+        print(f"Write-behind '{entry.kind}' record failed {entry.attempts} times, "
+              f"moved to {self._dead_letter_path}")
+
+    def close(self):
+        """Stop the flusher and flush everything that is still pending"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        self._wakeup.set()
+        self._thread.join(timeout=max(self._flush_interval * 5, 5.0))
+
+        if not self.flush(force=True):
+            print("Write-behind records left in spill files; they will be replayed on next start")
+
+        with self._lock:
+            if self._segment is not None and self._segment not in self._retained_segments:
+                if self._pending or self._retained_segments:
+                    self._segment[1].close()
+                else:
+                    self._remove_segment(self._segment)
+            self._segment = None
+
+    def _run(self):
+        """Background flush loop"""
+        while not self._closed:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            if self._closed:
+                break
+            self.flush()
+
+    def _open_segment(self):
+        """Open a new spill segment, locked for the lifetime of this process"""
+        name = f"{os.getpid()}-{time.time_ns()}.jsonl"
+        path = os.path.join(self._spill_dir, name)
+        segment_file = open(path, 'a', encoding='utf-8')
+        fcntl.flock(segment_file.fileno(), fcntl.LOCK_EX)
+        return (path, segment_file)
+
+    def _remove_segment(self, segment):
+        """Delete a fully persisted segment"""
+        path, segment_file = segment
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        segment_file.close()
+
+    def _replay_orphaned_segments(self):
+        """Adopt segments whose owning process is gone (their lock is free)"""
+        own_path = self._segment[0]
+
+        for name in sorted(os.listdir(self._spill_dir)):
+            path = os.path.join(self._spill_dir, name)
+            if not name.endswith('.jsonl') or path == own_path:
+                continue
+
+            try:
+                segment_file = open(path, 'a+', encoding='utf-8')
+            except FileNotFoundError:
+                continue
+
+            try:
+                fcntl.flock(segment_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Owned by a live process
+                segment_file.close()
+                continue
+
+            if os.fstat(segment_file.fileno()).st_nlink == 0:
+                # Deleted by its owner after a successful flush
+                segment_file.close()
+                continue
+
+            segment_file.seek(0)
+            records = []
+            for line in segment_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn final line from a crash mid-write
+                    continue
+                if entry.get('kind') in self._handlers:
+                    records.append(_Entry(entry['kind'], entry['record'], entry.get('attempts', 0)))
+
+            print(f"Replaying {len(records)} write-behind records from {name}")
+            self._pending.extend(records)
+            self._retained_segments.append((path, segment_file))
+
+def _default_handlers() -> Dict[str, Callable[[List[Dict]], object]]:
+    """Bulk handlers for each buffered record kind"""
+    from models.interview_session import InterviewSession
+    from models.fluency_test import FluencyTest
+    from models.resume import Resume
+    from models.score_feature import ScoreFeature
+
+    return {
+        'interview_answer': InterviewSession.bulk_append_answers,
+        'fluency_result': FluencyTest.bulk_apply_analyses,
+        'resume': Resume.bulk_insert,
+        'score_features': ScoreFeature.bulk_upsert
+    }
+
+def get_write_buffer() -> Optional[WriteBehindBuffer]:
+    """Get the process-wide write-behind buffer (None when disabled)"""
+    global _buffer
+
+    if not Config.WRITE_BEHIND_ENABLED:
+        return None
+
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = WriteBehindBuffer(
+                    _default_handlers(),
+                    flush_interval_ms=Config.WRITE_BEHIND_FLUSH_INTERVAL_MS,
+                    max_batch=Config.WRITE_BEHIND_MAX_BATCH,
+                    spill_dir=Config.WRITE_BEHIND_SPILL_DIR,
+                    fsync=Config.WRITE_BEHIND_FSYNC,
+                    max_attempts=Config.WRITE_BEHIND_MAX_ATTEMPTS,
+                    max_backoff_ms=Config.WRITE_BEHIND_MAX_BACKOFF_MS,
+                    dead_letter_path=Config.WRITE_BEHIND_DEAD_LETTER_PATH
+                )
+                atexit.register(_buffer.close)
+
+    return _buffer
+
+def replay_dead_letters(path: Optional[str] = None) -> int:
+    """
+    Write dead-lettered records again, one at a time, with the default handlers
+    Records that still fail stay in the file
+
+    Returns:
+        int: Number of records written
+    """
+    path = path or Config.WRITE_BEHIND_DEAD_LETTER_PATH
+    if not os.path.exists(path):
+        return 0
+
+    handlers = _default_handlers()
+    written = 0
+
+    # Rewritten in place under the lock flushers append with
+    with open(path, 'r+', encoding='utf-8') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        still_failing = []
+        for line in f:
+            entry = json.loads(line)
+            try:
+                handlers[entry['kind']]([entry['record']])
+                written += 1
+            except Exception as e:
+                print(f"Dead-lettered '{entry['kind']}' record still fails: {str(e)}")
+                entry['error'] = str(e)
+                still_failing.append(json.dumps(entry, default=str) + '\n')
+
+        f.seek(0)
+        f.truncate()
+        f.write(''.join(still_failing))
+        f.flush()
+        os.fsync(f.fileno())
+
+    print(f"Replayed {written} dead-lettered records, {len(still_failing)} still failing")
+    return written
+
+if __name__ == '__main__':
+    # python -m services.write_behind_service replay-dead-letters [path]
+    if len(sys.argv) < 2 or sys.argv[1] != 'replay-dead-letters':
+        print("Usage: python -m services.write_behind_service replay-dead-letters [path]")
+        sys.exit(2)
+    replay_dead_letters(sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,71 @@
+"""
+Admin Auth
+Operator-only access via request signatures made with ADMIN_SECRET
+
+A signature covers the method, path and an expiry, so a leaked value only
+works for that one route and only until it expires:
+    python -m utils.admin_auth sign POST /api/admin/memory/snapshot [--ttl 600]
+"""
+
+import hashlib
+import hmac
+import sys
+import time
+from functools import wraps
+from typing import Optional
+
+from flask import request, jsonify
+
+from config import Config
+
+ADMIN_HEADER = 'X-Admin-Signature'
+
+def sign_request(method: str, path: str, expires: int, secret: Optional[str] = None) -> str:
+    """Signature allowing one method and path until `expires` (unix time)"""
+    secret = secret or Config.ADMIN_SECRET
+    message = f'{expires}:{method.upper()}:{path}'.encode('utf-8')
+    signature = hmac.new(secret.encode('utf-8'), message, hashlib.sha256).hexdigest()
+    return f'{expires}.{signature}'
+
+def verify_signature(value: str, method: str, path: str) -> bool:
+    """Check a signature for this method and path"""
+    if not Config.ADMIN_SECRET or not value or '.' not in value:
+        return False
+
+    expires, _, _ = value.partition('.')
+    try:
+        if int(expires) < time.time():
+            return False
+    except ValueError:
+        return False
+
+    return hmac.compare_digest(value, sign_request(method, path, int(expires)))
+
+def require_admin(f):
+    """Decorator to restrict routes to requests signed with ADMIN_SECRET"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not Config.ADMIN_SECRET:
+            return jsonify({
+                'success': False,
+                'message': 'Admin endpoints are disabled'
+            }), 404
+
+        if not verify_signature(request.headers.get(ADMIN_HEADER, ''), request.method, request.path):
+            return jsonify({
+                'success': False,
+                'message': 'Invalid or expired admin signature'
+            }), 403
+
+        return f(*args, **kwargs)
+
+    return decorated_function
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if len(args) < 3 or args[0] != 'sign' or not Config.ADMIN_SECRET:
+        print("Usage: ADMIN_SECRET=... python -m utils.admin_auth sign <METHOD> <path> [--ttl seconds]")
+        sys.exit(2)
+
+    ttl = int(args[args.index('--ttl') + 1]) if '--ttl' in args else 600
+    print(f"{ADMIN_HEADER}: {sign_request(args[1], args[2], int(time.time()) + ttl)}")
@@ -0,0 +1,139 @@
+"""
+Admission
+Concurrency limit for the CPU-heavy NLP endpoints, shared by every worker on a node
+
+Past the point where every core is busy, more concurrent evaluations only
+make each one slower, until every request times out. Instead, at most
+EVAL_MAX_CONCURRENT evaluations run at once on a node; up to EVAL_MAX_QUEUED
+more wait (at most EVAL_QUEUE_TIMEOUT_MS) for one to finish, and anything
+beyond that is answered 503 with Retry-After right away, so the requests
+that are admitted keep their normal latency.
+
+Slots are lock files in EVAL_SLOTS_DIR, held with flock: any process or
+thread on the node can take one, and the kernel releases it if the worker
+dies mid-request, so a crash never leaks capacity. Waiters poll every
+POLL_INTERVAL_S (no FIFO order). EVAL_MAX_CONCURRENT=0 turns admission off.
+"""
+
+import fcntl
+import math
+import os
+import random
+import time
+from functools import wraps
+from typing import Optional
+
+from flask import request, jsonify
+
+from config import Config
+from utils.metrics import Counter, Histogram
+
+ADMISSION_REJECTED = Counter(
+    'admission_rejected_total', 'NLP requests turned away because the node was saturated',
+    ('pipeline', 'reason')
+)
+
+ADMISSION_WAIT_SECONDS = Histogram(
+    'admission_wait_seconds', 'Time admitted NLP requests waited for a slot', ('pipeline',)
+)
+
+POLL_INTERVAL_S = 0.01
+
+class EvaluationBusy(Exception):
+    """No evaluation slot became free in time; reason is 'queue_full' or 'timeout'"""
+
+    def __init__(self, reason: str):
+        super().__init__('Server is busy evaluating other requests, try again shortly')
+        self.reason = reason
+
+def _try_lock(prefix: str, count: int) -> Optional[int]:
+    """File descriptor holding one of `count` lock files, or None if all are held"""
+    # Start at a random slot so processes don't all contend for slot 0
+    first = random.randrange(count)
+    for offset in range(count):
+        path = os.path.join(Config.EVAL_SLOTS_DIR, f'{prefix}-{(first + offset) % count}.lock')
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return fd
+        except BlockingIOError:
+            os.close(fd)
+    return None
+
+def acquire_slot(pipeline: str) -> Optional[int]:
+    """
+    Take one of the node's evaluation slots, waiting up to EVAL_QUEUE_TIMEOUT_MS
+
+    Returns:
+        The slot to pass to release_slot (None when admission is off)
+
+    Raises:
+        EvaluationBusy: The wait queue is full, or no slot freed up in time
+    """
+    if Config.EVAL_MAX_CONCURRENT <= 0:
+        return None
+
+    os.makedirs(Config.EVAL_SLOTS_DIR, exist_ok=True)
+    start = time.perf_counter()
+
+    slot = _try_lock('slot', Config.EVAL_MAX_CONCURRENT)
+    if slot is None:
+        # Queue positions are lock files too, so the queue is bounded node-wide
+        position = _try_lock('queue', Config.EVAL_MAX_QUEUED) if Config.EVAL_MAX_QUEUED > 0 else None
+        if position is None:
+            ADMISSION_REJECTED.labels(pipeline, 'queue_full').inc()
+            raise EvaluationBusy('queue_full')
+
+        try:
+            deadline = start + Config.EVAL_QUEUE_TIMEOUT_MS / 1000
+            while slot is None:
+                if time.perf_counter() >= deadline:
+                    ADMISSION_REJECTED.labels(pipeline, 'timeout').inc()
+                    raise EvaluationBusy('timeout')
+                time.sleep(POLL_INTERVAL_S)
+                slot = _try_lock('slot', Config.EVAL_MAX_CONCURRENT)
+        finally:
+            os.close(position)
+
+    ADMISSION_WAIT_SECONDS.labels(pipeline).observe(time.perf_counter() - start)
+    return slot
+
+def release_slot(slot: Optional[int]):
+    """Give a slot back (closing the descriptor releases its lock)"""
+    if slot is not None:
+        os.close(slot)
+
+def service_busy(error: EvaluationBusy):
+    """503 response with Retry-After for a request that wasn't admitted"""
+    response = jsonify({
+        'success': False,
+        'message': str(error)
+    })
+    response.headers['Retry-After'] = str(max(1, math.ceil(Config.EVAL_QUEUE_TIMEOUT_MS / 1000)))
+    return response, 503
+
+def admission_control(pipeline: str):
+    """
+    Decorator running a route only once it holds an evaluation slot (503 if none frees up)
+
+    Goes below require_auth, so unauthenticated and rate-limited requests never queue
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            # Receive the whole body (e.g. an upload) before taking a slot
+            request.get_data(cache=True, parse_form_data=True)
+
+            try:
+                slot = acquire_slot(pipeline)
+            except EvaluationBusy as e:
+                return service_busy(e)
+
+            try:
+                return f(*args, **kwargs)
+            finally:
+                release_slot(slot)
+
+        return decorated_function
+
+    return decorator
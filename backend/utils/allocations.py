@@ -0,0 +1,137 @@
+"""
+Allocation Tracking
+tracemalloc snapshots and per-request peak allocation accounting
+
+Snapshots are per process: with several workers, each diff describes the
+worker that answered the request (its pid is in the response).
+
+The per-request peak is the highest traced memory during the request above
+what was allocated when it started. tracemalloc is process-wide, so with
+GUNICORN_THREADS > 1 concurrent requests inflate each other's peaks.
+"""
+
+import os
+import tracemalloc
+from typing import Dict
+
+from config import Config
+from utils.metrics import Histogram
+
+# 64 KB to 1 GB in powers of four
+ALLOCATION_BUCKETS = tuple(float(64 * 1024 * 4 ** i) for i in range(9))
+
+REQUEST_PEAK_BYTES = Histogram(
+    'http_request_peak_allocation_bytes', 'Peak traced allocation per request above its starting point',
+    ('endpoint',), buckets=ALLOCATION_BUCKETS
+)
+
+# Frames from the tracer itself and the import machinery are noise in diffs
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>')
+]
+
+GROUP_BY_OPTIONS = ('lineno', 'filename', 'traceback')
+
+_baseline = None
+_previous = None
+
+def start_tracing():
+    """Start tracemalloc if it is not already tracing"""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(Config.TRACEMALLOC_FRAMES)
+
+def _format_stat_diff(stat) -> Dict:
+    return {
+        'location': [f'{frame.filename}:{frame.lineno}' for frame in stat.traceback],
+        'size_kb': round(stat.size / 1024, 1),
+        'size_diff_kb': round(stat.size_diff / 1024, 1),
+        'count': stat.count,
+        'count_diff': stat.count_diff
+    }
+
+def take_snapshot(group_by: str = 'lineno', top: int = 20, against: str = 'previous',
+                  reset_baseline: bool = False) -> Dict:
+    """
+    Take a snapshot and diff it against the previous one or the baseline
+
+    Args:
+        group_by: 'lineno', 'filename' or 'traceback'
+        top: Number of entries to return, largest growth first
+        against: 'previous' (last snapshot) or 'baseline' (first snapshot or last reset)
+        reset_baseline: Make this snapshot the new baseline
+
+    Returns:
+        dict: Traced totals and the top allocation differences (empty on the
+              first snapshot, which only becomes the reference)
+    """
+    global _baseline, _previous
+
+    start_tracing()
+    snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+    reference = _baseline if against == 'baseline' else _previous
+    differences = []
+    if reference is not None:
+        stats = snapshot.compare_to(reference, group_by)
+        differences = [_format_stat_diff(stat) for stat in stats[:top]]
+
+    if _baseline is None or reset_baseline:
+        _baseline = snapshot
+    _previous = snapshot
+
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        'pid': os.getpid(),
+        'traced_kb': round(current / 1024, 1),
+        'peak_kb': round(peak / 1024, 1),
+        'compared_against': against if reference is not None else None,
+        'differences': differences
+    }
+
+def get_tracing_status() -> Dict:
+    """Whether tracing is on and how much memory is traced"""
+    tracing = tracemalloc.is_tracing()
+    current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+    return {
+        'pid': os.getpid(),
+        'tracing': tracing,
+        'frames': tracemalloc.get_traceback_limit() if tracing else 0,
+        'traced_kb': round(current / 1024, 1),
+        'peak_kb': round(peak / 1024, 1),
+        'overhead_kb': round(tracemalloc.get_tracemalloc_memory() / 1024, 1),
+        'has_baseline': _baseline is not None
+    }
+
+def stop_tracing():
+    """Stop tracing and drop stored snapshots"""
+    global _baseline, _previous
+    _baseline = _previous = None
+    tracemalloc.stop()
+
+def init_app(app):
+    """Record per-request peak allocation (no-op unless REQUEST_ALLOCATION_METRICS)"""
+    if Config.TRACEMALLOC_ENABLED or Config.REQUEST_ALLOCATION_METRICS:
+        start_tracing()
+
+    if not Config.REQUEST_ALLOCATION_METRICS:
+        return
+
+    from flask import g, request
+
+    @app.before_request
+    def start_allocation_tracking():
+        if not tracemalloc.is_tracing():
+            return
+        tracemalloc.reset_peak()
+        g.allocation_start = tracemalloc.get_traced_memory()[0]
+
+    @app.after_request
+    def observe_allocation_peak(response):
+        start = g.pop('allocation_start', None)
+        if start is not None and tracemalloc.is_tracing():
+            peak = tracemalloc.get_traced_memory()[1]
+            REQUEST_PEAK_BYTES.labels(request.endpoint or 'unmatched').observe(max(0, peak - start))
+        return response
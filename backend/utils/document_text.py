@@ -0,0 +1,81 @@
+"""
+Document Text Extraction
+Plain text from uploaded resume files (txt, pdf, docx), read incrementally from disk
+"""
+
+import zipfile
+from typing import Iterator
+from xml.etree import ElementTree
+
+# WordprocessingML namespace (docx body)
+_WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+READ_BLOCK_CHARS = 64 * 1024
+
+def _txt_parts(path: str) -> Iterator[str]:
+    with open(path, encoding='utf-8', errors='replace') as f:
+        while True:
+            block = f.read(READ_BLOCK_CHARS)
+            if not block:
+                return
+            yield block
+
+def _pdf_parts(path: str) -> Iterator[str]:
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text() or ''
+            # Drop the page's parsed layout before moving on
+            page.close()
+            yield text + '\n'
+
+def _docx_parts(path: str) -> Iterator[str]:
+    with zipfile.ZipFile(path) as archive, archive.open('word/document.xml') as document:
+        for event, element in ElementTree.iterparse(document, events=('end',)):
+            if element.tag == f'{_WORD_NS}t':
+                yield element.text or ''
+            elif element.tag == f'{_WORD_NS}tab':
+                yield '\t'
+            elif element.tag == f'{_WORD_NS}p':
+                yield '\n'
+                element.clear()
+
+_EXTRACTORS = {
+    'txt': _txt_parts,
+    'pdf': _pdf_parts,
+    'docx': _docx_parts
+}
+
+def extract_document_text(path: str, filename: str, max_chars: int) -> str:
+    """
+    Extract text from a stored document
+
+    Args:
+        path: File on disk
+        filename: Original name (the extension picks the parser)
+        max_chars: Stop reading after this many characters
+
+    Returns:
+        str: Extracted text (at most max_chars)
+
+    Raises:
+        ValueError: Unsupported type or unreadable file
+    """
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    extract = _EXTRACTORS.get(extension)
+    if extract is None:
+        raise ValueError(f"Can't extract text from .{extension} files")
+
+    parts = []
+    length = 0
+    try:
+        for part in extract(path):
+            parts.append(part)
+            length += len(part)
+            if length >= max_chars:
+                break
+    except Exception as e:
+        raise ValueError(f"Could not read {filename}: {str(e)}")
+
+    return ''.join(parts)[:max_chars]
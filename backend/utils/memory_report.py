@@ -0,0 +1,92 @@
+"""
+Memory Report
+Per-process RSS / PSS / USS from /proc (Linux), used to check that pre-fork
+loaded NLP state stays shared between WSGI workers
+
+Usage:
+    python -m utils.memory_report <master_pid>
+
+USS (unique set size) is the memory that would be freed if the process
+exited: its private pages. With pre-fork loading, a worker's USS should stay
+far below its RSS because the models live in pages shared with the master.
+"""
+
+import os
+import sys
+from typing import Dict, List
+
+def read_memory(pid: int) -> Dict:
+    """
+    Read memory counters for a process
+
+    Returns:
+        dict: {'pid', 'rss_kb', 'pss_kb', 'uss_kb', 'shared_kb'}
+    """
+    counters = {}
+    with open(f'/proc/{pid}/smaps_rollup', 'r') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':'):
+                try:
+                    counters[parts[0][:-1]] = int(parts[1])
+                except ValueError:
+                    continue
+
+    uss = counters.get('Private_Clean', 0) + counters.get('Private_Dirty', 0)
+    shared = counters.get('Shared_Clean', 0) + counters.get('Shared_Dirty', 0)
+
+    return {
+        'pid': pid,
+        'rss_kb': counters.get('Rss', 0),
+        'pss_kb': counters.get('Pss', 0),
+        'uss_kb': uss,
+        'shared_kb': shared
+    }
+
+def child_pids(parent_pid: int) -> List[int]:
+    """PIDs whose parent is parent_pid (e.g. the workers of a WSGI master)"""
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces; ppid follows the closing paren
+        fields = stat[stat.rindex(')') + 2:].split()
+        if int(fields[1]) == parent_pid:
+            children.append(int(entry))
+    return sorted(children)
+
+def format_memory(memory: Dict, label: str = '') -> str:
+    """One-line summary in MB"""
+    return (
+        f"{label}pid {memory['pid']}: "
+        f"rss {memory['rss_kb'] / 1024:.1f} MB, "
+        f"pss {memory['pss_kb'] / 1024:.1f} MB, "
+        f"uss {memory['uss_kb'] / 1024:.1f} MB, "
+        f"shared {memory['shared_kb'] / 1024:.1f} MB"
+    )
+
+def report_workers(master_pid: int) -> Dict:
+    """Memory for a master process and each of its workers"""
+    workers = [read_memory(pid) for pid in child_pids(master_pid)]
+    return {
+        'master': read_memory(master_pid),
+        'workers': workers,
+        'total_uss_kb': sum(worker['uss_kb'] for worker in workers),
+        'total_pss_kb': sum(worker['pss_kb'] for worker in workers)
+    }
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print("Usage: python -m utils.memory_report <master_pid>")
+        sys.exit(2)
+
+    report = report_workers(int(sys.argv[1]))
+    print(format_memory(report['master'], 'master '))
+    for worker in report['workers']:
+        print(format_memory(worker, 'worker '))
+    print(f"workers total: uss {report['total_uss_kb'] / 1024:.1f} MB, pss {report['total_pss_kb'] / 1024:.1f} MB")
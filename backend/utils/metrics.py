@@ -0,0 +1,446 @@
+"""
+Metrics
+Prometheus-style counters and latency histograms, exposed on /metrics
+
+Recording is a bisect plus a few integer adds on pre-bound label children
+(about a microsecond per event), with no I/O on the request path.
+
+Multi-process (gunicorn): set METRICS_DIR to a directory shared by the
+workers. Each process writes a snapshot of its own values to
+metrics_<pid>-<start ns>.json every METRICS_FLUSH_INTERVAL_MS from a
+background thread, and holds a lock on a matching .lock file while it lives;
+/metrics sums every snapshot in the directory, so any worker can answer a
+scrape. Snapshots of exited workers (free lock) are folded into
+metrics_retired.json so counters never go backwards and the directory stays
+bounded; a reused pid gets a new file. Clear the directory when the master
+starts (gunicorn.conf.py does this).
+"""
+
+import atexit
+import bisect
+import fcntl
+import functools
+import glob
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+from utils.tracing import span
+
+# Latency buckets in seconds (0.5 ms to 10 s)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+SNAPSHOT_PREFIX = 'metrics_'
+RETIRED_NAME = 'retired'
+
+_registry = {}
+_exporter_pid = None
+
+# (snapshot path, lock file held for the life of this process)
+_snapshot_owner = None
+
+class _CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def _reset(self):
+        self.value = 0.0
+
+class _Timer:
+    __slots__ = ('_child', '_start')
+
+    def __init__(self, child):
+        self._child = child
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._child.observe(time.perf_counter() - self._start)
+
+class _HistogramChild:
+    __slots__ = ('buckets', 'counts', 'sum', '_lock')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # One slot per bucket plus +Inf; cumulated only when rendering
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self) -> _Timer:
+        """Context manager that observes the elapsed wall time in seconds"""
+        return _Timer(self)
+
+    def _reset(self):
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name: str, description: str, labelnames: Tuple[str, ...] = ()):
+        if name in _registry:
+            raise ValueError(f"Metric already registered: {name}")
+
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        _registry[name] = self
+
+    def labels(self, *values: str):
+        """
+        Get the child for a label set
+        Bind children once (module level) on hot paths to skip this lookup
+        """
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, description: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, description, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def time(self) -> _Timer:
+        return self.labels().time()
+
+# Shared metrics
+REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds', 'Request latency per route',
+    ('endpoint', 'method', 'status')
+)
+STAGE_SECONDS = Histogram(
+    'nlp_stage_duration_seconds', 'Latency of each scoring stage',
+    ('pipeline', 'stage')
+)
+DB_CALL_SECONDS = Histogram(
+    'db_call_duration_seconds', 'Database call latency per model method',
+    ('model', 'method')
+)
+DB_CALL_ERRORS = Counter(
+    'db_call_errors_total', 'Database calls that raised, per model method',
+    ('model', 'method')
+)
+CACHE_REQUESTS = Counter(
+    'cache_requests_total', 'Lookups of in-process caches',
+    ('cache', 'result')
+)
+
+def stage_timer(pipeline: str, stage: str) -> _HistogramChild:
+    """Pre-bound stage histogram; use `with stage_timer(...).time():`"""
+    return STAGE_SECONDS.labels(pipeline, stage)
+
+def cache_counters(cache: str) -> Tuple[_CounterChild, _CounterChild]:
+    """Pre-bound (hit, miss) counters for a cache"""
+    return CACHE_REQUESTS.labels(cache, 'hit'), CACHE_REQUESTS.labels(cache, 'miss')
+
+def timed_db_call(f):
+    """
+    Decorator recording latency and errors of a model method that queries
+    the database, and wrapping the call in a trace span
+    """
+    model, _, method = f.__qualname__.rpartition('.')
+    latency = DB_CALL_SECONDS.labels(model, method)
+    errors = DB_CALL_ERRORS.labels(model, method)
+    span_name = f'db {model}.{method}'
+    span_attributes = {'db.system': 'postgresql', 'db.operation': method}
+
+    @functools.wraps(f)
+    def decorated(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            with span(span_name, **span_attributes):
+                return f(*args, **kwargs)
+        except Exception:
+            errors.inc()
+            raise
+        finally:
+            latency.observe(time.perf_counter() - start)
+
+    return decorated
+
+def snapshot() -> Dict:
+    """This process's values: {name: {'kind', 'help', 'labelnames', 'buckets', 'samples'}}"""
+    result = {}
+    for name, metric in list(_registry.items()):
+        samples = []
+        for key, child in list(metric._children.items()):
+            if metric.kind == 'histogram':
+                samples.append({'labels': list(key), 'counts': list(child.counts), 'sum': child.sum})
+            else:
+                samples.append({'labels': list(key), 'value': child.value})
+        result[name] = {
+            'kind': metric.kind,
+            'help': metric.description,
+            'labelnames': list(metric.labelnames),
+            'buckets': list(getattr(metric, 'buckets', ())),
+            'samples': samples
+        }
+    return result
+
+def merge_snapshots(snapshots: List[Dict]) -> Dict:
+    """Sum counters and histogram buckets across processes"""
+    merged = {}
+    for snap in snapshots:
+        for name, metric in snap.items():
+            target = merged.setdefault(name, {**metric, 'samples': {}})
+            for sample in metric['samples']:
+                key = tuple(sample['labels'])
+                existing = target['samples'].get(key)
+                if existing is None:
+                    target['samples'][key] = dict(sample, counts=list(sample.get('counts', [])))
+                elif metric['kind'] == 'histogram':
+                    existing['counts'] = [a + b for a, b in zip(existing['counts'], sample['counts'])]
+                    existing['sum'] += sample['sum']
+                else:
+                    existing['value'] += sample['value']
+    return merged
+
+def _format_labels(names: List[str], values: List[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = [
+        f'{name}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for name, value in pairs
+    ]
+    return '{' + ','.join(escaped) + '}'
+
+def render(merged: Dict) -> str:
+    """Prometheus text exposition format (0.0.4)"""
+    lines = []
+    for name in sorted(merged):
+        metric = merged[name]
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['kind']}")
+        labelnames = metric['labelnames']
+
+        for key in sorted(metric['samples']):
+            sample = metric['samples'][key]
+            values = list(key)
+            if metric['kind'] == 'histogram':
+                cumulative = 0
+                bounds = [repr(float(b)) for b in metric['buckets']] + ['+Inf']
+                for bound, count in zip(bounds, sample['counts']):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(labelnames, values, ('le', bound))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labelnames, values)} {sample['sum']}")
+                lines.append(f"{name}_count{_format_labels(labelnames, values)} {cumulative}")
+            else:
+                lines.append(f"{name}{_format_labels(labelnames, values)} {sample['value']}")
+
+    return '\n'.join(lines) + '\n'
+
+def _snapshot_file(name: str) -> str:
+    return os.path.join(Config.METRICS_DIR, f'{SNAPSHOT_PREFIX}{name}')
+
+def _own_snapshot_path() -> str:
+    """This process's snapshot path, locked for its lifetime (pid plus start time: pids get reused)"""
+    global _snapshot_owner
+
+    if _snapshot_owner is None:
+        name = f"{os.getpid()}-{time.time_ns()}"
+        lock_file = open(_snapshot_file(f'{name}.lock'), 'a')
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        _snapshot_owner = (_snapshot_file(f'{name}.json'), lock_file)
+    return _snapshot_owner[0]
+
+def _read_snapshot(path: str) -> Optional[Dict]:
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        # Removed or replaced between glob and open
+        return None
+
+def _write_json(path: str, data: Dict):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def write_snapshot():
+    """Atomically write this process's snapshot to METRICS_DIR"""
+    if not Config.METRICS_DIR:
+        return
+
+    _write_json(_own_snapshot_path(), snapshot())
+
+def _retire_exited():
+    """Fold snapshots of exited processes (their lock is free) into the retired totals"""
+    retired_path = _snapshot_file(f'{RETIRED_NAME}.json')
+    own_path = _snapshot_owner[0] if _snapshot_owner else None
+
+    for lock_path in glob.glob(_snapshot_file('*.lock')):
+        path = lock_path[:-len('.lock')] + '.json'
+        if path == own_path or path == retired_path:
+            continue
+
+        try:
+            lock_file = open(lock_path, 'a')
+        except FileNotFoundError:
+            continue
+
+        with lock_file:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Owned by a live process
+                continue
+
+            if os.fstat(lock_file.fileno()).st_nlink == 0:
+                # Retired by another process
+                continue
+
+            exited = _read_snapshot(path)
+            if exited is not None:
+                retired = _read_snapshot(retired_path) or {}
+                _write_json(retired_path, _unmerge(merge_snapshots([retired, exited])))
+            for leftover in (path, path + '.tmp', lock_path):
+                try:
+                    os.remove(leftover)
+                except FileNotFoundError:
+                    pass
+
+def _unmerge(merged: Dict) -> Dict:
+    """merge_snapshots output back in snapshot() form (samples as a list)"""
+    return {name: {**metric, 'samples': list(metric['samples'].values())} for name, metric in merged.items()}
+
+def collect() -> str:
+    """Metrics for the whole server (all worker snapshots) as exposition text"""
+    if not Config.METRICS_DIR:
+        return render(merge_snapshots([snapshot()]))
+
+    write_snapshot()
+
+    # Exclusive while retiring and shared while reading, so a scrape never
+    # sees an exited process both in its snapshot and in the retired totals
+    with open(_snapshot_file(f'{RETIRED_NAME}.lock'), 'a') as retired_lock:
+        fcntl.flock(retired_lock.fileno(), fcntl.LOCK_EX)
+        _retire_exited()
+        fcntl.flock(retired_lock.fileno(), fcntl.LOCK_SH)
+
+        snapshots = []
+        for path in glob.glob(_snapshot_file('*.json')):
+            snap = _read_snapshot(path)
+            if snap is not None:
+                snapshots.append(snap)
+
+    return render(merge_snapshots(snapshots))
+
+def clear_snapshots():
+    """Remove every snapshot (call once when the server starts, before workers fork)"""
+    if not Config.METRICS_DIR:
+        return
+    for path in glob.glob(os.path.join(Config.METRICS_DIR, f'{SNAPSHOT_PREFIX}*')):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def _run_exporter():
+    interval = Config.METRICS_FLUSH_INTERVAL_MS / 1000
+    while True:
+        time.sleep(interval)
+        try:
+            write_snapshot()
+        except OSError as e:
+            print(f"Error writing metrics snapshot: {str(e)}")
+
+def ensure_exporter():
+    """Start the snapshot thread once per process (cheap to call on every request)"""
+    global _exporter_pid
+
+    if _exporter_pid == os.getpid() or not Config.METRICS_DIR:
+        return
+
+    _exporter_pid = os.getpid()
+    os.makedirs(Config.METRICS_DIR, exist_ok=True)
+    threading.Thread(target=_run_exporter, name='metrics-exporter', daemon=True).start()
+    atexit.register(write_snapshot)
+
+def _reset_after_fork():
+    """Workers start from zero: values recorded in the master (warmup) stay the master's"""
+    global _exporter_pid, _snapshot_owner
+    _exporter_pid = None
+    if _snapshot_owner is not None:
+        # Closing the inherited descriptor leaves the parent's lock in place
+        _snapshot_owner[1].close()
+        _snapshot_owner = None
+    for metric in _registry.values():
+        metric._lock = threading.Lock()
+        for child in metric._children.values():
+            child._lock = threading.Lock()
+            child._reset()
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+def init_app(app):
+    """Record per-route latency and expose /metrics"""
+    from flask import Response, g, request
+
+    @app.before_request
+    def start_request_timer():
+        ensure_exporter()
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def observe_request(response):
+        start = g.pop('metrics_start', None)
+        if start is not None and request.endpoint != 'metrics':
+            REQUEST_SECONDS.labels(
+                request.endpoint or 'unmatched', request.method, response.status_code
+            ).observe(time.perf_counter() - start)
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        return Response(collect(), mimetype='text/plain; version=0.0.4')
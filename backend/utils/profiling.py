@@ -0,0 +1,147 @@
+"""
+Request Profiling
+Opt-in CPU profiling of individual production requests
+
+A request is profiled (when PROFILING_ENABLED) if any of:
+- it carries a valid X-Profile-Request header, signed with ADMIN_SECRET for
+  that method and path; the admin_auth CLI prints the value to send:
+      python -m utils.admin_auth sign POST /api/fluency/analyze [--ttl 600]
+- the flag file <PROFILING_DIR>/profile_all exists (touch it to profile every
+  request on that node, remove it to stop; checked at most once a second)
+- it is picked by 1-in-PROFILING_SAMPLE_RATE sampling (0 disables sampling)
+
+PROFILING_MODE 'cprofile' writes a pstats file (open with `python -m pstats`
+or snakeviz); 'sample' runs a wall-clock stack sampler and writes collapsed
+stacks (flamegraph.pl / speedscope). Files are named
+<timestamp>_<endpoint>_<method>_<ms>ms_<pid>.<prof|collapsed>
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+from config import Config
+from utils.admin_auth import verify_signature
+
+PROFILE_HEADER = 'X-Profile-Request'
+FLAG_FILE = 'profile_all'
+
+# How often the flag file is re-checked
+FLAG_CHECK_INTERVAL = 1.0
+
+_flag_checked_at = 0.0
+_flag_present = False
+
+def _flag_file_present() -> bool:
+    global _flag_checked_at, _flag_present
+
+    now = time.monotonic()
+    if now - _flag_checked_at >= FLAG_CHECK_INTERVAL:
+        _flag_checked_at = now
+        _flag_present = os.path.exists(os.path.join(Config.PROFILING_DIR, FLAG_FILE))
+    return _flag_present
+
+def should_profile(request) -> bool:
+    """Decide whether to profile this request"""
+    header = request.headers.get(PROFILE_HEADER)
+    if header:
+        return verify_signature(header, request.method, request.path)
+
+    if _flag_file_present():
+        return True
+
+    rate = Config.PROFILING_SAMPLE_RATE
+    return rate > 0 and random.random() * rate < 1
+
+class StackSampler:
+    """Wall-clock sampler of one thread's stack, aggregated as collapsed stacks"""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+
+            stack = ';'.join(reversed(names))
+            self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+    def write(self, path: str):
+        with open(path, 'w') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f'{stack} {count}\n')
+
+def _profile_path(endpoint: str, method: str, elapsed_ms: float, extension: str) -> str:
+    timestamp = time.strftime('%Y%m%dT%H%M%S')
+    safe_endpoint = ''.join(c if c.isalnum() or c in '-_' else '_' for c in endpoint)
+    filename = f'{timestamp}_{safe_endpoint}_{method}_{elapsed_ms:.0f}ms_{os.getpid()}.{extension}'
+    return os.path.join(Config.PROFILING_DIR, filename)
+
+def init_app(app):
+    """Profile opted-in requests (no-op unless PROFILING_ENABLED)"""
+    if not Config.PROFILING_ENABLED:
+        return
+
+    import cProfile
+    from flask import g, request
+
+    os.makedirs(Config.PROFILING_DIR, exist_ok=True)
+
+    @app.before_request
+    def start_profiler():
+        if not should_profile(request):
+            return
+
+        if Config.PROFILING_MODE == 'sample':
+            profiler = StackSampler(threading.get_ident(), Config.PROFILING_SAMPLE_INTERVAL_MS / 1000)
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler is already active in this thread
+                return
+
+        g.profiler = profiler
+        g.profiler_start = time.perf_counter()
+
+    @app.teardown_request
+    def write_profile(exc):
+        profiler = g.pop('profiler', None)
+        if profiler is None:
+            return
+
+        elapsed_ms = (time.perf_counter() - g.pop('profiler_start')) * 1000
+        endpoint = request.endpoint or 'unmatched'
+
+        try:
+            if isinstance(profiler, StackSampler):
+                profiler.stop()
+                profiler.write(_profile_path(endpoint, request.method, elapsed_ms, 'collapsed'))
+            else:
+                profiler.disable()
+                profiler.dump_stats(_profile_path(endpoint, request.method, elapsed_ms, 'prof'))
+        except OSError as e:
+            print(f"Error writing request profile: {str(e)}")
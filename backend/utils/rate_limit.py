@@ -0,0 +1,230 @@
+"""
+Rate Limit
+Token buckets per user and per client IP, shared by every worker on a node
+
+A limit like "100 per hour" is a bucket of 100 tokens refilled at 100/3600
+tokens per second; each request takes one, and a request finding the bucket
+empty is answered 429 with Retry-After (the seconds until a token is back).
+Bursts up to the bucket size pass, sustained traffic is held to the rate.
+
+Buckets live in one SQLite file (RATELIMIT_STORAGE_PATH) so all gunicorn
+workers of a node draw from the same buckets; each take is one short
+BEGIN IMMEDIATE transaction (tens of microseconds). Nodes don't share state,
+so behind a load balancer the effective limit is per node. Errors reading
+the store let the request through: a broken limiter must not take the API down.
+
+- Per IP (RATELIMIT_PER_IP): every /api request, before authentication
+- Per user (RATELIMIT_DEFAULT): every authenticated request (see require_auth)
+
+Behind a reverse proxy set RATELIMIT_PROXY_HOPS to the number of proxies
+appending to X-Forwarded-For, or every client shares the proxy's address.
+"""
+
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from flask import request, jsonify
+
+from config import Config
+from utils.metrics import Counter
+
+RATE_LIMITED = Counter(
+    'rate_limited_total', 'Requests refused by a rate limit', ('scope',)
+)
+
+PERIOD_SECONDS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+# Drop buckets that have refilled completely every this many takes (per process)
+PRUNE_EVERY = 1000
+
+_LIMIT = re.compile(r'(\d+)\s*(?:per|/)\s*(\d*)\s*(second|minute|hour|day)s?')
+
+_SCHEMA = 'CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)'
+
+def parse_limit(value: str) -> Tuple[float, float]:
+    """
+    Bucket size and refill rate (tokens per second) of a limit
+
+    Accepts "100 per hour", "10/minute" or "5 per 10 seconds"
+    """
+    match = _LIMIT.fullmatch(value.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid rate limit: {value!r} (expected e.g. '100 per hour')")
+
+    count, periods, unit = match.groups()
+    seconds = PERIOD_SECONDS[unit] * int(periods or 1)
+    return float(count), int(count) / seconds
+
+class TokenBucketStore:
+    """Token buckets in a SQLite file, safe to use from any thread or process"""
+
+    def __init__(self, path: str, idle_seconds: float):
+        """
+        Args:
+            path: SQLite file (created if missing)
+            idle_seconds: Time after which any bucket is full again (pruned)
+        """
+        self.path = path
+        self.idle_seconds = idle_seconds
+        self._local = threading.local()
+        self._takes = 0
+
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self):
+        # A connection must not cross a fork
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Autocommit mode: transactions are opened explicitly below
+            connection = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            # Bucket levels need not survive a power loss
+            connection.execute('PRAGMA synchronous=OFF')
+            connection.execute(_SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    def take(self, key: str, capacity: float, rate: float, now: Optional[float] = None) -> float:
+        """
+        Take one token from a bucket (created full)
+
+        Returns:
+            float: 0 if a token was taken, else seconds until one is available
+        """
+        now = time.time() if now is None else now
+        connection = self._connection()
+
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute('SELECT tokens, updated FROM buckets WHERE key = ?', (key,)).fetchone()
+            tokens = capacity if row is None else min(capacity, row[0] + max(now - row[1], 0) * rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / rate
+            connection.execute(
+                'INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)', (key, tokens, now)
+            )
+            connection.execute('COMMIT')
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+            raise
+
+        self._takes += 1
+        if self._takes % PRUNE_EVERY == 0:
+            self.prune(now)
+
+        return wait
+
+    def prune(self, now: Optional[float] = None):
+        """Delete buckets idle long enough to be full again (same as absent)"""
+        now = time.time() if now is None else now
+        self._connection().execute('DELETE FROM buckets WHERE updated < ?', (now - self.idle_seconds,))
+
+# Global store instance (per process)
+_store = None
+_store_lock = threading.Lock()
+
+def get_store() -> TokenBucketStore:
+    """Get the process-wide bucket store"""
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                idle = max(capacity / rate for capacity, rate in (_user_limit(), _ip_limit()))
+                _store = TokenBucketStore(Config.RATELIMIT_STORAGE_PATH, idle)
+
+    return _store
+
+_limits = {}
+
+def _cached_limit(value: str) -> Tuple[float, float]:
+    limit = _limits.get(value)
+    if limit is None:
+        limit = _limits[value] = parse_limit(value)
+    return limit
+
+def _user_limit() -> Tuple[float, float]:
+    return _cached_limit(Config.RATELIMIT_DEFAULT)
+
+def _ip_limit() -> Tuple[float, float]:
+    return _cached_limit(Config.RATELIMIT_PER_IP)
+
+def client_ip() -> str:
+    """Client address, taken from X-Forwarded-For when RATELIMIT_PROXY_HOPS proxies are trusted"""
+    hops = Config.RATELIMIT_PROXY_HOPS
+    forwarded = request.headers.get('X-Forwarded-For', '')
+    if hops > 0 and forwarded:
+        addresses = [address.strip() for address in forwarded.split(',')]
+        # Entries before the trusted proxies' own are client-controlled
+        if len(addresses) >= hops:
+            return addresses[-hops]
+    return request.remote_addr or 'unknown'
+
+def too_many_requests(retry_after: float):
+    """429 response asking the client to wait `retry_after` seconds"""
+    response = jsonify({
+        'success': False,
+        'message': 'Too many requests, try again later'
+    })
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response, 429
+
+def _check(scope: str, identity: str, limit: Tuple[float, float]):
+    try:
+        wait = get_store().take(f'{scope}:{identity}', *limit)
+    except sqlite3.Error as e:
+        print(f"Error checking {scope} rate limit: {str(e)}")
+        return None
+
+    if wait <= 0:
+        return None
+
+    RATE_LIMITED.labels(scope).inc()
+    return too_many_requests(wait)
+
+def check_user(user_id: str):
+    """
+    Take a token from a user's bucket
+
+    Returns:
+        None if the request may proceed, else the 429 response to return
+    """
+    if not Config.RATELIMIT_ENABLED:
+        return None
+    return _check('user', user_id, _user_limit())
+
+def check_ip():
+    """Take a token from the client IP's bucket (None, or the 429 response)"""
+    if not Config.RATELIMIT_ENABLED:
+        return None
+    return _check('ip', client_ip(), _ip_limit())
+
+def init_app(app):
+    """Limit every /api request per client IP (per-user limits are applied in require_auth)"""
+    if not Config.RATELIMIT_ENABLED:
+        return
+
+    # Fail at boot on a malformed limit, not on the first request
+    _user_limit()
+    _ip_limit()
+
+    @app.before_request
+    def limit_by_ip():
+        if request.method == 'OPTIONS' or not request.path.startswith('/api/'):
+            return None
+        return check_ip()
@@ -0,0 +1,63 @@
+"""
+Single Flight
+Coalesces concurrent calls with the same key into one execution (per process)
+
+The first caller for a key runs the function; callers arriving while it is
+running wait for it and get the same result (or exception) instead of
+running it again. Nothing is cached once the call returns.
+"""
+
+import os
+import threading
+from typing import Any, Callable, Hashable, Tuple
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Group of in-flight calls keyed by what they compute"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self):
+        # Calls in flight in the parent never finish in the child
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Run fn(*args, **kwargs), or wait for the running call with the same key
+
+        Returns:
+            tuple: (result, shared) where shared is True if another caller computed it
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, False
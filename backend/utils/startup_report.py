@@ -0,0 +1,129 @@
+"""
+Startup Report
+Measures per-module import cost of the API process and checks it against a budget
+
+Usage:
+    python -m utils.startup_report [--top 20] [--budget-ms 1000]
+
+Runs `create_app()` in a fresh interpreter with `-X importtime`, prints the
+most expensive imports and exits non-zero if startup exceeds the budget or a
+heavy module was imported eagerly (those must load on warmup or first use).
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from config import Config
+
+# Modules that must not be imported just to serve /health or auth (the
+# Supabase client and flask-sock load on first use too)
+HEAVY_MODULES = (
+    'sklearn', 'nltk', 'scipy', 'numpy', 'spacy', 'firebase_admin', 'pandas', 'supabase', 'flask_sock'
+)
+
+STARTUP_ENTRY = "from app import create_app; create_app(warmup=False)"
+
+# "import time:  self [us] | cumulative | imported package"
+IMPORTTIME_PATTERN = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+def measure_startup(entry: str = STARTUP_ENTRY) -> Dict:
+    """
+    Import and build the app in a fresh interpreter, recording import costs
+
+    Returns:
+        dict: {
+            'wall_ms': float (interpreter start to create_app return),
+            'import_ms': float (sum of per-module self time),
+            'modules': list of {'module', 'self_ms', 'cumulative_ms', 'depth'}
+        }
+    """
+    backend_dir = os.path.join(os.path.dirname(__file__), '..')
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', entry],
+        cwd=backend_dir,
+        capture_output=True,
+        text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    if result.returncode != 0:
+        raise Exception(f"App startup failed:\n{result.stderr[-2000:]}")
+
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules.append({
+            'module': name,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000,
+            'depth': (len(indent) - 1) // 2
+        })
+
+    return {
+        'wall_ms': round(wall_ms, 2),
+        'import_ms': round(sum(m['self_ms'] for m in modules), 2),
+        'modules': modules
+    }
+
+def summarize_by_package(modules: List[Dict]) -> List[Dict]:
+    """Total self time per top-level package, most expensive first"""
+    totals = {}
+    for module in modules:
+        package = module['module'].split('.')[0]
+        totals[package] = totals.get(package, 0.0) + module['self_ms']
+
+    return sorted(
+        [{'package': package, 'self_ms': round(ms, 2)} for package, ms in totals.items()],
+        key=lambda x: x['self_ms'],
+        reverse=True
+    )
+
+def eager_heavy_modules(modules: List[Dict]) -> List[str]:
+    """Heavy packages that were imported during startup"""
+    imported = {module['module'].split('.')[0] for module in modules}
+    return sorted(package for package in HEAVY_MODULES if package in imported)
+
+def print_report(report: Dict, top: int = 20, budget_ms: float = 1000) -> bool:
+    """Print the report; returns True if startup is within budget"""
+    print(f"Startup wall time: {report['wall_ms']:.1f} ms (budget {budget_ms:.0f} ms)")
+    print(f"Total import time: {report['import_ms']:.1f} ms across {len(report['modules'])} modules")
+
+    print(f"\nTop {top} packages by self import time:")
+    for entry in summarize_by_package(report['modules'])[:top]:
+        print(f"  {entry['self_ms']:9.1f} ms  {entry['package']}")
+
+    print(f"\nTop {top} modules by cumulative import time:")
+    slowest = sorted(report['modules'], key=lambda x: x['cumulative_ms'], reverse=True)[:top]
+    for module in slowest:
+        print(f"  {module['cumulative_ms']:9.1f} ms  {module['module']}")
+
+    ok = report['wall_ms'] <= budget_ms
+
+    heavy = eager_heavy_modules(report['modules'])
+    if heavy:
+        print(f"\n✗ Heavy modules imported at startup: {', '.join(heavy)}")
+        ok = False
+
+    print(f"\n{'✓ Within' if ok else '✗ Over'} startup budget")
+    return ok
+
+if __name__ == '__main__':
+    top = 20
+    budget_ms = Config.STARTUP_BUDGET_MS
+
+    args = sys.argv[1:]
+    if '--top' in args:
+        top = int(args[args.index('--top') + 1])
+    if '--budget-ms' in args:
+        budget_ms = float(args[args.index('--budget-ms') + 1])
+
+    sys.exit(0 if print_report(measure_startup(), top=top, budget_ms=budget_ms) else 1)
@@ -0,0 +1,164 @@
+"""
+Tracing
+OpenTelemetry spans for routes, auth, evaluators and database calls
+
+Spans are no-ops unless TRACING_ENABLED is set and the OpenTelemetry SDK is
+installed (opentelemetry-sdk, plus opentelemetry-exporter-otlp-proto-http for
+the collector exporter). Exporters:
+- 'otlp': OTLP/HTTP to a collector at TRACING_OTLP_ENDPOINT
+- 'file': OTLP JSON lines appended to TRACING_FILE (one export batch per
+  line, readable by the collector's otlpjsonfile receiver)
+
+Incoming W3C traceparent headers are honoured, so spans join a trace
+started by the frontend or a load generator.
+"""
+
+import base64
+import json
+import os
+from contextlib import nullcontext
+from functools import wraps
+
+from config import Config
+
+_tracer = None
+
+# Shared no-op context manager for disabled tracing
+_NO_SPAN = nullcontext()
+
+# Protobuf's JSON mapping writes bytes as base64; OTLP JSON wants hex ids
+ID_FIELDS = ('traceId', 'spanId', 'parentSpanId')
+
+def _hex_ids(value):
+    if isinstance(value, dict):
+        return {
+            key: base64.b64decode(item).hex() if key in ID_FIELDS and isinstance(item, str) else _hex_ids(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_hex_ids(item) for item in value]
+    return value
+
+def _build_file_exporter(path: str):
+    from google.protobuf.json_format import MessageToDict
+    from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+    class OTLPJsonFileExporter(SpanExporter):
+        """Appends each batch as one OTLP JSON line"""
+
+        def export(self, spans):
+            line = json.dumps(_hex_ids(MessageToDict(encode_spans(spans)))) + '\n'
+            try:
+                # One write per batch, so lines from concurrent workers don't interleave
+                fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, line.encode('utf-8'))
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                print(f"Error writing traces: {str(e)}")
+                return SpanExportResult.FAILURE
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self):
+            pass
+
+    return OTLPJsonFileExporter()
+
+def init_tracing():
+    """Configure the tracer provider and exporter (no-op unless enabled and installed)"""
+    global _tracer
+
+    if _tracer is not None or not Config.TRACING_ENABLED:
+        return
+
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+        if Config.TRACING_EXPORTER == 'file':
+            exporter = _build_file_exporter(Config.TRACING_FILE)
+        else:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            exporter = OTLPSpanExporter(endpoint=Config.TRACING_OTLP_ENDPOINT)
+    except ImportError as e:
+        print(f"Tracing disabled, OpenTelemetry not installed: {str(e)}")
+        return
+
+    provider = TracerProvider(
+        resource=Resource.create({'service.name': Config.TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(Config.TRACING_SAMPLE_RATIO))
+    )
+    # The batch processor restarts its export thread in forked workers
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+
+    _tracer = trace.get_tracer('mockview')
+
+def span(name: str, **attributes):
+    """Context manager for a child span of the current span"""
+    if _tracer is None:
+        return _NO_SPAN
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+def traced(name: str):
+    """Decorator running a function inside a span"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if _tracer is None:
+                return f(*args, **kwargs)
+            with _tracer.start_as_current_span(name):
+                return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+def init_app(app):
+    """Open a server span per request (no-op unless tracing is enabled)"""
+    init_tracing()
+    if _tracer is None:
+        return
+
+    from flask import g, request
+    from opentelemetry import context, propagate, trace
+
+    @app.before_request
+    def start_request_span():
+        parent = propagate.extract(request.headers)
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        request_span = _tracer.start_span(
+            f'{request.method} {route}',
+            context=parent,
+            kind=trace.SpanKind.SERVER,
+            attributes={
+                'http.request.method': request.method,
+                'http.route': route,
+                'url.path': request.path
+            }
+        )
+        g.trace_span = request_span
+        g.trace_token = context.attach(trace.set_span_in_context(request_span, parent))
+
+    @app.after_request
+    def record_response_status(response):
+        request_span = g.get('trace_span')
+        if request_span is not None:
+            request_span.set_attribute('http.response.status_code', response.status_code)
+            if response.status_code >= 500:
+                request_span.set_status(trace.Status(trace.StatusCode.ERROR))
+        return response
+
+    @app.teardown_request
+    def end_request_span(exc):
+        request_span = g.pop('trace_span', None)
+        if request_span is None:
+            return
+        if exc is not None:
+            request_span.record_exception(exc)
+            request_span.set_status(trace.Status(trace.StatusCode.ERROR, str(exc)))
+        request_span.end()
+        context.detach(g.pop('trace_token'))
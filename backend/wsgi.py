@@ -0,0 +1,25 @@
+"""
+MockView Trainer - Production WSGI Entry Point
+Loads all immutable NLP state once in the master process before workers fork
+
+Run with:
+    gunicorn -c gunicorn.conf.py
+
+With preload_app enabled, this module is imported by the master: the NLTK
+bundle, WordNet, stopwords, VADER lexicon, scikit-learn and the question and
+keyword data are loaded here and frozen, then shared copy-on-write by every
+worker instead of being loaded once per worker.
+"""
+
+import gc
+
+# Don't collect while loading: freed objects leave holes in pages that
+# workers would later write into (and so copy)
+gc.disable()
+
+from app import create_app
+from services.warmup_service import prepare_for_fork
+
+app = create_app(warmup=True)
+
+prepare_for_fork()